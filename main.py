@@ -20,6 +20,7 @@ Test rapide :
 from __future__ import annotations
 import json
 import os
+import shlex
 import sys
 from dataclasses import  asdict
 from pathlib import Path
@@ -27,7 +28,7 @@ from pathlib import Path
 from PySide6 import QtCore, QtGui, QtWidgets
 from src.backends import BuildConfig,   APP_ORG 
 from src.tabpage import  OutputTabPage, InstallTabPage, ProfilesTabPage, OptionsTabPage, ProjectTabPage
-from src.action import BuildAction, CleanOutputAction, AnalyzeProjectAction, ProfileNewAction, ProfileSaveAction, ProfileDeleteAction, ProfileExportAction, ProfileImportAction, InstallAppAction, CreateSetupExeAction, FileAction
+from src.action import BuildAction, CleanOutputAction, AnalyzeProjectAction, ProfileNewAction, ProfileSaveAction, ProfileDeleteAction, ProfileExportAction, ProfileImportAction, InstallAppAction, CreateSetupExeAction, FileAction, SuggestLazyImportsAction, VerifyLazyImportsAction, BenchmarkModuleIndexAction, CalibratePresetsAction, DetectUnusedDataAction, SimulatePayloadFilterAction, VerifyReproducibilityAction, ExplainRebuildAction
 
 APP_NAME = "PyPack Studio v1.3"
 
@@ -37,6 +38,7 @@ from src.styles import CUSTOM_STYLE
 # en haut de ton fichier pypack_studio.py
 from src.services.profile_manager import ProfileManager
 from src.services.log_service import LogService
+from src.services import payload_filter
 from src.services.file_manager import FileManagerService
 
 
@@ -66,14 +68,38 @@ class MainWindow(QtWidgets.QMainWindow):
         # Onglet Options
         self.page_options.widgets['cmb_backend'].setCurrentIndex(0)
         self.page_options.widgets['chk_onefile'].setChecked(True)
+        self.page_options.widgets['chk_dual_output'].setChecked(False)
         self.page_options.widgets['chk_windowed'].setChecked(True)
         self.page_options.widgets['chk_clean'].setChecked(True)
         self.page_options.widgets['chk_console'].setChecked(False)
+        self.page_options.widgets['chk_onefile_cache'].setChecked(False)
+        self.page_options.widgets['chk_module_index'].setChecked(False)
+        self.page_options.widgets['chk_resource_pack'].setChecked(False)
+        self.page_options.widgets['chk_stage_includes'].setChecked(False)
+        self.page_options.widgets['chk_optimize_assets'].setChecked(False)
+        self.page_options.widgets['ed_asset_drop'].setText("")
+        self.page_options.widgets['chk_payload_filter'].setChecked(False)
+        self.page_options.widgets['chk_reproducible'].setChecked(False)
+        self.page_options.widgets['chk_managed_env'].setChecked(False)
+        self.page_options.widgets['chk_wheelhouse'].setChecked(False)
+        self.page_options.widgets['ed_payload_rules'].setPlainText("")
+        self.page_options.widgets['cmb_optimize'].setCurrentIndex(0)
+        self.page_options.widgets['ed_keep_docstrings'].setText("")
+        self.page_options.widgets['ed_hybrid_workload'].setText("")
+        self.page_options.widgets['ed_hybrid_modules'].setText("")
+        self.page_options.widgets['spn_hybrid_max'].setValue(5)
+        self.page_options.widgets['chk_pgo'].setChecked(False)
+        self.page_options.widgets['ed_pgo_args'].setText("")
+        self.page_options.widgets['cmb_preset'].setCurrentIndex(0)
+        self.page_options.widgets['ed_bench_args'].setText("")
+        self.page_options.widgets['ed_extra_entries'].setPlainText("")
         self.page_options.widgets['tbl_directories'].setValue([])
         self.page_options.widgets['tbl_dirs_to_include'].setValue([])
+        self.page_options.widgets['tbl_dirs_to_include'].setFilters({})
         self.page_options.widgets['ed_hidden'].setPlainText("")
         self.page_options.widgets['ed_extra'].setPlainText("")
-        self.page_options.widgets['ed_python'].setText("")
+        self.page_options.widgets['ed_lazy'].setPlainText("")
+        self.page_options.widgets['cmb_python'].setText("")
     
     def __init__(self):
         super().__init__()
@@ -106,10 +132,26 @@ class MainWindow(QtWidgets.QMainWindow):
         self.page_project.btn_build.clicked.connect(lambda: self._on_build_clicked())
         self.page_project.btn_clean.clicked.connect(lambda: self._clean_output())
         self.page_options = OptionsTabPage()
+        self.page_options.widgets['btn_lazy_suggest'].clicked.connect(lambda: SuggestLazyImportsAction(self).execute())
+        self.page_options.widgets['btn_lazy_verify'].clicked.connect(lambda: VerifyLazyImportsAction(self).execute())
+        self.page_options.widgets['btn_index_bench'].clicked.connect(lambda: BenchmarkModuleIndexAction(self).execute())
+        self.page_options.widgets['btn_calibrate'].clicked.connect(self._calibrate_presets)
+        self.page_options.widgets['btn_verify_repro'].clicked.connect(self._verify_reproducibility)
+        self.page_options.widgets['btn_unused_data'].clicked.connect(lambda: DetectUnusedDataAction(self).execute())
+        self.page_options.widgets['btn_payload_simulate'].clicked.connect(lambda: SimulatePayloadFilterAction(self).execute())
+        self.page_options.widgets['btn_clear_envs'].clicked.connect(self._clear_build_envs)
+        self.page_project.ed_project.textChanged.connect(self.page_options.widgets['cmb_python'].setProjectDir)
         self.page_profiles = ProfilesTabPage()
         self.page_install = InstallTabPage()
         self.page_install.install_btn.clicked.connect(lambda: InstallAppAction(self).execute())
         self.page_output = OutputTabPage()
+        self.page_output.btn_why.clicked.connect(lambda: ExplainRebuildAction(self).execute())
+        self.page_output.stopRequested.connect(self.stop_build)
+        self.build_action = BuildAction(self.page_output)
+        self.create_setup_action = CreateSetupExeAction(self.page_output)
+        self.build_action.finishRequested.connect(self.finish_build_app)
+        self.build_action.setupCreationRequested.connect(self.create_setup_exe)
+        self.create_setup_action.finishRequested.connect(self.finish_setup_exe)
 
         self.page_profiles.widgets['lst_profiles'].itemSelectionChanged.connect(self._on_profile_selected)
         self.page_profiles.widgets['btn_new'].clicked.connect(lambda: ProfileNewAction(self).execute())
@@ -195,14 +237,38 @@ class MainWindow(QtWidgets.QMainWindow):
             icon_path=self.page_project.ed_icon.text(),
             backend=self.page_options.widgets['cmb_backend'].currentText(),
             onefile=self.page_options.widgets['chk_onefile'].isChecked(),
+            dual_output=self.page_options.widgets['chk_dual_output'].isChecked(),
             windowed=self.page_options.widgets['chk_windowed'].isChecked(),
             clean=self.page_options.widgets['chk_clean'].isChecked(),
             console=self.page_options.widgets['chk_console'].isChecked(),
+            onefile_cache=self.page_options.widgets['chk_onefile_cache'].isChecked(),
+            module_index=self.page_options.widgets['chk_module_index'].isChecked(),
+            resource_pack=self.page_options.widgets['chk_resource_pack'].isChecked(),
+            stage_includes=self.page_options.widgets['chk_stage_includes'].isChecked(),
+            optimize_assets=self.page_options.widgets['chk_optimize_assets'].isChecked(),
+            payload_filter=self.page_options.widgets['chk_payload_filter'].isChecked(),
+            reproducible=self.page_options.widgets['chk_reproducible'].isChecked(),
+            managed_env=self.page_options.widgets['chk_managed_env'].isChecked(),
+            wheelhouse=self.page_options.widgets['chk_wheelhouse'].isChecked(),
+            payload_rules=payload_filter.parse_rules(self.page_options.widgets['ed_payload_rules'].toPlainText()),
+            asset_drop_patterns=[p.strip() for p in self.page_options.widgets['ed_asset_drop'].text().split(",") if p.strip()],
+            optimize=self.page_options.widgets['cmb_optimize'].currentIndex(),
+            optimize_keep_docstrings=[p.strip() for p in self.page_options.widgets['ed_keep_docstrings'].text().split(",") if p.strip()],
+            hybrid_workload=self.page_options.widgets['ed_hybrid_workload'].text(),
+            hybrid_modules=[m.strip() for m in self.page_options.widgets['ed_hybrid_modules'].text().split(",") if m.strip()],
+            hybrid_max_modules=self.page_options.widgets['spn_hybrid_max'].value(),
+            pgo=self.page_options.widgets['chk_pgo'].isChecked(),
+            pgo_args=shlex.split(self.page_options.widgets['ed_pgo_args'].text()),
+            preset=self.page_options.widgets['cmb_preset'].currentData() or "",
+            bench_args=shlex.split(self.page_options.widgets['ed_bench_args'].text()),
+            extra_entries=[ln.strip() for ln in self.page_options.widgets['ed_extra_entries'].toPlainText().splitlines() if ln.strip()],
             dirs_to_include=self.page_options.widgets['tbl_dirs_to_include'].value(),
+            include_filters=self.page_options.widgets['tbl_dirs_to_include'].filters(),
             hidden_imports=[ln.strip() for ln in self.page_options.widgets['ed_hidden'].toPlainText().splitlines() if ln.strip()],
             extra_args=[ln.strip() for ln in self.page_options.widgets['ed_extra'].toPlainText().splitlines() if ln.strip()],
+            lazy_modules=[ln.strip() for ln in self.page_options.widgets['ed_lazy'].toPlainText().splitlines() if ln.strip()],
             output_dir=self.page_project.ed_output.text(),
-            python_exe=self.page_options.widgets['ed_python'].text(),
+            python_exe=self.page_options.widgets['cmb_python'].text(),
             create_setup=self.page_project.chk_create_setup.isChecked(),
         )
         # Stocker la valeur de la checkbox pour l'utiliser dans _on_build_finished
@@ -216,10 +282,32 @@ class MainWindow(QtWidgets.QMainWindow):
         self.page_project.ed_icon.setText(cfg.icon_path)
         self.page_project.ed_output.setText(cfg.output_dir)
         self.page_options.widgets['cmb_backend'].setCurrentText(cfg.backend)
+        self.page_options.widgets['chk_dual_output'].setChecked(cfg.dual_output)
         self.page_options.widgets['chk_onefile'].setChecked(cfg.onefile)
         self.page_options.widgets['chk_windowed'].setChecked(cfg.windowed)
         self.page_options.widgets['chk_clean'].setChecked(cfg.clean)
         self.page_options.widgets['chk_console'].setChecked(cfg.console)
+        self.page_options.widgets['chk_onefile_cache'].setChecked(cfg.onefile_cache)
+        self.page_options.widgets['chk_module_index'].setChecked(cfg.module_index)
+        self.page_options.widgets['chk_resource_pack'].setChecked(cfg.resource_pack)
+        self.page_options.widgets['chk_stage_includes'].setChecked(cfg.stage_includes)
+        self.page_options.widgets['chk_optimize_assets'].setChecked(cfg.optimize_assets)
+        self.page_options.widgets['ed_asset_drop'].setText(", ".join(cfg.asset_drop_patterns))
+        self.page_options.widgets['chk_payload_filter'].setChecked(cfg.payload_filter)
+        self.page_options.widgets['chk_reproducible'].setChecked(cfg.reproducible)
+        self.page_options.widgets['chk_managed_env'].setChecked(cfg.managed_env)
+        self.page_options.widgets['chk_wheelhouse'].setChecked(cfg.wheelhouse)
+        self.page_options.widgets['ed_payload_rules'].setPlainText(payload_filter.format_rules(cfg.payload_rules))
+        self.page_options.widgets['cmb_optimize'].setCurrentIndex(cfg.optimize)
+        self.page_options.widgets['ed_keep_docstrings'].setText(", ".join(cfg.optimize_keep_docstrings))
+        self.page_options.widgets['ed_hybrid_workload'].setText(cfg.hybrid_workload)
+        self.page_options.widgets['ed_hybrid_modules'].setText(", ".join(cfg.hybrid_modules))
+        self.page_options.widgets['spn_hybrid_max'].setValue(cfg.hybrid_max_modules)
+        self.page_options.widgets['chk_pgo'].setChecked(cfg.pgo)
+        self.page_options.widgets['ed_pgo_args'].setText(shlex.join(cfg.pgo_args))
+        self.page_options.widgets['cmb_preset'].setCurrentIndex(max(0, self.page_options.widgets['cmb_preset'].findData(cfg.preset)))
+        self.page_options.widgets['ed_bench_args'].setText(shlex.join(cfg.bench_args))
+        self.page_options.widgets['ed_extra_entries'].setPlainText("\n".join(cfg.extra_entries))
         self.page_project.chk_create_setup.setChecked(bool(getattr(cfg, 'create_setup', False)))
         # Correction : garantir la présence des champs et le bon format
         directories = getattr(cfg, 'directories_to_create', [])
@@ -229,9 +317,11 @@ class MainWindow(QtWidgets.QMainWindow):
         if dirs_to_include is None:
             dirs_to_include = []
         self.page_options.widgets['tbl_dirs_to_include'].setValue(getattr(cfg, 'dirs_to_include', []))
+        self.page_options.widgets['tbl_dirs_to_include'].setFilters(cfg.include_filters)
         self.page_options.widgets['ed_hidden'].setPlainText("\n".join(getattr(cfg, 'hidden_imports', [])))
         self.page_options.widgets['ed_extra'].setPlainText("\n".join(getattr(cfg, 'extra_args', [])))
-        self.page_options.widgets['ed_python'].setText(getattr(cfg, 'python_exe', ""))
+        self.page_options.widgets['ed_lazy'].setPlainText("\n".join(getattr(cfg, 'lazy_modules', [])))
+        self.page_options.widgets['cmb_python'].setText(getattr(cfg, 'python_exe', ""))
         
     # --- Analyse/Nettoyage ---
     def _analyze_project(self):
@@ -240,44 +330,55 @@ class MainWindow(QtWidgets.QMainWindow):
     def _clean_output(self):
         CleanOutputAction(self).execute()
 
+    def _calibrate_presets(self):
+        self.calibrate_action = CalibratePresetsAction(self.page_output)
+        self.calibrate_action.execute(self)
+
+    def _verify_reproducibility(self):
+        self.repro_action = VerifyReproducibilityAction(self.page_output)
+        self.repro_action.execute(self)
+
+    def _clear_build_envs(self):
+        from src.services import build_envs
+        count = build_envs.clear_pool()
+        QtWidgets.QMessageBox.information(self, "Environnements", f"{count} environnement(s) de build supprimé(s).")
+
     # --- Build ---
     def _on_build_clicked(self):
         self.build_action.execute(self)
         
     def stop_build(self):
         """Arrête le processus de build en cours."""
-        if self.build_action.stop():
+        # calibration et reproductibilité ont leur propre action de build
+        action = getattr(self, 'current_build_action', None) or self.build_action
+        if action.stop():
             self.page_output.lbl_status.setText("Arrêt du build demandé...")
             self.page_output.btn_stop.setEnabled(False)
         
     def finish_build_app(self):
         # Créer l'environnment pour l'executabla de l'application
-        cfg = self._config_from_ui()
+        job = self.build_action.job
+        cfg = job.cfg
         
-        # On deplace dans le rep res le dossier application        
-        source_path = Path(cfg.output_dir) / f"{cfg.name}.exe"
-        dest_path = Path(cfg.output_dir)  / cfg.name/ f"{cfg.name}.exe"
-        FileAction(self).execute(str(source_path), str(dest_path))
-        
-        # On deplace dans le rep application le dossier application
-        source_internal = Path(cfg.output_dir) / "_internal"
-        dest_internal = Path(cfg.output_dir)  / cfg.name/ "_internal"
-        FileAction(self).execute(str(source_internal), str(dest_internal))
-        
-        # Vérifier si l'option "Créer un setup après le build" est cochée
-        if hasattr(self, 'page_project') and self.page_project.chk_create_setup.isChecked():
-            
-            self.create_setup_action.execute()
-        else:
-            print("Option 'Créer un setup après le build' non cochée, skipping setup creation")
+        # On deplace dans le rep res le dossier application (éléments absents ignorés : onefile, autre OS)
+        suffix = ".exe" if os.name == 'nt' else ""
+        for name in (f"{cfg.name}{suffix}", "_internal"):
+            source_path = job.output_dir / name
+            if source_path.exists() and source_path != job.app_dir:
+                FileAction(self, str(job.app_dir)).execute(str(source_path), str(job.app_dir / name))
+
+    def create_setup_exe(self):
+        """Crée setup.exe pour le build qui vient de se terminer (option cochée à son lancement)."""
+        self.create_setup_action.job = self.build_action.job
+        self.create_setup_action.execute()
         
     
     def finish_setup_exe(self):
         """Termine la configuration de setup.exe en déplaçant les fichiers nécessaires."""
         # Utiliser MoveFileAction pour effectuer des opérations de déplacement supplémentaires
         # Par exemple, s'assurer que setup.exe est bien dans le répertoire de l'application
-        # Récupérer la configuration actuelle
-        cfg = self._config_from_ui()
+        # Configuration du build terminé (et non celle, peut-être modifiée depuis, de l'interface)
+        cfg = self.build_action.job.cfg
         
         # Définir les chemins source et destination
         # setup.exe est normalement déjà créé dans dist_setup/setup.exe
@@ -286,10 +387,12 @@ class MainWindow(QtWidgets.QMainWindow):
         # On peut par exemple le déplacer à la racine du répertoire de sortie
         dest_path = Path(cfg.output_dir)  / cfg.name/ "setup.exe"
         
-        # Vérifier si le fichier source existe
-        if source_path.exists():
+        # Vérifier si le fichier source existe (CreateSetupExeAction l'a normalement déjà rangé)
+        if dest_path.exists():
+            self.log_service.append(f"[FINISH] setup.exe en place: {dest_path}", "INFO")
+        elif source_path.exists():
             # Utiliser MoveFileAction pour déplacer le fichier
-            move_action = FileAction(self)
+            move_action = FileAction(self, str(dest_path.parent))
             move_action.execute(str(source_path), str(dest_path))
         else:
             # Afficher un message d'information si le fichier n'existe pas
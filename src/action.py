@@ -7,8 +7,8 @@ from pathlib import Path
 import json
 from typing import List, Tuple
 from PySide6 import QtWidgets, QtCore, QtGui
-from src.backends import BuildConfig, BACKENDS
-from src.worker import BuildWorker
+from src.backends import BuildConfig, BuildStep, BACKENDS
+from src.worker import BuildWorker, StepWorker
 import shlex
 
 # Créer une métaclasse personnalisée pour résoudre le conflit de métaclasse
@@ -28,6 +28,35 @@ class Action(ABC, metaclass=ActionMeta):
         pass
 
 
+def run_in_background(main_window, button: QtWidgets.QAbstractButton, func, done):
+    """Exécute `func()` hors du thread de l'interface puis `done(résultat)` dans celui-ci.
+
+    Une exception levée par `func` est passée à `done` comme résultat. Le bouton reste
+    désactivé pendant le traitement ; le worker est gardé par la fenêtre jusqu'à la fin.
+    """
+    holder = {}
+
+    def step(_log):
+        try:
+            holder["result"] = func()
+        except Exception as e:
+            holder["result"] = e
+
+    worker = StepWorker(BuildStep("background", func=step))
+    if not hasattr(main_window, "background_workers"):
+        main_window.background_workers = set()
+    main_window.background_workers.add(worker)
+
+    def finish(_code):
+        main_window.background_workers.discard(worker)
+        button.setEnabled(True)
+        done(holder.get("result"))
+
+    worker.finished.connect(finish)
+    button.setEnabled(False)
+    worker.start()
+
+
 class BaseBuildAction(Action, QtCore.QObject):
     """Classe de base pour les actions de build."""
     
@@ -62,6 +91,7 @@ class BuildAction(BaseBuildAction):
         self.line_count = 0  # Compteur de lignes pour limiter les mises à jour de la progressBar
         self.pending_progress_update = False  # Indique si une mise à jour de la progressBar est en attente
         self.worker = None  # Stocker le worker ici aussi pour y accéder via une propriété
+        self.job = None  # BuildJob du build en cours ou du dernier build
         # Initialiser le timer pour les mises à jour de l'UI
         self.progress_timer = QtCore.QTimer()
         self.progress_timer.timeout.connect(self._update_progress_ui)
@@ -80,6 +110,9 @@ class BuildAction(BaseBuildAction):
         """
         if self.worker is not None:
             print(f"BuildAction.stop: Stopping worker {self.worker}") # Debug log
+            # Ne pas enchaîner les étapes restantes du pipeline
+            self.steps = []
+            self.stopped = True
             self.worker.kill()
             return True
         else:
@@ -106,19 +139,53 @@ class BuildAction(BaseBuildAction):
             QtWidgets.QMessageBox.warning(main_window, "Outil", f"Outil inconnu: {cfg.backend}")
             return
              
-        cmd = backend.build_command(cfg)
+        from src.services.presets import apply_preset
+        cfg = apply_preset(cfg)
         # Vérif exe disponible
-        tool = cmd[0] if Path(cmd[0]).name.lower().startswith("python") else cmd[0]
-        if not Path(tool).resolve().exists():
+        if not Path(cfg.python_exe).resolve().exists():
             QtWidgets.QMessageBox.warning(main_window, "Environnement", "Python introuvable.")
             return
-             
-        self._run_build(cmd, workdir=cfg.project_dir, log_page=log_page, main_window=main_window)
+        base_cfg = cfg
+        if cfg.managed_env:
+            # venv géré : python_exe pointe sur le venv du pool, créé par les premières étapes si besoin
+            from src.services import build_envs
+            cfg = build_envs.managed_config(base_cfg)
+        # instantané lu par tout le pipeline, étapes de fin comprises : l'interface n'est plus relue
+        from src.services.build_job import BuildJob
+        profile = main_window.settings.value("active_profile", "") if hasattr(main_window, 'settings') else ""
+        self.job = job = BuildJob.capture(cfg, base_cfg, profile=profile,
+                                          create_setup=main_window.page_project.chk_create_setup.isChecked(),
+                                          open_output_dir=main_window.open_output_dir)
+        env_steps = build_envs.provision(job.base_cfg)[1] if job.base_cfg.managed_env else []
+        # entrées du build comparées au build réussi le plus proche une fois l'environnement prêt,
+        # enregistrées seulement si le build réussit
+        from src.services import build_inputs
+        backend_steps = backend.incremental_build_steps(job.cfg, job.profile)
+        explain_inputs, save_inputs = build_inputs.record_steps(job.cfg, backend_steps, job.profile)
+        steps = env_steps + [explain_inputs] + backend_steps + [save_inputs]
+        # Vérifications préalables en première étape (hors du thread de l'interface) :
+        # échouer tout de suite plutôt qu'au milieu du build
+        from src.services import preflight
+        env_ready = Path(job.cfg.python_exe).exists()
+
+        def run_preflight(log):
+            report = preflight.run(job.cfg if env_ready else job.base_cfg, check_backend=env_ready)
+            log(report.summary())
+            for warning in report.warnings:
+                log(f"[WARN] {warning}")
+            for error in report.errors:
+                log(f"[ERROR] {error}")
+            if not report.ok:
+                raise RuntimeError(f"build annulé, {len(report.errors)} erreur(s) bloquante(s)")
+
+        self._run_build([BuildStep("preflight", func=run_preflight)] + steps, log_page=log_page, main_window=main_window)
         
-    def _run_build(self, cmd: List[str], workdir: str, log_page, main_window: QtWidgets.QMainWindow):
+    def _run_build(self, steps: List[BuildStep], log_page, main_window: QtWidgets.QMainWindow):
         # main_window = self.main_window
         self.line_count = 0  # Réinitialiser le compteur de lignes
         self.log_page = log_page  # Stocker la page de log pour les utiliser dans d'autres méthodes
+        self.steps = list(steps)
+        self.stopped = False
          
         main_window.pages.setCurrentWidget(main_window.page_output)
         main_window.nav.setCurrentRow(4)  # Sélectionner l'onglet "Sortie & Logs"
@@ -129,25 +196,47 @@ class BuildAction(BaseBuildAction):
          
         # Afficher la barre de progression
         log_page.progress_bar.setVisible(True)
+        log_page.progress_bar.setRange(0, 100)
         log_page.progress_bar.setValue(0)
 
-        self.worker = BuildWorker(cmd, workdir=workdir)
-        self.worker.started.connect(lambda c: main_window.log_service.append("$ " + shlex.join(c)))
-        self.worker.line.connect(self._update_progress)  # Utiliser la méthode de l'action
-        self.worker.line.connect(lambda line: self.log_page.append_log(line, "INFO", update_progress=True))
-        self.worker.finished.connect(lambda code: self._on_build_finished(code, main_window))  # Utiliser la méthode de l'action
+        # Stocker cette instance de BuildAction dans main_window pour que StopBuildAction puisse y accéder
+        main_window.current_build_action = self
+        self._run_next_step(main_window)
+
+    def _run_next_step(self, main_window: QtWidgets.QMainWindow):
+        """Lance l'étape suivante du pipeline ; la première erreur termine le build."""
+        if not self.steps:
+            self._on_build_finished(0, main_window)
+            return
+        step = self.steps.pop(0)
+        if step.func is None:
+            self.worker = BuildWorker(step.cmd, workdir=step.workdir or None, env=step.env or None)
+            self.worker.started.connect(lambda c: main_window.log_service.append("$ " + shlex.join(c)))
+            self.worker.lines.connect(self._update_progress)  # Utiliser la méthode de l'action
+            self.worker.lines.connect(lambda lines: self.log_page.append_lines(lines, "INFO", update_progress=True))
+        else:
+            self.worker = StepWorker(step)
+            self.worker.lines.connect(lambda lines: self.log_page.append_lines(lines, "INFO"))
+            self.worker.error.connect(lambda msg: self.log_page.append_log(msg, "ERROR"))
+        self.worker.finished.connect(lambda code: self._on_step_finished(code, main_window))
         self.worker.start()
-         
         # Stocker le worker dans main_window pour pouvoir l'arrêter plus tard
         main_window.worker = self.worker
-        # Stocker cette instance de BuildAction dans main_window pour que StopBuildAction puisse y accéder
-        main_window.current_build_action = self
+
+    def _on_step_finished(self, code: int, main_window: QtWidgets.QMainWindow):
+        if self.stopped and code == 0:
+            code = 1  # arrêt demandé : ne pas signaler un succès
+        if code != 0:
+            self.steps = []
+            self._on_build_finished(code, main_window)
+        else:
+            self._run_next_step(main_window)
         
-    def _update_progress(self, text: str):
-        print(f"_update_progress called with text: {text}")  # Débogage
-        self.line_count += 1
+    def _update_progress(self, lines: list):
+        previous = self.line_count
+        self.line_count += len(lines)
         # Indiquer qu'une mise à jour de la progressBar est nécessaire toutes les 10 lignes de log
-        if self.line_count % 10 == 0:
+        if self.line_count // 10 > previous // 10:
             self.pending_progress_update = True
             
     def _update_progress_ui(self):
@@ -155,10 +244,8 @@ class BuildAction(BaseBuildAction):
         if self.pending_progress_update:
             # main_window = self.main_window
             current_value = self.log_page.progress_bar.value()
-            print(f"_update_progress_ui called, current progress bar value: {current_value}")  # Débogage
             if current_value < 100:
                 self.log_page.update_progress_bar(current_value + 1)
-                print(f"_update_progress_ui called, new progress bar value: {current_value + 1}")  # Débogage
             self.pending_progress_update = False
             
     def _on_build_finished(self, code: int, main_window: QtWidgets.QMainWindow):
@@ -171,31 +258,31 @@ class BuildAction(BaseBuildAction):
             except RuntimeError:
                 # Le timer C++ a déjà été supprimé, on l'ignore
                 pass
-        print(f"_on_build_finished called with code: {code}")  # Débogage
         # Cacher la barre de progression
         self.log_page.progress_bar.setVisible(False)
          
         # Copier les répertoires et fichiers spécifiés dans le dossier de sortie
-        cfg = main_window._config_from_ui()
+        job = self.job
+        cfg = job.cfg
         if cfg.output_dir and cfg.directories_to_create:
             try:
                 main_window.log_service.append(f"[DEBUG] Chemin de sortie: {cfg.output_dir}", "INFO")
                 main_window.log_service.append(f"[DEBUG] Nombre d'éléments à copier: {len(cfg.directories_to_create)}", "INFO")
                 for path in cfg.directories_to_create:
                     main_window.log_service.append(f"[DEBUG] Élément à copier: {path}", "INFO")
-                    if Path(path).exists():
+                    if Path(job.path(path)).exists():
                         main_window.log_service.append(f"[DEBUG] L'élément existe: {path}", "INFO")
                     else:
                         main_window.log_service.append(f"[DEBUG] L'élément n'existe pas: {path}", "WARNING")
                 if cfg.output_dir and cfg.directories_to_create:
-                    main_window.file_mgr.copy_items(cfg.directories_to_create, cfg.output_dir, cfg.name)
+                    main_window.file_mgr.copy_items([job.path(p) for p in cfg.directories_to_create], cfg.output_dir, cfg.name)
                     main_window.log_service.append("[INFO] Répertoires et fichiers copiés dans le dossier de sortie.", "INFO")
                  
                 # Vérifier si les fichiers ont été copiés
                 for path in cfg.directories_to_create:
-                    src_path = Path(path)
+                    src_path = Path(job.path(path))
                     if src_path.exists():
-                        dst_path = Path(cfg.output_dir) / src_path.name
+                        dst_path = job.output_dir / src_path.name
                         if dst_path.exists():
                             main_window.log_service.append(f"[DEBUG] Élément copié avec succès: {dst_path}", "INFO")
                         else:
@@ -206,7 +293,7 @@ class BuildAction(BaseBuildAction):
         # Déplacer le contenu du répertoire créé par PyInstaller à la racine de dist/
         if code == 0 and cfg.output_dir and not cfg.onefile:
             try:
-                pyinstall_dir = Path(cfg.output_dir) / cfg.name
+                pyinstall_dir = job.app_dir
                 if pyinstall_dir.exists() and pyinstall_dir.is_dir():
                     main_window.log_service.append(f"[DEBUG] Déplacement du contenu de {pyinstall_dir} vers {cfg.output_dir}", "INFO")
                     # Liste des éléments à exclure du déplacement
@@ -244,22 +331,19 @@ class BuildAction(BaseBuildAction):
             main_window.worker = None
         # Afficher le message immédiatement, avant les copies de fichiers
               
-        # Si l'option "Créer un setup" est cochée, émettre le signal pour créer le setup
-        if hasattr(main_window, 'page_project') and main_window.page_project.chk_create_setup.isChecked():
-            print("Émettre le signal pour créer le setup")
-            # Émettre le signal pour créer le setup
-            self.setupCreationRequested.emit()
-          
         if code == 0:
             self.log_page.lbl_status.setText("Build terminé avec succès.")
             self.finishRequested.emit()
+            # Si l'option "Créer un setup" était cochée au lancement, émettre le signal pour créer le setup
+            if job.create_setup:
+                self.setupCreationRequested.emit()
             QtWidgets.QMessageBox.information(main_window, "Succès", "Build terminé avec succès.")
           
         else:
             QtWidgets.QMessageBox.warning(main_window, "Échec", f"Le build a échoué (code {code}). Consultez les logs.")
         # Ouvrir le dossier de sortie si l'option est activée
-        if main_window.open_output_dir and cfg.output_dir and code == 0:
-            output_path = Path(cfg.output_dir)
+        if job.open_output_dir and cfg.output_dir and code == 0:
+            output_path = job.output_dir
             if output_path.exists():
                 QtGui.QDesktopServices.openUrl(QtCore.QUrl.fromLocalFile(str(output_path)))
                 self.log_page.lbl_status.setText("Dossier de sortie ouvert.")
@@ -270,19 +354,19 @@ class BuildAction(BaseBuildAction):
                 main_window.log_service.append(f"[DEBUG] Nombre d'éléments à copier: {len(cfg.directories_to_create)}", "INFO")
                 for path in cfg.directories_to_create:
                     main_window.log_service.append(f"[DEBUG] Élément à copier: {path}", "INFO")
-                    if Path(path).exists():
+                    if Path(job.path(path)).exists():
                         main_window.log_service.append(f"[DEBUG] L'élément existe: {path}", "INFO")
                     else:
                         main_window.log_service.append(f"[DEBUG] L'élément n'existe pas: {path}", "WARNING")
                 if cfg.output_dir and cfg.directories_to_create:
-                    main_window.file_mgr.copy_items(cfg.directories_to_create, cfg.output_dir, cfg.name)
+                    main_window.file_mgr.copy_items([job.path(p) for p in cfg.directories_to_create], cfg.output_dir, cfg.name)
                     main_window.log_service.append("[INFO] Répertoires et fichiers copiés dans le dossier de sortie.", "INFO")
                  
                 # Vérifier si les fichiers ont été copiés
                 for path in cfg.directories_to_create:
-                    src_path = Path(path)
+                    src_path = Path(job.path(path))
                     if src_path.exists():
-                        dst_path = Path(cfg.output_dir) / src_path.name
+                        dst_path = job.output_dir / src_path.name
                         if dst_path.exists():
                             main_window.log_service.append(f"[DEBUG] Élément copié avec succès: {dst_path}", "INFO")
                         else:
@@ -291,6 +375,231 @@ class BuildAction(BaseBuildAction):
                 main_window.log_service.append(f"[ERROR] Erreur lors de la copie des répertoires et fichiers: {e}", "ERROR")
 
 
+class CalibratePresetsAction(BuildAction):
+    """Construit le profil avec chaque préréglage, mesure build, taille et scénario, puis retient le meilleur."""
+
+    def execute(self, main_window: QtWidgets.QMainWindow):
+        from dataclasses import replace
+        from functools import partial
+        from src.backends import RUNTIME_DIR
+        from src.services import presets
+
+        if getattr(main_window, '_build_in_progress', False):
+            QtWidgets.QMessageBox.information(main_window, "Calibration", "Un build est déjà en cours.")
+            return
+        cfg = main_window._config_from_ui()
+        ok, msg = cfg.validate()
+        if not ok:
+            QtWidgets.QMessageBox.warning(main_window, "Validation", msg)
+            return
+        backend = BACKENDS.get(cfg.backend)
+        if backend is None:
+            QtWidgets.QMessageBox.warning(main_window, "Outil", f"Outil inconnu: {cfg.backend}")
+            return
+        if not cfg.bench_args and QtWidgets.QMessageBox.question(
+                main_window, "Calibration",
+                "Aucun scénario : l'application sera lancée sans argument et doit se terminer seule.\n"
+                "Continuer ?") != QtWidgets.QMessageBox.Yes:
+            return
+
+        self.cfg = cfg
+        self.results = {}
+        self.winner = None
+        self.started_at = {}
+        cal_dir = presets.calibration_dir(cfg)
+        self.bench_json = cal_dir / "bench.json"
+        steps = [BuildStep("calibrate", func=lambda log: self.bench_json.unlink(missing_ok=True))]
+        for preset in presets.PRESETS:
+            pcfg = presets.apply_preset(replace(cfg, preset=preset, output_dir=str(cal_dir / preset), create_setup=False))
+            exe = backend.executable_path(pcfg)
+            steps.append(BuildStep(f"calibrate-{preset}", func=partial(self._start, preset)))
+            steps += backend.build_steps(pcfg)
+            steps.append(BuildStep(f"measure-{preset}", func=partial(self._measure, preset,
+                                                                    exe if pcfg.onefile else str(Path(exe).parent))))
+            steps.append(BuildStep(f"bench-{preset}", cmd=[
+                cfg.python_exe, str(RUNTIME_DIR / "scenario_bench.py"), str(self.bench_json), "calibration",
+                preset, "3", "-", exe, *cfg.bench_args], workdir=cfg.project_dir))
+        steps.append(BuildStep("calibrate-winner", func=self._pick))
+        self._run_build(steps, log_page=self.log_page, main_window=main_window)
+        self.log_page.lbl_status.setText("Calibration des préréglages en cours…")
+
+    def _start(self, preset: str, log):
+        import time
+        from src.services.presets import PRESETS
+        self.started_at[preset] = time.perf_counter()
+        log(f"[CALIBRATION] Préréglage « {PRESETS[preset]} »")
+
+    def _measure(self, preset: str, output: str, log):
+        import time
+        from src.services.presets import output_size
+        self.results[preset] = {"build_s": time.perf_counter() - self.started_at[preset], "size": output_size(output)}
+
+    def _pick(self, log):
+        from src.services import presets
+        timings = json.loads(self.bench_json.read_text(encoding="utf-8")).get("calibration", {})
+        for preset, result in self.results.items():
+            result["scenario_s"] = timings.get(preset)
+        self.winner = presets.pick_winner(self.results)
+        path = presets.save_results(self.cfg, self.results, self.winner)
+        for preset, r in self.results.items():
+            log(f"[CALIBRATION] {presets.PRESETS[preset]}: build {r['build_s']:.0f} s, "
+                f"{r['size'] / 1e6:.1f} Mo, scénario {r['scenario_s'] * 1000:.0f} ms")
+        log(f"[CALIBRATION] Résultats enregistrés dans {path}")
+
+    def _on_build_finished(self, code: int, main_window: QtWidgets.QMainWindow):
+        from src.services.presets import PRESETS
+        self.progress_timer.stop()
+        self.log_page.progress_bar.setVisible(False)
+        self.log_page.btn_stop.setEnabled(False)
+        main_window._build_in_progress = False
+        main_window.worker = None
+        if code != 0 or not self.winner:
+            self.log_page.lbl_status.setText(f"Calibration échouée (code {code}).")
+            QtWidgets.QMessageBox.warning(main_window, "Calibration", "La calibration a échoué. Consultez les logs.")
+            return
+        combo = main_window.page_options.widgets['cmb_preset']
+        combo.setCurrentIndex(combo.findData(self.winner))
+        self.log_page.lbl_status.setText(f"Préréglage retenu : {PRESETS[self.winner]}")
+        QtWidgets.QMessageBox.information(
+            main_window, "Calibration",
+            f"Préréglage retenu : {PRESETS[self.winner]}\nEnregistrez le profil pour le conserver.")
+
+
+class VerifyReproducibilityAction(BuildAction):
+    """Construit deux fois la configuration en parallèle, dans des dossiers isolés, et compare les fichiers produits."""
+
+    def execute(self, main_window: QtWidgets.QMainWindow):
+        from src.services import reproducible
+        from src.services.presets import apply_preset
+
+        if getattr(main_window, '_build_in_progress', False):
+            QtWidgets.QMessageBox.information(main_window, "Reproductibilité", "Un build est déjà en cours.")
+            return
+        cfg = main_window._config_from_ui()
+        ok, msg = cfg.validate()
+        if not ok:
+            QtWidgets.QMessageBox.warning(main_window, "Validation", msg)
+            return
+        backend = BACKENDS.get(cfg.backend)
+        if backend is None:
+            QtWidgets.QMessageBox.warning(main_window, "Outil", f"Outil inconnu: {cfg.backend}")
+            return
+        self.cfg = apply_preset(cfg)
+        env, runs = reproducible.verification_runs(backend, self.cfg)
+        self.run_cfgs = [run_cfg for run_cfg, _steps in runs]
+        self.pipelines = {i: list(steps) for i, (_cfg, steps) in enumerate(runs, 1)}
+        self.workers = {}
+        self.failed = False
+        self.stopped = False
+
+        main_window.pages.setCurrentWidget(main_window.page_output)
+        main_window.nav.setCurrentRow(4)
+        self.log_page.txt_log.clear()
+        self.log_page.btn_stop.setEnabled(True)
+        self.log_page.lbl_status.setText("Vérification de la reproductibilité : deux builds en parallèle…")
+        self.log_page.progress_bar.setVisible(True)
+        self.log_page.progress_bar.setRange(0, 0)
+        main_window._build_in_progress = True
+        main_window.current_build_action = self
+        self.log_page.append_log(f"[REPRO] SOURCE_DATE_EPOCH={env['SOURCE_DATE_EPOCH']}, "
+                                 f"PYTHONHASHSEED={env['PYTHONHASHSEED']}", "INFO")
+        for i in self.pipelines:
+            self._advance(i, main_window)
+
+    def stop(self):
+        if not getattr(self, 'workers', None):
+            return False
+        self.stopped = True
+        self.pipelines = {i: [] for i in self.pipelines}
+        for worker in self.workers.values():
+            worker.kill()
+        return True
+
+    def _advance(self, i: int, main_window: QtWidgets.QMainWindow):
+        """Enchaîne les étapes du build `i` ; les commandes des deux builds tournent en même temps."""
+        log = lambda msg: self.log_page.append_log(f"[{i}] {msg}", "INFO")
+        steps = self.pipelines[i]
+        if self.failed:
+            return
+        if not steps:
+            self.workers.pop(i, None)
+            if not self.workers and not any(self.pipelines.values()):
+                self._compare(main_window)
+            return
+        step = steps.pop(0)
+        if step.func is None:
+            worker = BuildWorker(step.cmd, workdir=step.workdir or None, env=step.env or None)
+            worker.started.connect(lambda c: log("$ " + shlex.join(c)))
+        else:
+            worker = StepWorker(step)
+            worker.error.connect(log)
+        worker.lines.connect(lambda lines: self.log_page.append_lines([f"[{i}] {ln}" for ln in lines]))
+        worker.finished.connect(lambda code: self._on_run_step_finished(i, code, main_window))
+        self.workers[i] = worker
+        worker.start()
+
+    def _on_run_step_finished(self, i: int, code: int, main_window: QtWidgets.QMainWindow):
+        if code != 0 or self.stopped:
+            self._fail(main_window)
+        else:
+            self._advance(i, main_window)
+
+    def _fail(self, main_window: QtWidgets.QMainWindow):
+        if self.failed:
+            return
+        self.failed = True
+        self.stop()
+        self._finish(main_window, "Vérification interrompue : un des builds a échoué. Consultez les logs.", False)
+
+    def _compare(self, main_window: QtWidgets.QMainWindow):
+        """Compare les deux dossiers produits hors du thread de l'interface (chaque fichier est haché)."""
+        from src.services import reproducible
+        first, second = (c.output_dir for c in self.run_cfgs)
+        report = Path(self.cfg.work_dir()) / "repro" / "differences.txt"
+        result = {}
+
+        def compare(log):
+            log("[REPRO] Comparaison des fichiers produits…")
+            result["count"], result["diffs"] = reproducible.compare_outputs(first, second, str(report))
+
+        # une comparaison ne s'interrompt pas
+        self.log_page.btn_stop.setEnabled(False)
+        self.log_page.lbl_status.setText("Vérification de la reproductibilité : comparaison des fichiers…")
+        worker = StepWorker(BuildStep("repro-compare", func=compare))
+        worker.lines.connect(lambda lines: self.log_page.append_lines(lines))
+        worker.error.connect(lambda msg: self.log_page.append_log(msg, "ERROR"))
+        worker.finished.connect(lambda code: self._report(main_window, code, report, result))
+        self.compare_worker = worker
+        worker.start()
+
+    def _report(self, main_window: QtWidgets.QMainWindow, code: int, report: Path, result: dict):
+        self.compare_worker = None
+        if code != 0:
+            self._finish(main_window, "Comparaison des builds impossible. Consultez les logs.", False)
+            return
+        count, diffs = result["count"], result["diffs"]
+        for rel, reason in diffs:
+            self.log_page.append_log(f"[REPRO] Non déterministe : {rel} ({reason})", "WARNING")
+        if diffs:
+            summary = f"{len(diffs)} fichiers sur {count} diffèrent entre les deux builds (liste : {report})."
+        else:
+            summary = f"Build reproductible : {count} fichiers identiques."
+        self.log_page.append_log(f"[REPRO] {summary}", "INFO")
+        self._finish(main_window, summary, not diffs, "\n".join(f"{rel} ({reason})" for rel, reason in diffs))
+
+    def _finish(self, main_window: QtWidgets.QMainWindow, summary: str, ok: bool, details: str = ""):
+        self.log_page.progress_bar.setVisible(False)
+        self.log_page.progress_bar.setRange(0, 100)
+        self.log_page.btn_stop.setEnabled(False)
+        self.log_page.lbl_status.setText(summary)
+        main_window._build_in_progress = False
+        box = QtWidgets.QMessageBox(QtWidgets.QMessageBox.Information if ok else QtWidgets.QMessageBox.Warning,
+                                    "Reproductibilité", summary, QtWidgets.QMessageBox.Ok, main_window)
+        if details:
+            box.setDetailedText(details)
+        box.exec()
+
+
 class CleanOutputAction(Action):
     """Action pour nettoyer le dossier de sortie."""
     
@@ -344,11 +653,11 @@ class AnalyzeProjectAction(Action):
         # Analyse minimale : vérifier présence de venv et requirements.txt
         proj = Path(cfg.project_dir)
         hints = []
-        # venv
-        for cand in (".venv", "venv", "env"):
-            if (proj/cand).exists():
-                hints.append(f"Environnement détecté: {cand}")
-                break
+        # environnements virtuels du projet (tout dossier contenant pyvenv.cfg)
+        from src.services import interpreters
+        for path, source in interpreters.candidates(str(proj)):
+            if source == "projet":
+                hints.append(f"Environnement détecté: {Path(path).relative_to(proj).parts[0]} ({path})")
         # requirements
         if (proj/"requirements.txt").exists():
             hints.append("requirements.txt détecté. Pensez à geler les versions.")
@@ -357,6 +666,222 @@ class AnalyzeProjectAction(Action):
         QtWidgets.QMessageBox.information(main_window, "Analyse", "\n".join(hints) or "Aucun indice particulier.")
 
 
+class ExplainRebuildAction(Action):
+    """Action pour expliquer ce qui a changé entre le dernier build et le plus proche des précédents."""
+
+    def execute(self):
+        from src.services import build_inputs
+        main_window = self.main_window
+        cfg = main_window._config_from_ui()
+        ok, msg = cfg.validate()
+        if not ok:
+            QtWidgets.QMessageBox.warning(main_window, "Validation", msg)
+            return
+        lines = build_inputs.last_explanation(cfg)
+        box = QtWidgets.QMessageBox(main_window)
+        box.setWindowTitle("Pourquoi ce rebuild ?")
+        box.setText(lines[0])
+        if len(lines) > 1:
+            box.setDetailedText("\n".join(lines[1:]))
+        box.exec()
+
+
+class SuggestLazyImportsAction(Action):
+    """Action pour suggérer les modules à charger en différé (profil -X importtime)."""
+
+    def execute(self):
+        from src.services import lazy_imports
+        main_window = self.main_window
+        cfg = main_window._config_from_ui()
+        ok, msg = cfg.validate()
+        if not ok:
+            QtWidgets.QMessageBox.warning(main_window, "Validation", msg)
+            return
+        main_window.log_service.append("[LAZY] Profil d'import en cours…", "INFO")
+        run_in_background(main_window, main_window.page_options.widgets['btn_lazy_suggest'],
+                          lambda: lazy_imports.profile_imports(cfg.python_exe, cfg.entry_script, cfg.project_dir),
+                          self._show_suggestions)
+
+    def _show_suggestions(self, costs):
+        main_window = self.main_window
+        if isinstance(costs, Exception):
+            main_window.log_service.append(f"[LAZY] Profil d'import impossible: {costs}", "ERROR")
+            QtWidgets.QMessageBox.warning(main_window, "Imports différés", f"Erreur: {costs}")
+            return
+        if not costs:
+            QtWidgets.QMessageBox.information(main_window, "Imports différés", "Aucun module lourd détecté.")
+            return
+        for name, ms in costs:
+            main_window.log_service.append(f"[LAZY] {name}: {ms:.0f} ms", "INFO")
+        ed_lazy = main_window.page_options.widgets['ed_lazy']
+        current = [ln.strip() for ln in ed_lazy.toPlainText().splitlines() if ln.strip()]
+        ed_lazy.setPlainText("\n".join(current + [n for n, _ in costs if n not in current]))
+        QtWidgets.QMessageBox.information(
+            main_window, "Imports différés",
+            "Modules suggérés :\n" + "\n".join(f"{n} ({ms:.0f} ms)" for n, ms in costs))
+
+
+class VerifyLazyImportsAction(Action):
+    """Action pour vérifier que l'application démarre avec le hook et mesurer le gain."""
+
+    def execute(self):
+        from src.services import lazy_imports
+        main_window = self.main_window
+        cfg = main_window._config_from_ui()
+        ok, msg = cfg.validate()
+        if not ok:
+            QtWidgets.QMessageBox.warning(main_window, "Validation", msg)
+            return
+        if not cfg.lazy_modules:
+            QtWidgets.QMessageBox.information(main_window, "Imports différés", "Aucun module à différer.")
+            return
+        hook = lazy_imports.write_hook(cfg.lazy_modules, str(Path(cfg.work_dir()) / "hooks" / "pypack_rth_lazy.py"))
+        main_window.log_service.append("[LAZY] Vérification du démarrage en cours…", "INFO")
+        run_in_background(main_window, main_window.page_options.widgets['btn_lazy_verify'],
+                          lambda: lazy_imports.verify(cfg.python_exe, cfg.entry_script, hook),
+                          self._show_result)
+
+    def _show_result(self, result):
+        from src.services import lazy_imports
+        main_window = self.main_window
+        if isinstance(result, Exception):
+            result = lazy_imports.LazyVerification(False, message=str(result))
+        main_window.log_service.append(f"[LAZY] {result.message}", "INFO" if result.ok else "ERROR")
+        if result.ok:
+            QtWidgets.QMessageBox.information(main_window, "Imports différés", result.message)
+        else:
+            QtWidgets.QMessageBox.warning(main_window, "Imports différés", result.message)
+
+
+class DetectUnusedDataAction(Action):
+    """Action pour repérer les fichiers inclus jamais référencés et proposer de les exclure."""
+
+    def execute(self):
+        from src.services import unused_data
+        main_window = self.main_window
+        cfg = main_window._config_from_ui()
+        ok, msg = cfg.validate()
+        if not ok:
+            QtWidgets.QMessageBox.warning(main_window, "Validation", msg)
+            return
+        items = [i for i in cfg.files_to_include + cfg.dirs_to_include if i]
+        if not items:
+            QtWidgets.QMessageBox.information(main_window, "Fichiers inutilisés", "Aucun fichier ni dossier inclus.")
+            return
+        work = Path(cfg.work_dir()) / "unused"
+        trace = main_window.page_options.widgets['chk_unused_trace'].isChecked()
+
+        def analyze():
+            entries = unused_data.included_entries(items, cfg.include_filters)
+            literals = unused_data.scan_sources(cfg.project_dir, str(work / "literals.json"))
+            opened = listed = None
+            if trace:
+                opened, listed = unused_data.trace_opens(cfg.python_exe, cfg.entry_script, str(work / "trace.json"))
+            return entries, unused_data.find_unused(entries, literals, opened, listed)
+
+        main_window.log_service.append("[UNUSED] Analyse en cours…", "INFO")
+        run_in_background(main_window, main_window.page_options.widgets['btn_unused_data'], analyze, self._show_report)
+
+    def _show_report(self, result):
+        from src.services import unused_data
+        main_window = self.main_window
+        if isinstance(result, Exception):
+            main_window.log_service.append(f"[UNUSED] Analyse impossible: {result}", "ERROR")
+            QtWidgets.QMessageBox.warning(main_window, "Fichiers inutilisés", f"Erreur: {result}")
+            return
+        entries, report = result
+        summary = (f"{len(entries)} fichiers inclus : {report.used} référencés, {report.uncertain} incertains "
+                   f"(dossier référencé), {len(report.unused)} jamais référencés "
+                   f"({report.unused_bytes / (1024 * 1024):.1f} Mo)")
+        main_window.log_service.append(f"[UNUSED] {summary}", "INFO")
+        for dest, _src, size in report.unused:
+            main_window.log_service.append(f"[UNUSED] {dest} ({size / 1024:.0f} Ko)", "INFO")
+        if not report.unused:
+            QtWidgets.QMessageBox.information(main_window, "Fichiers inutilisés", summary)
+            return
+        box = QtWidgets.QMessageBox(QtWidgets.QMessageBox.Question, "Fichiers inutilisés",
+                                    summary + f"\n\nExclure ces fichiers du paquet ? "
+                                    f"Gain estimé : {report.unused_bytes / (1024 * 1024):.1f} Mo.",
+                                    QtWidgets.QMessageBox.Yes | QtWidgets.QMessageBox.No, main_window)
+        box.setDetailedText("\n".join(dest for dest, _src, _size in report.unused))
+        if box.exec() != QtWidgets.QMessageBox.Yes:
+            return
+        tbl = main_window.page_options.widgets['tbl_dirs_to_include']
+        remove, rules = unused_data.exclusion_rules([src for _dest, src, _size in report.unused], tbl.value())
+        filters = tbl.filters()
+        for key, new_rules in rules.items():
+            filters[key] = filters.get(key, []) + [r for r in new_rules if r not in filters.get(key, [])]
+        tbl.setValue([i for i in tbl.value() if i not in remove])
+        tbl.setFilters(filters)
+        main_window.log_service.append(
+            f"[UNUSED] {len(remove)} éléments retirés, {sum(len(r) for r in rules.values())} règles d'exclusion ajoutées", "INFO")
+
+
+class SimulatePayloadFilterAction(Action):
+    """Action pour estimer, sans construire, ce que le filtre retire de chaque paquet installé."""
+
+    def execute(self):
+        from src.services import payload_filter
+        main_window = self.main_window
+        cfg = main_window._config_from_ui()
+        main_window.log_service.append("[PAYLOAD] Simulation en cours…", "INFO")
+        run_in_background(main_window, main_window.page_options.widgets['btn_payload_simulate'],
+                          lambda: payload_filter.simulate(cfg.python_exe, cfg.payload_rules,
+                                                          str(Path(cfg.work_dir()) / "payload")),
+                          self._show_report)
+
+    def _show_report(self, report):
+        from src.services import payload_filter
+        main_window = self.main_window
+        if isinstance(report, Exception):
+            main_window.log_service.append(f"[PAYLOAD] Simulation impossible: {report}", "ERROR")
+            QtWidgets.QMessageBox.warning(main_window, "Paquets tiers", f"Erreur: {report}")
+            return
+        lines = payload_filter.report_lines(report)
+        removed, total = sum(s[0] for s in report.values()), sum(s[2] for s in report.values())
+        size = sum(s[1] for s in report.values()) / (1024 * 1024)
+        summary = (f"{removed} fichiers sur {total} retirés des paquets installés ({size:.1f} Mo), "
+                   f"{len(lines)} paquets concernés. Seuls les paquets collectés par le build sont touchés.")
+        main_window.log_service.append(f"[PAYLOAD] {summary}", "INFO")
+        for line in lines:
+            main_window.log_service.append(f"[PAYLOAD] {line}", "INFO")
+        box = QtWidgets.QMessageBox(QtWidgets.QMessageBox.Information, "Paquets tiers", summary,
+                                    QtWidgets.QMessageBox.Ok, main_window)
+        box.setDetailedText("\n".join(lines))
+        box.exec()
+
+
+class BenchmarkModuleIndexAction(Action):
+    """Action pour comparer le temps d'import de l'application avec et sans index des modules."""
+
+    def execute(self):
+        from src.services import module_index
+        main_window = self.main_window
+        cfg = main_window._config_from_ui()
+        backend = BACKENDS.get(cfg.backend)
+        exe = backend.executable_path(cfg) if backend else ""
+        if not cfg.module_index or not Path(exe).exists():
+            QtWidgets.QMessageBox.information(
+                main_window, "Index des modules",
+                f"Construisez d'abord l'application avec l'index des modules activé.\n{exe}")
+            return
+        main_window.log_service.append("[INDEX] Benchmark en cours…", "INFO")
+        run_in_background(main_window, main_window.page_options.widgets['btn_index_bench'],
+                          lambda: module_index.benchmark(exe), self._show_results)
+
+    def _show_results(self, results):
+        main_window = self.main_window
+        if isinstance(results, Exception):
+            main_window.log_service.append(f"[INDEX] Benchmark impossible: {results}", "ERROR")
+            QtWidgets.QMessageBox.warning(main_window, "Index des modules", f"Erreur: {results}")
+            return
+        lines = [f"{label}: {r['modules']} modules en {r['seconds'] * 1000:.0f} ms "
+                 f"(processus {r['wall'] * 1000:.0f} ms, {r['errors']} erreurs)" for label, r in results.items()]
+        for line in lines:
+            main_window.log_service.append(f"[INDEX] {line}", "INFO")
+        QtWidgets.QMessageBox.information(main_window, "Index des modules", "\n".join(lines))
+
+
 class ProfileNewAction(Action):
     """Action pour créer un nouveau profil."""
     
@@ -501,6 +1026,7 @@ class CreateSetupExeAction(BaseBuildAction):
     
     def __init__(self, log_page):
         super().__init__(log_page)  # Initialiser BaseBuildAction
+        self.job = None  # BuildJob du build qui a demandé le setup (voir MainWindow.finish_build_app)
         
     def execute(self):
         import subprocess
@@ -585,10 +1111,12 @@ class CreateSetupExeAction(BaseBuildAction):
                 # Déplacer setup.exe vers le répertoire de destination
                 setup_exe_path = dist_path / "setup.exe"
                 if setup_exe_path.exists():
-                    # Récupérer la configuration de l'interface utilisateur
-                    cfg = main_window._config_from_ui()
-                    # Déterminer le chemin de destination
-                    destination_dir = Path(cfg.output_dir) / cfg.name
+                    # Configuration du build qui a demandé le setup, sinon celle de l'interface
+                    if self.job is not None:
+                        destination_dir = self.job.app_dir
+                    else:
+                        cfg = main_window._config_from_ui()
+                        destination_dir = Path(cfg.output_dir) / cfg.name
                     destination_dir.mkdir(parents=True, exist_ok=True)
                     destination_path = destination_dir / "setup.exe"
                     
@@ -1,13 +1,15 @@
 from __future__ import annotations
+import json
 import os
 import sys
 from dataclasses import asdict, dataclass, field
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
+from typing import Callable, Dict, List, Tuple, Optional
 
 from PySide6 import QtCore
 
 APP_ORG = "XenSoft"
+RUNTIME_DIR = Path(__file__).resolve().parent / "runtime"
 
 @dataclass
 class BuildConfig:
@@ -15,7 +17,7 @@ class BuildConfig:
     entry_script: str = ""
     name: str = "MyApp"
     icon_path: str = ""
-    backend: str = "pyinstaller"  # "pyinstaller" | "nuitka"
+    backend: str = "pyinstaller"  # "pyinstaller" | "nuitka" | "hybrid"
     onefile: bool = True
     windowed: bool = True
     clean: bool = True
@@ -29,6 +31,31 @@ class BuildConfig:
     output_dir: str = ""
     python_exe: str = ""  # optionnel : forcer un Python spécifique
     create_setup: bool = False  # Ajout pour la persistance de la case à cocher
+    onefile_cache: bool = False  # onefile extrait une seule fois dans un cache utilisateur
+    lazy_modules: List[str] = field(default_factory=list)  # modules chargés à la demande (LazyLoader)
+    module_index: bool = False  # index des modules embarqués + finder O(1) au démarrage
+    resource_pack: bool = False  # fichiers/dossiers inclus regroupés dans une archive lue par mmap
+    optimize: int = 0  # niveau d'optimisation du bytecode : 1 = sans assert, 2 = sans assert ni docstrings
+    optimize_keep_docstrings: List[str] = field(default_factory=list)  # paquets restant au niveau 1
+    hybrid_workload: str = ""  # hybride : scénario profilé (par défaut le script d'entrée)
+    hybrid_modules: List[str] = field(default_factory=list)  # hybride : modules imposés (sinon profilage)
+    hybrid_max_modules: int = 5  # hybride : nombre maximal de modules compilés par Nuitka
+    pgo: bool = False  # Nuitka : optimisation guidée par profil (deux passes)
+    pgo_args: List[str] = field(default_factory=list)  # arguments du scénario d'entraînement PGO
+    preset: str = ""  # préréglage de performance (voir src/services/presets.py)
+    bench_args: List[str] = field(default_factory=list)  # arguments du scénario mesuré par la calibration
+    extra_entries: List[str] = field(default_factory=list)  # scripts d'exécutables supplémentaires (même analyse)
+    dual_output: bool = False  # dossier + exécutable onefile produits par une seule analyse
+    stage_includes: bool = False  # données incluses dédoublonnées dans une arborescence de liens (un seul argument)
+    include_filters: Dict[str, List[str]] = field(default_factory=dict)  # règles glob par dossier inclus
+    optimize_assets: bool = False  # PNG recompressés, formats de travail retirés, icône .ico générée
+    asset_drop_patterns: List[str] = field(default_factory=list)  # motifs retirés en plus de ceux par défaut
+    payload_filter: bool = False  # tests, docs, stubs... des paquets tiers retirés
+    payload_rules: Dict[str, List[str]] = field(default_factory=dict)  # {paquet ou "*": règles} en plus des défauts
+    reproducible: bool = False  # SOURCE_DATE_EPOCH / PYTHONHASHSEED fixés, dates de la sortie normalisées
+    work_root: str = ""  # dossier de build imposé (par défaut <projet>/build), pour des builds isolés
+    managed_env: bool = False  # venv de build géré (dépendances + outil), mis en commun par empreinte
+    wheelhouse: bool = False  # venv géré installé hors ligne depuis la wheelhouse locale
 
     def validate(self) -> Tuple[bool, str]:
         if not self.entry_script:
@@ -39,8 +66,26 @@ class BuildConfig:
             return False, "Le nom de l'application est requis."
         if self.icon_path and not Path(self.icon_path).exists():
             return False, f"Icône introuvable: {self.icon_path}"
-        if self.backend not in {"pyinstaller", "nuitka"}:
+        if self.backend not in {"pyinstaller", "nuitka", "hybrid"}:
             return False, f"Backend non supporté: {self.backend}"
+        if self.optimize not in {0, 1, 2}:
+            return False, f"Niveau d'optimisation invalide: {self.optimize}"
+        if self.hybrid_workload and not Path(self.hybrid_workload).exists():
+            return False, f"Scénario introuvable: {self.hybrid_workload}"
+        if self.pgo and self.backend == "nuitka":
+            from src.services import pgo
+            error = pgo.compiler_error(self.extra_args)
+            if error:
+                return False, error
+        for script in self.extra_entries:
+            if not Path(script).exists():
+                return False, f"Script introuvable: {script}"
+        if self.extra_entries:
+            from src.services import multi_exe
+            error = multi_exe.check_names(
+                [self.name, multi_exe.entry_name(self.entry_script)], self.extra_entries)
+            if error:
+                return False, error
         return True, ""
 
     def normalized(self) -> "BuildConfig":
@@ -48,11 +93,32 @@ class BuildConfig:
         c.project_dir = normpath(c.project_dir or Path(self.entry_script).parent)
         c.entry_script = normpath(c.entry_script)
         c.icon_path = normpath(c.icon_path)
+        c.hybrid_workload = normpath(c.hybrid_workload)
+        c.work_root = normpath(c.work_root)
+        c.extra_entries = [normpath(p) for p in c.extra_entries]
+        from src.services import include_filter
+        c.include_filters = include_filter.normalized_filters(c.include_filters)
+        if c.dual_output:
+            # le dossier est la sortie principale, le onefile est produit en plus
+            c.onefile = False
         c.output_dir = normpath(c.output_dir or str(Path(c.project_dir)/"dist"))
-        c.python_exe = normpath(c.python_exe or detect_python_exe())
+        # sans résolution des liens : le python d'un venv est un lien vers l'interpréteur de base
+        c.python_exe = str(Path(c.python_exe or detect_python_exe()).expanduser().absolute())
         c.add_data = [(normpath(a), b) for a, b in self.add_data]
         return c
 
+    def build_root(self) -> str:
+        """Racine des fichiers intermédiaires (outil de packaging et PyPack Studio)."""
+        return self.work_root or str(Path(self.project_dir) / "build")
+
+    def work_dir(self) -> str:
+        """Dossier de travail de PyPack Studio pour ce build (fichiers générés).
+
+        Rattaché au script d'entrée et non au nom : renommer l'application ne
+        change pas les chemins vus par l'analyse (hooks, archive de ressources).
+        """
+        return str(Path(self.build_root()) / ".pypack" / Path(self.entry_script).stem)
+
 
 def normpath(p: str | Path) -> str:
     if not p:
@@ -61,7 +127,7 @@ def normpath(p: str | Path) -> str:
 
 
 def detect_python_exe() -> str:
-    return normpath(sys.executable)
+    return str(Path(sys.executable).absolute())
 
 
 def add_data_kv(pairs: List[Tuple[str, str]]) -> List[str]:
@@ -81,10 +147,246 @@ def add_data_kv(pairs: List[Tuple[str, str]]) -> List[str]:
     return out
 
 
+def resource_pack_path(cfg: BuildConfig) -> str:
+    from src.services import resource_pack
+    return str(Path(cfg.work_dir()) / "resources" / resource_pack.PAK_NAME)
+
+
+def include_stage_dir(cfg: BuildConfig) -> str:
+    return str(Path(cfg.work_dir()) / "stage" / "data")
+
+
+def assets_cache_dir(cfg: BuildConfig) -> str:
+    return str(Path(cfg.work_dir()) / "assets")
+
+
+def build_icon(cfg: BuildConfig) -> str:
+    """Icône transmise au backend : .ico générée depuis l'image si l'optimisation des ressources l'exige."""
+    from src.services import assets
+    if cfg.optimize_assets and assets.icon_needed(cfg.icon_path) and Path(cfg.icon_path).is_file():
+        return assets.icon_output(cfg.icon_path, assets_cache_dir(cfg))
+    return cfg.icon_path
+
+
+def stage_active(cfg: BuildConfig) -> bool:
+    """Arborescence préparée demandée, ou imposée par des règles de filtrage
+    (les options --add-data / --include-data-dir n'en acceptent pas) ou par
+    l'optimisation des ressources (sources remplacées par leur version optimisée)."""
+    if cfg.stage_includes or (cfg.optimize_assets and (cfg.add_data or not cfg.resource_pack)):
+        return True
+    from src.services import include_filter
+    filters = include_filter.normalized_filters(cfg.include_filters)
+    return not cfg.resource_pack and any(include_filter.rules_for(filters, d) for d in cfg.dirs_to_include if d)
+
+
+def staged_includes(cfg: BuildConfig) -> Tuple[List[Tuple[str, str]], List[str], List[str]]:
+    """(add_data, fichiers, dossiers) à préparer ; les fichiers et dossiers vont
+    dans l'archive de ressources quand elle est activée."""
+    if not stage_active(cfg):
+        return [], [], []
+    if cfg.resource_pack:
+        return cfg.add_data, [], []
+    return cfg.add_data, cfg.files_to_include, cfg.dirs_to_include
+
+
+def runtime_hooks(cfg: BuildConfig) -> List[Tuple[str, Callable[[str], str]]]:
+    """Hooks d'exécution générés pour ce build : (chemin, fonction d'écriture)."""
+    hooks_dir = Path(cfg.work_dir()) / "hooks"
+    hooks = []
+    if cfg.lazy_modules:
+        from src.services import lazy_imports
+        hooks.append((str(hooks_dir / "pypack_rth_lazy.py"),
+                      lambda dest: lazy_imports.write_hook(cfg.lazy_modules, dest)))
+    if cfg.resource_pack:
+        from src.services import resource_pack
+        hooks.append((str(hooks_dir / "pypack_rth_resources.py"), resource_pack.write_hook))
+    if cfg.module_index:
+        from src.services import module_index
+        # En tête : les imports suivants (hooks compris) profitent déjà de l'index
+        hooks.insert(0, (str(hooks_dir / "pypack_rth_module_index.py"), module_index.write_hook))
+    from src.services import onefile_cache
+    if onefile_cache.supported(cfg):
+        hooks.append((str(hooks_dir / "pypack_rth_onefile_cache.py"), lambda dest: onefile_cache.write_hook(
+            onefile_cache.cache_key(cfg, BACKENDS["nuitka"].build_command(cfg)), dest)))
+    return hooks
+
+
+def write_nuitka_hooks_plugin(hook_paths: List[str], dest: str) -> str:
+    """Génère le plugin Nuitka qui exécute les hooks avant le module __main__."""
+    text = (RUNTIME_DIR / "nuitka_hooks_plugin.py").read_text(encoding="utf-8")
+    text = text.replace("HOOK_FILES = []", f"HOOK_FILES = {list(hook_paths)!r}", 1)
+    Path(dest).parent.mkdir(parents=True, exist_ok=True)
+    Path(dest).write_text(text, encoding="utf-8")
+    return dest
+
+
+@dataclass
+class BuildStep:
+    """Étape du pipeline de build : commande externe (QProcess) ou fonction Python.
+
+    `func` reçoit une fonction de log et lève une exception en cas d'échec ;
+    `env` complète l'environnement hérité de la commande.
+    """
+    label: str
+    cmd: List[str] = field(default_factory=list)
+    func: Optional[Callable[[Callable[[str], None]], None]] = None
+    workdir: str = ""
+    env: Dict[str, str] = field(default_factory=dict)
+
+
 class PackagerBackend(QtCore.QObject):
     def build_command(self, cfg: BuildConfig) -> List[str]:
         raise NotImplementedError
 
+    def build_steps(self, cfg: BuildConfig) -> List[BuildStep]:
+        """Pipeline complet du build."""
+        return self.prepare_steps(cfg) + self.compile_steps(cfg) + self.finalize_steps(cfg)
+
+    def incremental_build_steps(self, cfg: BuildConfig, profile: str = "") -> List[BuildStep]:
+        """Pipeline selon les changements depuis le dernier build réussi (voir build_phases)."""
+        from src.services import build_phases, env_fingerprint
+        changed = build_phases.changed_fields(build_phases.load_previous(cfg), cfg)
+        # paquets installés modifiés depuis le dernier build du dossier : l'analyse précédente
+        # n'est plus valable ; les changements affichés sont ceux depuis le dernier build du profil
+        # (un venv géré pas encore créé a de toute façon changé python_exe)
+        env_changes, env_stale = (env_fingerprint.changes_since_last_build(cfg, profile)
+                                  if Path(cfg.python_exe).is_file() else ([], False))
+        if changed is not None and env_stale:
+            changed = changed + ["environnement"]
+        # --clean demandé : build complet, même si l'analyse précédente est réutilisable
+        reused = not cfg.clean and build_phases.assembly_only(changed) and self.can_reuse_analysis(cfg)
+        steps = self.assembly_steps(cfg) if reused else self.build_steps(cfg)
+        if cfg.reproducible:
+            from src.services import reproducible
+            env = reproducible.build_env(cfg)
+            steps = reproducible.with_env(steps, env) + [reproducible.normalize_step(cfg, env)]
+
+        def phases(log):
+            log(build_phases.describe(changed, reused, self.name(), clean=cfg.clean and self.can_reuse_analysis(cfg)))
+            for line in env_changes:
+                log(f"[PHASE]   {line}")
+
+        def record(log):
+            build_phases.save(cfg)
+            env_fingerprint.save(cfg, profile=profile)
+
+        return [BuildStep("phases", func=phases), *steps, BuildStep("record", func=record)]
+
+    def can_reuse_analysis(self, cfg: BuildConfig) -> bool:
+        """Vrai si le résultat de l'analyse du build précédent est disponible (jamais par défaut)."""
+        return False
+
+    def assembly_steps(self, cfg: BuildConfig) -> List[BuildStep]:
+        """Pipeline ne reconstruisant que les exécutables à partir de l'analyse précédente."""
+        raise NotImplementedError
+
+    def compile_steps(self, cfg: BuildConfig) -> List[BuildStep]:
+        """Compilation proprement dite ; par défaut une seule commande."""
+        return [BuildStep("build", cmd=self.build_command(cfg), workdir=cfg.project_dir)]
+
+    def bundle_dir(self, cfg: BuildConfig) -> str:
+        """Dossier de l'application construite en mode dossier (racine des modules)."""
+        raise NotImplementedError
+
+    def executable_path(self, cfg: BuildConfig) -> str:
+        """Chemin de l'exécutable produit par le build."""
+        raise NotImplementedError
+
+    def finalize_steps(self, cfg: BuildConfig) -> List[BuildStep]:
+        """Étapes appliquées au dossier de l'application après la compilation."""
+        steps = []
+        if cfg.module_index and cfg.onefile:
+            def skip(log):
+                log("[INDEX] Index des modules ignoré en onefile (utilisez le mode dossier).")
+            steps.append(BuildStep("module-index", func=skip))
+        elif cfg.module_index:
+            def write_index(log):
+                from src.services import module_index
+                path, count = module_index.write_index(self.bundle_dir(cfg))
+                log(f"[INDEX] {count} modules indexés dans {path}")
+            steps.append(BuildStep("module-index", func=write_index))
+        steps.extend(self.optimize_report_steps(cfg))
+        return steps
+
+    def optimize_dir(self, cfg: BuildConfig) -> Path:
+        return Path(cfg.work_dir()) / "optimize"
+
+    def optimize_modules_file(self, cfg: BuildConfig) -> str:
+        """Liste JSON des modules Python collectés (vide si le backend ne la fournit pas)."""
+        return ""
+
+    def optimize_report_steps(self, cfg: BuildConfig) -> List[BuildStep]:
+        """Rapport de taille / dé-sérialisation, exécuté dans l'interpréteur cible.
+
+        Au niveau 0, seule la taille de référence est enregistrée, et seulement si
+        l'optimisation a déjà été utilisée pour ce projet.
+        """
+        history = self.optimize_dir(cfg) / "sizes.json"
+        if not cfg.optimize and not history.exists():
+            return []
+        bundle = self.executable_path(cfg) if cfg.onefile else str(Path(self.executable_path(cfg)).parent)
+        cmd = [cfg.python_exe, str(RUNTIME_DIR / "bytecode_report.py"), str(cfg.optimize), bundle, str(history)]
+        modules = self.optimize_modules_file(cfg)
+        if cfg.optimize and modules:
+            cmd.append(modules)
+        return [BuildStep("optimize-report", cmd=cmd, workdir=cfg.project_dir)]
+
+    def prepare_steps(self, cfg: BuildConfig) -> List[BuildStep]:
+        """Étapes préparatoires : fichiers générés avant la compilation."""
+        steps = []
+
+        def optimized(mapping, log):
+            from src.services import assets
+            mapping, stats = assets.optimize_mapping(mapping, assets_cache_dir(cfg), cfg.asset_drop_patterns)
+            log(f"[ASSETS] {stats['png']} PNG : {stats['optimized']} recompressés, {stats['cached']} en cache, "
+                f"{stats['saved_bytes'] / 1024:.0f} Ko gagnés ; {stats['dropped']} fichiers de travail retirés "
+                f"({stats['dropped_bytes'] / 1024:.0f} Ko)")
+            return mapping
+
+        icon = build_icon(cfg)
+        if icon != cfg.icon_path:
+            def make_icon(log):
+                from src.services import assets
+                assets.write_ico(cfg.icon_path, icon)
+                log(f"[ASSETS] Icône multi-résolution: {icon}")
+
+            steps.append(BuildStep("icon", func=make_icon))
+        if cfg.resource_pack:
+            def pack_resources(log):
+                from src.services import resource_pack
+                entries = resource_pack.collect_entries(cfg.files_to_include, cfg.dirs_to_include, cfg.include_filters)
+                if cfg.optimize_assets:
+                    entries = list(optimized(dict(entries), log).items())
+                count, total, reused = resource_pack.pack(entries, resource_pack_path(cfg))
+                state = "inchangée, réutilisée" if reused else "générée"
+                log(f"[PAK] Archive de ressources {state}: {count} fichiers, {total / 1024:.0f} Ko")
+
+            steps.append(BuildStep("resources", func=pack_resources))
+        if stage_active(cfg):
+            def stage(log):
+                from src.services import include_stage
+                mapping, duplicates = include_stage.resolve(*staged_includes(cfg), cfg.include_filters)
+                if cfg.optimize_assets:
+                    mapping = optimized(mapping, log)
+                created, reused, removed, total = include_stage.materialize(mapping, include_stage_dir(cfg))
+                log(f"[STAGE] {len(mapping)} fichiers ({total / 1024:.0f} Ko) : {created} liés, {reused} inchangés, "
+                    f"{removed} retirés, {duplicates} doublons écartés")
+
+            steps.append(BuildStep("stage", func=stage))
+        hooks = runtime_hooks(cfg)
+        if hooks:
+            def write_hooks(log):
+                for path, writer in hooks:
+                    writer(path)
+                    log(f"[HOOK] Hook d'exécution généré: {path}")
+                self.write_extra_files(cfg, [path for path, _ in hooks])
+
+            steps.append(BuildStep("hooks", func=write_hooks))
+        return steps
+
+    def write_extra_files(self, cfg: BuildConfig, hook_paths: List[str]):
+        """Fichiers propres au backend dérivés des hooks (aucun par défaut)."""
+
     def name(self) -> str:
         return "base"
 
@@ -104,19 +406,27 @@ class PyInstallerBackend(PackagerBackend):
         if cfg.windowed and not cfg.console:
             cmd.append("--windowed")
         if cfg.icon_path:
-            cmd.append(f"--icon={cfg.icon_path}")
+            cmd.append(f"--icon={build_icon(cfg)}")
         if cfg.output_dir:
             cmd.extend(["--distpath", cfg.output_dir])
+        if cfg.optimize:
+            cmd.extend(["--optimize", str(cfg.optimize)])
+        # données préparées : un seul dossier reproduisant la disposition du paquet
+        if any(staged_includes(cfg)):
+            cmd.extend(["--add-data", add_data_kv([(include_stage_dir(cfg), ".")])[0]])
         # add-data
-        for pair in add_data_kv(cfg.add_data):
+        for pair in ([] if stage_active(cfg) else add_data_kv(cfg.add_data)):
             cmd.extend(["--add-data", pair])
         # directories to create will be handled by creating placeholder files before build
+        # fichiers et dossiers inclus : une seule archive indexée au lieu d'une entrée par fichier
+        if cfg.resource_pack:
+            cmd.extend(["--add-data", add_data_kv([(resource_pack_path(cfg), ".")])[0]])
         # files to include
-        for file_path in cfg.files_to_include:
+        for file_path in ([] if cfg.resource_pack or stage_active(cfg) else cfg.files_to_include):
             if file_path:
                 cmd.extend(["--add-data", f"{normpath(file_path)};."])
         # dirs to include
-        for dir_path in cfg.dirs_to_include:
+        for dir_path in ([] if cfg.resource_pack or stage_active(cfg) else cfg.dirs_to_include):
             if dir_path and os.path.isdir(dir_path):
                 # Ajouter le répertoire avec son contenu
                 # PyInstaller utilise le format "src;dst" où dst est le chemin dans le paquet
@@ -132,12 +442,133 @@ class PyInstallerBackend(PackagerBackend):
         # hidden-imports
         for hi in cfg.hidden_imports:
             cmd.extend(["--hidden-import", hi])
+        # hooks d'exécution générés (imports différés, ...)
+        for hook_path, _ in runtime_hooks(cfg):
+            cmd.extend(["--runtime-hook", hook_path])
         # extra
         cmd.extend(cfg.extra_args)
-        # entry
+        # entry (+ exécutables supplémentaires : une seule Analysis, cf. spec_patches)
         cmd.append(cfg.entry_script)
+        cmd.extend(cfg.extra_entries)
         return cmd
 
+    def spec_patches(self, cfg: BuildConfig) -> List[str]:
+        """Code inséré dans le .spec après l'Analysis ; vide = build direct en ligne de commande."""
+        blocks = []
+        if cfg.optimize == 2 and cfg.optimize_keep_docstrings:
+            keep = tuple(sorted(set(cfg.optimize_keep_docstrings)))
+            blocks.append(
+                "# Paquets qui lisent leurs docstrings à l'exécution : niveau 1 au lieu de 2\n"
+                f"_pypack_keep = {keep!r}\n"
+                "a.pure = [(n, p, 'PYMODULE-1' if t == 'PYMODULE-2' and any(n == k or n.startswith(k + '.') "
+                "for k in _pypack_keep) else t) for n, p, t in a.pure]")
+        if cfg.optimize:
+            blocks.append(
+                "# Modules collectés, pour le rapport d'optimisation\n"
+                "import json as _pypack_json\n"
+                f"with open({self.optimize_modules_file(cfg)!r}, 'w', encoding='utf-8') as _pypack_f:\n"
+                "    _pypack_json.dump([[n, p, {'PYMODULE-1': 1, 'PYMODULE-2': 2}.get(t, 0)] "
+                "for n, p, t in a.pure if isinstance(p, str)], _pypack_f)")
+        if cfg.payload_filter:
+            from src.services import payload_filter
+            blocks.append(payload_filter.spec_block(cfg.payload_rules, self.payload_report_path(cfg)))
+        if cfg.extra_entries or cfg.dual_output:
+            from src.services import multi_exe, pyi_spec
+            entries = [(cfg.name, cfg.entry_script)] + [(multi_exe.entry_name(p), p) for p in cfg.extra_entries]
+            blocks.append(pyi_spec.targets_block(entries, with_onefile=cfg.dual_output))
+        return blocks
+
+    def payload_report_path(self, cfg: BuildConfig) -> str:
+        return str(Path(cfg.work_dir()) / "payload" / "removed.json")
+
+    def spec_path(self, cfg: BuildConfig) -> str:
+        # Nom stable : PyInstaller range son analyse dans build/<nom du .spec>
+        return str(Path(cfg.work_dir()) / "spec" / f"{Path(cfg.entry_script).stem}.spec")
+
+    def analysis_workpath(self, cfg: BuildConfig) -> Path:
+        return Path(cfg.build_root()) / Path(self.spec_path(cfg)).stem
+
+    def compile_steps(self, cfg: BuildConfig) -> List[BuildStep]:
+        # Toujours par un .spec au nom stable, pour que l'Analysis survive à un renommage
+        from src.services import pyi_spec
+        blocks = self.spec_patches(cfg)
+        spec = self.spec_path(cfg)
+
+        def patch(log):
+            self.optimize_dir(cfg).mkdir(parents=True, exist_ok=True)
+            generated = Path(spec).with_name(f"{cfg.name}.spec")
+            if generated != Path(spec):
+                os.replace(generated, spec)
+            if blocks:
+                pyi_spec.patch_spec(spec, blocks)
+                log(f"[SPEC] Fichier spec complété: {spec}")
+
+        direct = self.build_command(cfg)
+        return [
+            BuildStep("makespec", cmd=pyi_spec.makespec_command(direct, str(Path(spec).parent)),
+                      workdir=cfg.project_dir),
+            BuildStep("spec", func=patch),
+            BuildStep("build", cmd=pyi_spec.build_command(cfg.python_exe, spec, cfg.output_dir, cfg.build_root(),
+                                                          cfg.clean, pyi_spec.split_args(direct[3:])[1]),
+                      workdir=cfg.project_dir),
+        ]
+
+    def optimize_modules_file(self, cfg: BuildConfig) -> str:
+        return str(self.optimize_dir(cfg) / "modules.json")
+
+    def can_reuse_analysis(self, cfg: BuildConfig) -> bool:
+        return self.analysis_workpath(cfg).is_dir()
+
+    def assembly_steps(self, cfg: BuildConfig) -> List[BuildStep]:
+        # Seulement sans --clean (voir incremental_build_steps) : PyInstaller retrouve l'Analysis
+        # et le PYZ à jour et ne refait que EXE/COLLECT
+        return self.build_steps(cfg)
+
+    def finalize_steps(self, cfg: BuildConfig) -> List[BuildStep]:
+        steps = super().finalize_steps(cfg)
+        if cfg.dual_output:
+            def move_onefile(log):
+                from src.services import multi_exe, pyi_spec
+                dest_dir = Path(cfg.output_dir) / "onefile"
+                dest_dir.mkdir(parents=True, exist_ok=True)
+                suffix = ".exe" if os.name == 'nt' else ""
+                for name in [cfg.name] + [multi_exe.entry_name(p) for p in cfg.extra_entries]:
+                    built = Path(cfg.output_dir) / f"{name}{pyi_spec.ONEFILE_SUFFIX}{suffix}"
+                    os.replace(built, dest_dir / f"{name}{suffix}")
+                    log(f"[DUAL] Exécutable onefile: {dest_dir / (name + suffix)}")
+            steps.insert(0, BuildStep("onefile", func=move_onefile))
+        if cfg.payload_filter:
+            def payload_report(log):
+                from src.services import payload_filter
+                report = json.loads(Path(self.payload_report_path(cfg)).read_text(encoding="utf-8"))
+                log(f"[PAYLOAD] {sum(s[0] for s in report.values())} fichiers retirés des paquets tiers "
+                    f"({sum(s[1] for s in report.values()) / (1024 * 1024):.1f} Mo)")
+                for line in payload_filter.report_lines(report):
+                    log(f"[PAYLOAD] {line}")
+            steps.append(BuildStep("payload-report", func=payload_report))
+        return steps
+
+    def bundle_dir(self, cfg: BuildConfig) -> str:
+        # PyInstaller >= 6 place les dépendances dans _internal (sys._MEIPASS)
+        app_dir = Path(cfg.output_dir) / cfg.name
+        internal = app_dir / "_internal"
+        return str(internal if internal.is_dir() else app_dir)
+
+    def executable_path(self, cfg: BuildConfig) -> str:
+        exe_name = cfg.name + (".exe" if os.name == 'nt' else "")
+        if cfg.onefile:
+            return str(Path(cfg.output_dir) / exe_name)
+        return str(Path(cfg.output_dir) / cfg.name / exe_name)
+
+    def prepare_steps(self, cfg: BuildConfig) -> List[BuildStep]:
+        steps = super().prepare_steps(cfg)
+        if cfg.onefile and cfg.onefile_cache:
+            def notice(log):
+                log("[CACHE] Cache onefile non disponible avec PyInstaller (extraction à chaque lancement) : "
+                    "utilisez Nuitka ou la sortie dossier.")
+            steps.insert(0, BuildStep("onefile-cache", func=notice))
+        return steps
+
 
 class NuitkaBackend(PackagerBackend):
     def name(self) -> str:
@@ -146,29 +577,38 @@ class NuitkaBackend(PackagerBackend):
     def build_command(self, cfg: BuildConfig) -> List[str]:
         # Nuitka: standalone pour embarquer l'interpréteur + deps
         cmd = [cfg.python_exe, "-m", "nuitka", "--standalone"]
-        # --onefile reste optionnel sur Nuitka, plus lent mais pratique
-        if cfg.onefile:
+        # --onefile reste optionnel sur Nuitka, plus lent mais pratique ;
+        # le dossier .dist, conservé sans --remove-output, sert de sortie dossier en mode double
+        if cfg.onefile or cfg.dual_output:
             cmd.append("--onefile")
+        spec_at = len(cmd)
         if cfg.windowed and not cfg.console:
             cmd.append("--windows-disable-console") if os.name == 'nt' else None
         if cfg.icon_path and os.name == 'nt':
-            cmd.extend(["--windows-icon-from-ico", cfg.icon_path])
+            cmd.append(f"--windows-icon-from-ico={build_icon(cfg)}")
         if cfg.output_dir:
-            cmd.extend(["--output-dir", cfg.output_dir])
+            cmd.append(f"--output-dir={cfg.output_dir}")
+        # données préparées : un seul dossier reproduisant la disposition du paquet
+        if any(staged_includes(cfg)):
+            cmd.append(f"--include-raw-dir={include_stage_dir(cfg)}=.")
         # data files
-        for src, dst in cfg.add_data:
+        for src, dst in ([] if stage_active(cfg) else cfg.add_data):
             # Nuitka utilise --include-data-file=SRC=DST (ou DATA-DIR)
             if src:
                 dst_final = dst or os.path.basename(src)
                 cmd.append(f"--include-data-file={src}={dst_final}")
         # directories to create will be handled by creating placeholder files before build
+        # fichiers et dossiers inclus : une seule archive indexée au lieu d'une entrée par fichier
+        if cfg.resource_pack:
+            pak = resource_pack_path(cfg)
+            cmd.append(f"--include-data-file={pak}={os.path.basename(pak)}")
         # files to include
-        for file_path in cfg.files_to_include:
+        for file_path in ([] if cfg.resource_pack or stage_active(cfg) else cfg.files_to_include):
             if file_path:
                 file_name = os.path.basename(file_path)
                 cmd.append(f"--include-data-file={normpath(file_path)}={file_name}")
         # dirs to include
-        for dir_path in cfg.dirs_to_include:
+        for dir_path in ([] if cfg.resource_pack or stage_active(cfg) else cfg.dirs_to_include):
             if dir_path and os.path.isdir(dir_path):
                 # Pour Nuitka, --include-data-dir=PATH=DESTDIR inclut le répertoire et son contenu
                 # On peut utiliser le nom du répertoire comme destination
@@ -176,20 +616,181 @@ class NuitkaBackend(PackagerBackend):
                 cmd.append(f"--include-data-dir={normpath(dir_path)}={dir_name}")
         # hidden imports
         for hi in cfg.hidden_imports:
-            cmd.extend(["--include-module", hi])
+            cmd.append(f"--include-module={hi}")
+        # optimisation : pas de réglage par module, les exceptions ramènent tout au niveau 1
+        if cfg.optimize:
+            cmd.append("--python-flag=no_asserts")
+        if cfg.optimize == 2 and not cfg.optimize_keep_docstrings:
+            cmd.append("--python-flag=no_docstrings")
+        # hooks d'exécution : Nuitka n'a pas de --runtime-hook, un plugin les insère dans __main__
+        if runtime_hooks(cfg):
+            cmd.append(f"--user-plugin={self.hooks_plugin_path(cfg)}")
         # nom
         if cfg.name:
-            cmd.extend(["--product-name", cfg.name, "--company-name", APP_ORG])
+            cmd.extend([f"--product-name={cfg.name}", f"--company-name={APP_ORG}"])
             if os.name == 'nt':
-                cmd.extend(["--file-version", "1.0.0", "--product-version", "1.0.0"])
+                cmd.extend(["--file-version=1.0.0", "--product-version=1.0.0"])
+        # contenu des paquets tiers filtré
+        if cfg.payload_filter:
+            from src.services import payload_filter
+            cmd.extend(payload_filter.nuitka_args(cfg.payload_rules)[0])
         # extra
         cmd.extend(cfg.extra_args)
-        # entry
-        cmd.append(cfg.entry_script)
+        # entry ; plusieurs scripts : multidist, le binaire choisit d'après son nom d'invocation
+        if cfg.extra_entries:
+            cmd.extend(f"--main={p}" for p in [cfg.entry_script, *cfg.extra_entries])
+        else:
+            cmd.append(cfg.entry_script)
+        from src.services import onefile_cache
+        if onefile_cache.supported(cfg):
+            # Extraction persistante dans le cache utilisateur, un dossier par empreinte des entrées
+            cmd.insert(spec_at, onefile_cache.tempdir_arg(onefile_cache.cache_key(cfg, cmd)))
         return cmd
 
+    def finalize_steps(self, cfg: BuildConfig) -> List[BuildStep]:
+        steps = []
+        if cfg.dual_output:
+            def check_dist(log):
+                if not Path(self.executable_path(cfg)).exists():
+                    raise RuntimeError(f"dossier {self.bundle_dir(cfg)} absent (option --remove-output ?)")
+                onefile_exe = Path(cfg.output_dir) / Path(self.executable_path(cfg)).name
+                log(f"[DUAL] Dossier: {self.bundle_dir(cfg)} ; exécutable onefile: {onefile_exe}")
+            steps.append(BuildStep("onefile", func=check_dist))
+        if cfg.extra_entries:
+            def link(log):
+                from src.services import multi_exe
+                names = [multi_exe.entry_name(p) for p in cfg.extra_entries]
+                binaries = [self.executable_path(cfg)]
+                if cfg.dual_output:
+                    binaries.append(str(Path(cfg.output_dir) / Path(binaries[0]).name))
+                for binary in binaries:
+                    for path in multi_exe.link_executables(binary, names):
+                        log(f"[MULTI] Exécutable: {path}")
+            steps.append(BuildStep("executables", func=link))
+        return steps + super().finalize_steps(cfg)
+
+    def bundle_dir(self, cfg: BuildConfig) -> str:
+        return str(Path(cfg.output_dir) / f"{Path(cfg.entry_script).stem}.dist")
+
+    def executable_path(self, cfg: BuildConfig) -> str:
+        exe_name = Path(cfg.entry_script).stem + (".exe" if os.name == 'nt' else ".bin")
+        if cfg.onefile:
+            return str(Path(cfg.output_dir) / exe_name)
+        return str(Path(self.bundle_dir(cfg)) / exe_name)
+
+    def prepare_steps(self, cfg: BuildConfig) -> List[BuildStep]:
+        steps = super().prepare_steps(cfg)
+        if cfg.optimize == 2 and cfg.optimize_keep_docstrings:
+            def notice(log):
+                log("[OPT] Nuitka ne règle pas les docstrings par paquet : "
+                    "docstrings conservées partout, seuls les assert sont retirés.")
+            steps.insert(0, BuildStep("optimize", func=notice))
+        if cfg.payload_filter:
+            from src.services import payload_filter
+            skipped = payload_filter.nuitka_args(cfg.payload_rules)[1]
+            if skipped:
+                def payload_notice(log):
+                    log("[PAYLOAD] Nuitka ne conserve pas un fichier pour un seul paquet : règles non appliquées "
+                        f"({', '.join(skipped)})")
+                steps.insert(0, BuildStep("payload-rules", func=payload_notice))
+        return steps
+
+    def build_steps(self, cfg: BuildConfig) -> List[BuildStep]:
+        if not cfg.pgo:
+            return super().build_steps(cfg)
+        # PGO en deux passes ; profil et mesure de référence réutilisés tant que les sources sont identiques
+        from src.services import pgo
+        build = self.build_command(cfg)
+        key = pgo.source_key(cfg.project_dir, cfg.pgo_args, build)
+        pgo_dir = Path(cfg.work_dir()) / "pgo"
+        profile, pending = pgo_dir / key, pgo_dir / f"{key}.tmp"
+        bench_json = str(pgo_dir / "bench.json")
+        exe = self.executable_path(cfg)
+
+        def bench(label, baseline="-"):
+            return BuildStep(f"pgo-bench-{label}", cmd=[
+                cfg.python_exe, str(RUNTIME_DIR / "scenario_bench.py"), bench_json, key, label, str(pgo.BENCH_RUNS),
+                baseline, exe, *cfg.pgo_args], workdir=cfg.project_dir, env=pgo.training_env())
+
+        def reset_pending(log):
+            import shutil
+            shutil.rmtree(pending, ignore_errors=True)
+            pending.mkdir(parents=True)
+            log(f"[PGO] Nouveau profil pour les sources {key}")
+
+        def store_profile(log):
+            if not pgo.has_profile(str(pending)):
+                raise RuntimeError("le scénario d'entraînement n'a produit aucune donnée de profil")
+            os.replace(pending, profile)
+            log(f"[PGO] Profil enregistré: {profile}")
+
+        steps = self.prepare_steps(cfg)
+        if not pgo.has_timing(bench_json, key, "standard"):
+            steps += [BuildStep("build-standard", cmd=build, workdir=cfg.project_dir), bench("standard")]
+        if pgo.has_profile(str(profile)):
+            steps.append(BuildStep("pgo", func=lambda log: log(f"[PGO] Profil réutilisé: {profile}")))
+        else:
+            steps += [
+                BuildStep("pgo-reset", func=reset_pending),
+                BuildStep("pgo-instrumented", cmd=build, workdir=cfg.project_dir, env=pgo.generate_env(str(pending))),
+                BuildStep("pgo-training", cmd=[exe, *cfg.pgo_args], workdir=cfg.project_dir, env=pgo.training_env()),
+                BuildStep("pgo-store", func=store_profile),
+            ]
+        return steps + [
+            BuildStep("build", cmd=build, workdir=cfg.project_dir, env=pgo.use_env(str(profile))),
+            bench("pgo", baseline="standard"),
+        ] + self.finalize_steps(cfg)
+
+    def hooks_plugin_path(self, cfg: BuildConfig) -> str:
+        return str(Path(cfg.work_dir()) / "hooks" / "pypack_nuitka_hooks.py")
+
+    def write_extra_files(self, cfg: BuildConfig, hook_paths: List[str]):
+        write_nuitka_hooks_plugin(hook_paths, self.hooks_plugin_path(cfg))
+
+
+class HybridBackend(PyInstallerBackend):
+    """PyInstaller, sauf pour les modules chauds du projet compilés en extensions par Nuitka."""
+
+    def name(self) -> str:
+        return "hybrid"
+
+    def hybrid_dir(self, cfg: BuildConfig) -> Path:
+        return Path(cfg.work_dir()) / "hybrid"
+
+    def compile_steps(self, cfg: BuildConfig) -> List[BuildStep]:
+        hot = self.hybrid_dir(cfg) / "hot_modules.json"
+        manifest = self.hybrid_dir(cfg) / "compiled.json"
+        if cfg.hybrid_modules:
+            def resolve(log):
+                from src.services import hybrid
+                hybrid.write_modules(cfg.hybrid_modules, cfg.project_dir, str(hot))
+                log(f"[HYBRID] Modules imposés: {', '.join(cfg.hybrid_modules)}")
+            select = BuildStep("hot-modules", func=resolve)
+        else:
+            from src.services.hybrid import PROFILE_TIMEOUT
+            select = BuildStep("hot-modules", cmd=[
+                cfg.python_exe, str(RUNTIME_DIR / "hot_modules_profile.py"), cfg.hybrid_workload or cfg.entry_script,
+                cfg.project_dir, cfg.entry_script, str(hot), str(cfg.hybrid_max_modules), str(PROFILE_TIMEOUT)],
+                workdir=cfg.project_dir)
+        compile_hot = BuildStep("nuitka-modules", cmd=[
+            cfg.python_exe, str(RUNTIME_DIR / "hybrid_compile.py"), str(hot),
+            str(self.hybrid_dir(cfg) / "cache"), str(manifest)], workdir=cfg.project_dir)
+        return [select, compile_hot] + super().compile_steps(cfg)
+
+    def spec_patches(self, cfg: BuildConfig) -> List[str]:
+        from src.services import hybrid
+        return super().spec_patches(cfg) + [hybrid.spec_block(str(self.hybrid_dir(cfg) / "compiled.json"))]
+
+    def can_reuse_analysis(self, cfg: BuildConfig) -> bool:
+        return super().can_reuse_analysis(cfg) and (self.hybrid_dir(cfg) / "compiled.json").is_file()
+
+    def assembly_steps(self, cfg: BuildConfig) -> List[BuildStep]:
+        # Modules chauds et extensions du build précédent toujours valables
+        return [s for s in super().assembly_steps(cfg) if s.label not in ("hot-modules", "nuitka-modules")]
+
 
 BACKENDS: Dict[str, PackagerBackend] = {
     "pyinstaller": PyInstallerBackend(),
     "nuitka": NuitkaBackend(),
+    "hybrid": HybridBackend(),
 }
\ No newline at end of file
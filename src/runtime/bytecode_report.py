@@ -0,0 +1,110 @@
+"""
+Rapport d'optimisation du bytecode, exécuté par PyPack Studio dans l'interpréteur cible.
+
+Compile les modules Python collectés au niveau 0 et à leur niveau effectif
+(réparti sur un pool de processus), compare la taille du bytecode et le temps
+de dé-sérialisation (marshal.loads), puis la taille de l'application construite
+par rapport au dernier build de niveau 0.
+
+Usage : bytecode_report.py LEVEL BUNDLE HISTORY.json [MODULES.json]
+MODULES.json : liste [nom, chemin source, niveau effectif].
+"""
+
+import json
+import marshal
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+UNMARSHAL_RUNS = 3
+
+
+def _measure(entries):
+    """(taille niveau 0, taille optimisée, temps niveau 0, temps optimisé, modules) pour un lot."""
+    size0 = size_opt = t0 = t_opt = 0.0
+    count = 0
+    for _name, path, level in entries:
+        try:
+            with open(path, "rb") as f:
+                source = f.read()
+            codes = [compile(source, path, "exec", dont_inherit=True, optimize=lvl) for lvl in (0, level)]
+        except (OSError, SyntaxError, ValueError):
+            continue
+        measures = []
+        for code in codes:
+            data = marshal.dumps(code)
+            best = float("inf")
+            for _ in range(UNMARSHAL_RUNS):
+                start = time.perf_counter()
+                marshal.loads(data)
+                best = min(best, time.perf_counter() - start)
+            measures.append((len(data), best))
+        size0 += measures[0][0]
+        size_opt += measures[1][0]
+        t0 += measures[0][1]
+        t_opt += measures[1][1]
+        count += 1
+    return size0, size_opt, t0, t_opt, count
+
+
+def _percent(before, after):
+    return (after - before) / before * 100 if before else 0.0
+
+
+def report_bytecode(modules_json):
+    with open(modules_json, encoding="utf-8") as f:
+        entries = [e for e in json.load(f) if e[1] and e[1].endswith(".py")]
+    workers = os.cpu_count() or 1
+    chunks = [entries[i::workers * 4] for i in range(workers * 4)]
+    totals = [0.0] * 5
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for result in pool.map(_measure, [c for c in chunks if c]):
+            totals = [a + b for a, b in zip(totals, result)]
+    size0, size_opt, t0, t_opt, count = totals
+    print(f"[OPT] {int(count)} modules : bytecode {size0 / 1024:.0f} Ko -> {size_opt / 1024:.0f} Ko "
+          f"({_percent(size0, size_opt):+.1f}%), dé-sérialisation {t0 * 1000:.1f} ms -> {t_opt * 1000:.1f} ms "
+          f"({_percent(t0, t_opt):+.1f}%)")
+
+
+def bundle_size(path):
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    total = 0
+    for dirpath, _dirs, files in os.walk(path):
+        for fn in files:
+            total += os.path.getsize(os.path.join(dirpath, fn))
+    return total
+
+
+def report_bundle(level, bundle, history_json):
+    try:
+        with open(history_json, encoding="utf-8") as f:
+            history = json.load(f)
+    except (OSError, ValueError):
+        history = {}
+    size = bundle_size(bundle)
+    history[str(level)] = size
+    os.makedirs(os.path.dirname(history_json), exist_ok=True)
+    with open(history_json, "w", encoding="utf-8") as f:
+        json.dump(history, f)
+    if not level:
+        print(f"[OPT] Taille de référence (niveau 0) : {size / 1e6:.2f} Mo")
+    elif "0" in history:
+        print(f"[OPT] Application : {history['0'] / 1e6:.2f} Mo (niveau 0) -> {size / 1e6:.2f} Mo (niveau {level}, "
+              f"{_percent(history['0'], size):+.1f}%)")
+    else:
+        print(f"[OPT] Application : {size / 1e6:.2f} Mo au niveau {level} "
+              "(construisez une fois au niveau 0 pour comparer)")
+
+
+def main(argv):
+    level, bundle, history_json = int(argv[1]), argv[2], argv[3]
+    if len(argv) > 4:
+        report_bytecode(argv[4])
+    report_bundle(level, bundle, history_json)
+    sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main(sys.argv)
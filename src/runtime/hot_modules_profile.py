@@ -0,0 +1,97 @@
+"""
+Profilage des modules « chauds », exécuté par PyPack Studio dans l'interpréteur cible.
+
+Lance le scénario fourni (script) sous cProfile, cumule le temps propre
+(tottime) par fichier source du projet et retient les modules les plus
+coûteux, à compiler par Nuitka en mode hybride.
+
+Usage : hot_modules_profile.py SCENARIO PROJET ENTREE SORTIE.json MAX DELAI
+SORTIE.json : liste [module, chemin, secondes], du plus coûteux au moins coûteux.
+Un scénario qui ne se termine pas en DELAI secondes (boucle d'événements d'une
+application graphique, même hors écran) fait échouer l'étape (code 3).
+"""
+
+import cProfile
+import json
+import os
+import pstats
+import runpy
+import sys
+import threading
+
+MIN_SHARE = 0.01  # part minimale du temps total pour retenir un module
+SKIP_DIRS = {"build", "dist", "venv", ".venv", "site-packages", "__pycache__"}
+
+
+def module_name(path, project_dir):
+    """Nom pointé du module (paquets détectés par leur __init__.py), ou "" hors projet."""
+    rel = os.path.relpath(path, project_dir)
+    parts = rel.split(os.sep)
+    if rel.startswith("..") or SKIP_DIRS.intersection(parts[:-1]):
+        return ""
+    stem = os.path.splitext(parts[-1])[0]
+    if stem == "__init__" or not stem.isidentifier():
+        return ""
+    names = [stem]
+    directory = os.path.dirname(path)
+    while os.path.isfile(os.path.join(directory, "__init__.py")):
+        names.insert(0, os.path.basename(directory))
+        directory = os.path.dirname(directory)
+    return ".".join(names)
+
+
+def main(argv):
+    scenario, project_dir, entry, out_json, max_modules, timeout = argv[1:7]
+    project_dir = os.path.abspath(project_dir)
+    os.makedirs(os.path.dirname(os.path.abspath(out_json)), exist_ok=True)
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")  # scénario sans fenêtre
+    sys.path.insert(0, project_dir)
+    sys.argv = [scenario]
+
+    def expire():
+        sys.stderr.write(
+            f"[HYBRID] Le scénario {scenario} ne s'est pas terminé en {float(timeout):.0f} s "
+            "(une application graphique ne rend pas la main) : indiquez un scénario qui se termine "
+            "ou les modules à compiler.\n")
+        sys.stderr.flush()
+        os._exit(3)
+
+    timer = threading.Timer(float(timeout), expire)
+    timer.daemon = True
+    timer.start()
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        runpy.run_path(scenario, run_name="__main__")
+    except SystemExit:
+        pass
+    finally:
+        profiler.disable()
+        timer.cancel()
+
+    excluded = {os.path.abspath(entry), os.path.abspath(scenario)}
+    per_file = {}
+    total = 0.0
+    for (filename, _line, _func), (_cc, _nc, tottime, _ct, _callers) in pstats.Stats(profiler).stats.items():
+        total += tottime
+        if filename.endswith(".py") and os.path.abspath(filename) not in excluded:
+            per_file[os.path.abspath(filename)] = per_file.get(os.path.abspath(filename), 0.0) + tottime
+
+    hot = []
+    for path, seconds in sorted(per_file.items(), key=lambda x: -x[1]):
+        name = module_name(path, project_dir)
+        if name and seconds >= total * MIN_SHARE:
+            hot.append([name, path, seconds])
+    hot = hot[:int(max_modules)]
+    with open(out_json, "w", encoding="utf-8") as f:
+        json.dump(hot, f)
+    print(f"[HYBRID] Scénario profilé : {total:.2f} s de temps propre")
+    for name, _path, seconds in hot:
+        print(f"[HYBRID] Module chaud : {name} ({seconds:.3f} s, {seconds / total * 100 if total else 0:.0f}%)")
+    if not hot:
+        print("[HYBRID] Aucun module du projet ne dépasse le seuil : build PyInstaller seul.")
+    sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main(sys.argv)
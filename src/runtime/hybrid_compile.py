@@ -0,0 +1,92 @@
+"""
+Compilation des modules chauds par Nuitka, exécutée par PyPack Studio dans l'interpréteur cible.
+
+Chaque module est compilé en extension (`nuitka --module`), en parallèle.
+Les extensions sont mises en cache par empreinte (source, nom du module,
+versions de Python et de Nuitka) et réutilisées tant que le code ne change pas.
+
+Usage : hybrid_compile.py MODULES.json CACHE MANIFESTE.json
+MODULES.json : liste [module, chemin source, ...] ; MANIFESTE.json : liste [module, extension].
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+
+def nuitka_version():
+    try:
+        from nuitka.Version import getNuitkaVersion
+    except ImportError:
+        return ""
+    return getNuitkaVersion()
+
+
+def source_key(name, path, version):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        h.update(f.read())
+    h.update(f"\0{name}\0{sys.version}\0{version}".encode("utf-8"))
+    return h.hexdigest()[:32]
+
+
+def compile_module(name, path, cache_dir, jobs):
+    """Retourne (module, extension, réutilisée) ; lève RuntimeError si Nuitka échoue."""
+    target = os.path.join(cache_dir, source_key(name, path, NUITKA_VERSION))
+    if os.path.isdir(target):
+        built = [f for f in os.listdir(target) if f.endswith((".so", ".pyd"))]
+        if built:
+            return name, os.path.join(target, built[0]), True
+    tmp = tempfile.mkdtemp(prefix="pypack-nuitka-", dir=cache_dir)
+    cmd = [sys.executable, "-m", "nuitka", "--module", path, f"--output-dir={tmp}", "--remove-output",
+           "--no-pyi-file", "--assume-yes-for-downloads", f"--jobs={jobs}"]
+    proc = subprocess.run(cmd, capture_output=True, text=True)
+    built = [f for f in os.listdir(tmp) if f.endswith((".so", ".pyd"))]
+    if proc.returncode != 0 or not built:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise RuntimeError(f"{name}: échec de Nuitka ({proc.returncode})\n{proc.stdout[-1500:]}{proc.stderr[-1500:]}")
+    shutil.rmtree(target, ignore_errors=True)
+    os.replace(tmp, target)
+    return name, os.path.join(target, built[0]), False
+
+
+def main(argv):
+    modules_json, cache_dir, manifest_json = argv[1:4]
+    with open(modules_json, encoding="utf-8") as f:
+        modules = [(m[0], m[1]) for m in json.load(f)]
+    os.makedirs(cache_dir, exist_ok=True)
+    manifest = []
+    if modules:
+        if not NUITKA_VERSION:
+            print("[HYBRID] Nuitka n'est pas installé dans l'interpréteur cible.", file=sys.stderr)
+            return 1
+        workers = min(len(modules), os.cpu_count() or 1)
+        jobs = max(1, (os.cpu_count() or 1) // workers)  # pas de sur-souscription des cœurs
+        print(f"[HYBRID] Compilation de {len(modules)} module(s) avec Nuitka {NUITKA_VERSION} "
+              f"({workers} en parallèle)")
+        sys.stdout.flush()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(compile_module, name, path, cache_dir, jobs) for name, path in modules]
+            for future in futures:
+                try:
+                    name, ext, reused = future.result()
+                except RuntimeError as e:
+                    print(f"[HYBRID] {e}", file=sys.stderr)
+                    return 1
+                manifest.append([name, ext])
+                print(f"[HYBRID] {name} -> {os.path.basename(ext)}" + (" (cache)" if reused else ""))
+                sys.stdout.flush()
+    with open(manifest_json, "w", encoding="utf-8") as f:
+        json.dump(manifest, f)
+    return 0
+
+
+NUITKA_VERSION = nuitka_version()
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+"""
+Sonde d'interpréteur, exécutée par PyPack Studio dans chaque Python découvert.
+
+Affiche sur la sortie standard un objet JSON : version, architecture,
+implémentation, dossiers site-packages (dont celui de l'utilisateur, où
+`pip install --user` installe les outils) et versions des outils de packaging
+installés (lues dans les métadonnées, sans importer les paquets).
+"""
+
+import json
+import platform
+import site
+import struct
+import sys
+import sysconfig
+
+TOOLS = {"pyinstaller": "PyInstaller", "nuitka": "Nuitka"}
+
+
+def tool_versions():
+    try:
+        from importlib import metadata
+    except ImportError:  # Python < 3.8
+        return {}
+    found = {}
+    for key, dist in TOOLS.items():
+        try:
+            found[key] = metadata.version(dist)
+        except Exception:
+            found[key] = ""
+    return found
+
+
+def main():
+    info = {
+        "version": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "bits": struct.calcsize("P") * 8,
+        "machine": platform.machine(),
+        "prefix": sys.prefix,
+        "purelib": sysconfig.get_paths().get("purelib", ""),
+        "platlib": sysconfig.get_paths().get("platlib", ""),
+        # désactivé dans un venv isolé : le site-packages utilisateur n'y est pas sur sys.path
+        "usersite": site.getusersitepackages() if site.ENABLE_USER_SITE else "",
+    }
+    info.update(tool_versions())
+    sys.stdout.write(json.dumps(info))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+# Hook d'exécution généré par PyPack Studio : imports différés.
+#
+# Les modules listés dans LAZY_MODULES sont chargés via importlib.util.LazyLoader :
+# `import module` est quasi gratuit, le vrai chargement n'a lieu qu'au premier
+# accès à un attribut du module.
+#
+# PyInstaller exécute les hooks dans l'espace de noms __main__ de l'application :
+# tout est défini dans une fonction appelée une fois puis supprimée, et pas de
+# docstring (elle remplacerait le __doc__ de l'application).
+
+
+def _pypack_lazy_imports():
+    import importlib.abc
+    import importlib.util
+    import sys
+
+    LAZY_MODULES = frozenset()  # remplacé par PyPack Studio
+
+    class _PyPackLazyFinder(importlib.abc.MetaPathFinder):
+        def find_spec(self, fullname, path, target=None):
+            if fullname not in LAZY_MODULES:
+                return None
+            for finder in sys.meta_path:
+                if getattr(finder, "_pypack_lazy", False) or not hasattr(finder, "find_spec"):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    break
+            else:
+                return None
+            if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+                spec.loader = importlib.util.LazyLoader(spec.loader)
+            return spec
+
+    _PyPackLazyFinder._pypack_lazy = True
+    if LAZY_MODULES and not any(getattr(f, "_pypack_lazy", False) for f in sys.meta_path):
+        sys.meta_path.insert(0, _PyPackLazyFinder())
+
+
+_pypack_lazy_imports()
+del _pypack_lazy_imports
@@ -0,0 +1,80 @@
+# Hook d'exécution généré par PyPack Studio : index des modules embarqués.
+#
+# Le build écrit pypack_modules.idx (dict marshal nom -> (chemin relatif, paquet))
+# à la racine de l'application. Ce finder, placé en tête de sys.meta_path, résout
+# les modules indexés en une recherche de dictionnaire, sans parcourir sys.path.
+#
+# Variables d'environnement :
+# - PYPACK_MODULE_INDEX=0 : désactive le finder ;
+# - PYPACK_IMPORT_BENCH=<fichier> : importe tous les modules indexés, écrit la
+#   durée (JSON) dans <fichier> puis quitte (mode benchmark).
+#
+# PyInstaller exécute les hooks dans l'espace de noms __main__ de l'application :
+# tout est défini dans une fonction appelée une fois puis supprimée, et pas de
+# docstring (elle remplacerait le __doc__ de l'application).
+
+
+def _pypack_module_index():
+    import importlib.machinery
+    import importlib.util
+    import json
+    import marshal
+    import os
+    import sys
+    import time
+
+    INDEX_NAME = "pypack_modules.idx"
+    BASE_DIR = getattr(sys, "_MEIPASS", None) or os.path.dirname(os.path.abspath(sys.executable))
+
+    def _load_index():
+        try:
+            with open(os.path.join(BASE_DIR, INDEX_NAME), "rb") as f:
+                return marshal.load(f)
+        except (OSError, ValueError, EOFError):
+            return {}
+
+    class _PyPackIndexFinder:
+        def __init__(self, index):
+            self.index = index
+
+        def find_spec(self, fullname, path=None, target=None):
+            entry = self.index.get(fullname)
+            if entry is None:
+                return None
+            rel, is_pkg = entry
+            location = os.path.join(BASE_DIR, rel)
+            if location.endswith(".py"):
+                loader = importlib.machinery.SourceFileLoader(fullname, location)
+            elif location.endswith(".pyc"):
+                loader = importlib.machinery.SourcelessFileLoader(fullname, location)
+            else:
+                loader = importlib.machinery.ExtensionFileLoader(fullname, location)
+            search = [os.path.dirname(location)] if is_pkg else None
+            return importlib.util.spec_from_file_location(fullname, location, loader=loader,
+                                                          submodule_search_locations=search)
+
+        def invalidate_caches(self):
+            pass
+
+    def _benchmark(index, out_path):
+        errors = 0
+        t0 = time.perf_counter()
+        for name in sorted(index, key=lambda n: n.count(".")):
+            try:
+                importlib.import_module(name)
+            except Exception:
+                errors += 1
+        elapsed = time.perf_counter() - t0
+        with open(out_path, "w", encoding="utf-8") as f:
+            json.dump({"modules": len(index), "errors": errors, "seconds": elapsed}, f)
+        os._exit(0)
+
+    index = _load_index()
+    if index and os.environ.get("PYPACK_MODULE_INDEX", "1") != "0":
+        sys.meta_path.insert(0, _PyPackIndexFinder(index))
+    if os.environ.get("PYPACK_IMPORT_BENCH"):
+        _benchmark(index, os.environ["PYPACK_IMPORT_BENCH"])
+
+
+_pypack_module_index()
+del _pypack_module_index
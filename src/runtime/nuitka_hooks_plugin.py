@@ -0,0 +1,52 @@
+"""
+Plugin Nuitka généré par PyPack Studio : équivalent de --runtime-hook.
+
+Nuitka n'a pas de hooks d'exécution ; ce plugin insère le code des hooks
+au début du module __main__ (après la docstring et les imports __future__),
+chaque hook s'exécutant dans son propre espace de noms.
+"""
+
+import ast
+
+from nuitka.plugins.PluginBase import NuitkaPluginBase
+
+HOOK_FILES = []  # remplacé par PyPack Studio
+
+
+class PyPackRuntimeHooks(NuitkaPluginBase):
+    plugin_name = "pypack-runtime-hooks"
+    plugin_desc = "Exécute les hooks PyPack Studio avant le script principal."
+
+    def getImplicitImports(self, module):
+        # Le code des hooks est exécuté depuis une chaîne : Nuitka ne voit pas ses imports
+        if str(module.getFullName()) != "__main__":
+            return
+        for path in HOOK_FILES:
+            with open(path, encoding="utf-8") as f:
+                tree = ast.parse(f.read())
+            for node in ast.walk(tree):
+                if isinstance(node, ast.Import):
+                    yield from (alias.name for alias in node.names)
+                elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+                    yield node.module
+
+    def onModuleSourceCode(self, module_name, *args, **kwargs):
+        # (module_name, source_code) avant Nuitka 2, puis source_filename ajouté et passé par mot-clé
+        source_code = kwargs["source_code"] if "source_code" in kwargs else args[-1]
+        if str(module_name) != "__main__" or not HOOK_FILES:
+            return source_code
+        lines = source_code.splitlines(True)
+        insert_at = 0
+        for i, node in enumerate(ast.parse(source_code).body):
+            is_docstring = i == 0 and isinstance(node, ast.Expr) and isinstance(node.value, ast.Constant) \
+                and isinstance(node.value.value, str)
+            is_future = isinstance(node, ast.ImportFrom) and node.module == "__future__"
+            if not (is_docstring or is_future):
+                break
+            insert_at = node.end_lineno
+        hooks = []
+        for path in HOOK_FILES:
+            with open(path, encoding="utf-8") as f:
+                hooks.append(f"exec(compile({f.read()!r}, {path!r}, 'exec'), {{'__name__': 'pypack_rth'}})")
+        lines.insert(insert_at, "; ".join(hooks) + "\n")
+        return "".join(lines)
@@ -0,0 +1,36 @@
+# Hook d'exécution généré par PyPack Studio : onefile en cache (Nuitka).
+#
+# L'application tourne depuis <cache>/<entreprise>/<produit>/<empreinte>. Au
+# démarrage, la version courante est marquée comme utilisée et les dossiers des
+# autres versions sont supprimés, sauf les KEEP_VERSIONS - 1 plus récents. Un
+# dossier encore ouvert (Windows) résiste : il sera retenté au lancement suivant.
+# Rien n'est fait hors de ce dossier de cache (sortie dossier du mode double).
+
+
+def _pypack_onefile_cache_gc():
+    import os
+    import re
+    import shutil
+    import sys
+
+    KEY = ""  # remplacé par PyPack Studio
+    KEY_LENGTH = 0  # remplacé par PyPack Studio
+    KEEP_VERSIONS = 2  # versions conservées, courante comprise
+
+    current = os.path.dirname(os.path.abspath(sys.executable))
+    if os.path.basename(current) != KEY:
+        return
+    key_re = re.compile(f"[0-9a-f]{{{KEY_LENGTH}}}")
+    root = os.path.dirname(current)
+    try:
+        os.utime(current)
+        entries = [e for e in os.scandir(root) if e.is_dir() and e.name != KEY and key_re.fullmatch(e.name)]
+        entries.sort(key=lambda e: e.stat().st_mtime, reverse=True)
+    except OSError:
+        return
+    for entry in entries[KEEP_VERSIONS - 1:]:
+        shutil.rmtree(entry.path, ignore_errors=True)
+
+
+_pypack_onefile_cache_gc()
+del _pypack_onefile_cache_gc
@@ -0,0 +1,79 @@
+"""
+Trace des fichiers ouverts, exécutée par PyPack Studio dans l'interpréteur cible.
+
+Lance le script d'entrée avec un hook d'audit qui relève les ouvertures de
+fichiers et les listages de dossiers ; la liste est écrite à la sortie du
+script ou, pour une application qui ne se termine pas, au bout du délai.
+
+Usage : open_trace.py SORTIE.json DÉLAI ENTREE [ARGS...]
+SORTIE.json : {"opened": [chemins réels], "listed": [dossiers réels]}
+"""
+
+import atexit
+import json
+import os
+import runpy
+import sys
+import threading
+
+opened, listed = set(), set()
+_dumped = []
+
+
+def _path(value):
+    if isinstance(value, bytes):
+        value = os.fsdecode(value)
+    if isinstance(value, (str, os.PathLike)):
+        try:
+            return os.path.realpath(value)
+        except (OSError, ValueError):
+            return None
+    return None  # descripteur de fichier
+
+
+def audit(event, args):
+    if _dumped:
+        return
+    if event == "open" and args:
+        path = _path(args[0])
+        if path:
+            opened.add(path)
+    elif event in ("os.listdir", "os.scandir") and args:
+        path = _path(args[0] if args[0] is not None else ".")
+        if path:
+            listed.add(path)
+
+
+def dump(out_json):
+    if _dumped:
+        return
+    _dumped.append(True)  # un hook d'audit ne se retire pas : il cesse simplement de relever
+    data = {"opened": sorted(opened), "listed": sorted(listed)}
+    with open(out_json, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+
+
+def main(argv):
+    out_json, timeout, entry = os.path.abspath(argv[1]), float(argv[2]), os.path.abspath(argv[3])
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")  # exécution sans fenêtre
+    sys.argv = [entry] + argv[4:]
+    sys.path.insert(0, os.path.dirname(entry))
+    atexit.register(dump, out_json)
+
+    def expire():
+        dump(out_json)
+        os._exit(0)
+
+    timer = threading.Timer(timeout, expire)
+    timer.daemon = True
+    timer.start()
+    sys.addaudithook(audit)
+    try:
+        runpy.run_path(entry, run_name="__main__")
+    except SystemExit:
+        pass
+    dump(out_json)
+
+
+if __name__ == "__main__":
+    main(sys.argv)
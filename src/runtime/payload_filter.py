@@ -0,0 +1,150 @@
+"""
+Filtre du contenu des paquets tiers collectés, exécuté dans l'interpréteur
+cible : importé par le .spec PyInstaller généré, ou lancé par PyPack Studio
+pour la simulation.
+
+Règles à la manière de .gitignore, par paquet : un motif retire les fichiers
+correspondants, `!motif` les conserve ; la dernière règle correspondante
+l'emporte. Un motif sans « / » porte sur le nom d'un fichier ou d'un dossier
+à toute profondeur ; avec « / », sur le chemin de destination (son contenu
+compris). Seuls les fichiers provenant de site-packages sont concernés.
+
+Usage (simulation) : payload_filter.py REGLES.json SORTIE.json
+REGLES.json : {"*": [règles], "paquet": [règles], ...}
+SORTIE.json : {paquet: [fichiers retirés, octets retirés, fichiers, octets]}
+"""
+
+import fnmatch
+import json
+import os
+import re
+import site
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+SITE_DIRS = {"site-packages", "dist-packages"}
+METADATA_SUFFIXES = (".dist-info", ".egg-info")
+
+
+def package_key(name):
+    """Clé d'un paquet : nom normalisé (casse, tirets), dist-info ramené à la distribution."""
+    if name.endswith(METADATA_SUFFIXES):
+        name = name.rsplit(".", 1)[0].split("-", 1)[0]
+    elif name.endswith(".py"):
+        name = name[:-3]
+    return re.sub(r"[-.]+", "_", name).lower()
+
+
+def from_site_packages(path):
+    return bool(SITE_DIRS.intersection(str(path).replace("\\", "/").split("/")))
+
+
+class PayloadRules:
+    def __init__(self, rules):
+        self._rules = {package_key(k) if k != "*" else "*": list(v) for k, v in rules.items()}
+        self._compiled = {}
+
+    def _for(self, package):
+        if package not in self._compiled:
+            compiled = []
+            for rule in self._rules.get("*", []) + self._rules.get(package, []):
+                rule = rule.strip()
+                if not rule or rule.startswith("#"):
+                    continue
+                keep = rule.startswith("!")
+                pattern = rule[1:] if keep else rule
+                compiled.append((keep, "/" in pattern, re.compile(fnmatch.translate(pattern.strip("/")))))
+            self._compiled[package] = compiled
+        return self._compiled[package]
+
+    def dropped(self, dest):
+        """Vrai si le fichier de destination `dest` (chemin posix) est retiré."""
+        parts = dest.replace("\\", "/").strip("/").split("/")
+        result = False
+        for keep, by_path, regex in self._for(package_key(parts[0])):
+            if by_path:
+                hit = any(regex.match("/".join(parts[:i + 1])) for i in range(len(parts)))
+            else:
+                hit = any(regex.match(part) for part in parts)
+            if hit:
+                result = not keep
+        return result
+
+
+def _size(path):
+    try:
+        return os.path.getsize(path)
+    except (OSError, TypeError):
+        return 0
+
+
+def _dest(entry, kind):
+    name, src = entry[0], entry[1]
+    if kind == "pure":
+        base = name.replace(".", "/")
+        return base + "/__init__.py" if os.path.basename(str(src)).startswith("__init__.") else base + ".py"
+    return name
+
+
+def filter_toc(toc, rules, kind, report):
+    """Entrées (nom, source, type) d'une TOC PyInstaller conservées ; `report` cumule
+    {paquet: [fichiers, octets]} retirés."""
+    kept = []
+    for entry in toc:
+        src = entry[1]
+        dest = _dest(entry, kind)
+        if isinstance(src, str) and from_site_packages(src) and rules.dropped(dest):
+            stats = report.setdefault(package_key(dest.replace("\\", "/").split("/")[0]), [0, 0])
+            stats[0] += 1
+            stats[1] += _size(src)
+            continue
+        kept.append(entry)
+    return kept
+
+
+def write_report(report, path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+
+
+def _scan_package(root, top, rules):
+    stats = [0, 0, 0, 0]
+    full = os.path.join(root, top)
+    paths = [(top, full)] if os.path.isfile(full) else []
+    for dirpath, dirnames, filenames in os.walk(full):
+        dirnames[:] = [d for d in dirnames if d != "__pycache__"]  # jamais collectés
+        rel_dir = os.path.relpath(dirpath, root).replace(os.sep, "/")
+        paths.extend((f"{rel_dir}/{fn}", os.path.join(dirpath, fn)) for fn in filenames)
+    for dest, path in paths:
+        size = _size(path)
+        stats[2] += 1
+        stats[3] += size
+        if rules.dropped(dest):
+            stats[0] += 1
+            stats[1] += size
+    return package_key(top), stats
+
+
+def simulate(rules):
+    """Simulation sur tous les paquets installés : {paquet: [retirés, octets retirés, fichiers, octets]}."""
+    roots = [p for p in site.getsitepackages() + [site.getusersitepackages()] if os.path.isdir(p)]
+    jobs = [(root, top) for root in roots for top in sorted(os.listdir(root))
+            if top != "__pycache__" and not top.endswith(".pth")]
+    report = {}
+    with ThreadPoolExecutor(max_workers=min(16, (os.cpu_count() or 1) * 2)) as pool:
+        for key, stats in pool.map(lambda job: _scan_package(*job, rules), jobs):
+            total = report.setdefault(key, [0, 0, 0, 0])
+            for i, value in enumerate(stats):
+                total[i] += value
+    return report
+
+
+def main(argv):
+    with open(argv[1], encoding="utf-8") as f:
+        rules = PayloadRules(json.load(f))
+    write_report(simulate(rules), argv[2])
+
+
+if __name__ == "__main__":
+    main(sys.argv)
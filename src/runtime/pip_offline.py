@@ -0,0 +1,24 @@
+"""
+Installation pip depuis la wheelhouse locale de PyPack Studio, exécutée dans
+le venv à remplir : d'abord hors ligne (--no-index --find-links), puis, si la
+wheelhouse ne suffit pas, depuis l'index en la gardant comme source prioritaire.
+
+Usage : pip_offline.py WHEELHOUSE [arguments de pip install...]
+"""
+
+import subprocess
+import sys
+
+
+def main(argv):
+    wheelhouse, args = argv[1], argv[2:]
+    cmd = [sys.executable, "-m", "pip", "install", "--disable-pip-version-check", "--find-links", wheelhouse]
+    code = subprocess.call(cmd + ["--no-index"] + args)
+    if code != 0:
+        print("[WHEELHOUSE] Wheelhouse incomplète, installation depuis l'index", flush=True)
+        code = subprocess.call(cmd + args)
+    return code
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,82 @@
+"""
+Vérifications préalables au build, exécutées par PyPack Studio dans
+l'interpréteur cible : compilation (sans écriture de .pyc) de tous les
+sources du projet sur un pool de processus, et, pendant ce temps, import des
+modules de l'outil de packaging et recherche des imports cachés.
+
+Usage : preflight.py REQUEST.json
+REQUEST.json : {"sources": [chemins], "imports": [modules], "find": [modules],
+                "paths": [dossiers du projet, ajoutés à sys.path pour "find"]}
+Sortie (JSON) : {"syntax": [[chemin, ligne, message]], "imports": {module: erreur},
+                 "find": [modules introuvables], "compiled": nombre}
+"""
+
+import importlib
+import importlib.util
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+BATCH = 32
+POOL_MIN_SOURCES = 64  # en dessous, le démarrage du pool coûte plus qu'il ne rapporte
+
+
+def compile_batch(paths):
+    errors = []
+    for path in paths:
+        try:
+            with open(path, "rb") as f:
+                compile(f.read(), path, "exec", dont_inherit=True)
+        except SyntaxError as e:
+            errors.append([path, e.lineno or 0, e.msg or str(e)])
+        except (OSError, ValueError) as e:
+            errors.append([path, 0, str(e)])
+    return errors
+
+
+def check_imports(modules):
+    failures = {}
+    for name in modules:
+        try:
+            importlib.import_module(name)
+        except Exception as e:  # l'outil peut échouer autrement qu'à l'import (dépendance cassée)
+            failures[name] = f"{type(e).__name__}: {e}"
+    return failures
+
+
+def find_missing(modules, paths=()):
+    # sys.path[0] est le dossier de ce script : les imports cachés du projet se
+    # cherchent depuis le dossier du script d'entrée et celui du projet
+    sys.path[0:0] = [p for p in paths if p not in sys.path]
+    missing = []
+    for name in modules:
+        try:
+            if importlib.util.find_spec(name) is None:
+                missing.append(name)
+        except (ImportError, ValueError):
+            missing.append(name)
+    return missing
+
+
+def main(argv):
+    with open(argv[1], encoding="utf-8") as f:
+        request = json.load(f)
+    sources = request.get("sources", [])
+    batches = [sources[i:i + BATCH] for i in range(0, len(sources), BATCH)]
+    if len(sources) >= POOL_MIN_SOURCES and (os.cpu_count() or 1) > 1:
+        with ProcessPoolExecutor(max_workers=min(len(batches), os.cpu_count())) as pool:
+            pending = pool.map(compile_batch, batches)
+            # les imports tournent dans ce processus pendant que le pool compile
+            imports = check_imports(request.get("imports", []))
+            missing = find_missing(request.get("find", []), request.get("paths", []))
+            syntax = [error for errors in pending for error in errors]
+    else:
+        imports = check_imports(request.get("imports", []))
+        missing = find_missing(request.get("find", []), request.get("paths", []))
+        syntax = [error for batch in batches for error in compile_batch(batch)]
+    sys.stdout.write(json.dumps({"syntax": syntax, "imports": imports, "find": missing, "compiled": len(sources)}))
+
+
+if __name__ == "__main__":
+    main(sys.argv)
@@ -0,0 +1,140 @@
+# Hook d'exécution généré par PyPack Studio : archive de ressources.
+#
+# Les fichiers/dossiers inclus sont regroupés dans pypack_resources.pak, projeté
+# en mémoire (mmap) au premier accès. Le hook enregistre le module
+# `pypack_resources` :
+#
+#     import pypack_resources
+#     data = pypack_resources.read("assets/logo.png")   # memoryview, sans copie
+#     with pypack_resources.open("config/app.json") as f: ...
+#     chemin = pypack_resources.path("assets")           # vrai chemin (compatibilité)
+#
+# `path()` matérialise la ressource (ou tout un dossier) une seule fois dans le
+# cache utilisateur, pour le code qui exige un chemin sur disque. Sans archive
+# (ressources livrées telles quelles), les mêmes fonctions lisent les fichiers
+# à côté de l'exécutable.
+#
+# PyInstaller exécute les hooks dans l'espace de noms __main__ de l'application :
+# tout est défini dans une fonction appelée une fois puis supprimée, et pas de
+# docstring (elle remplacerait le __doc__ de l'application). L'API publique
+# n'existe que sur le module pypack_resources.
+
+
+def _pypack_resources():
+    import io
+    import json
+    import mmap
+    import os
+    import struct
+    import sys
+    import types
+
+    PAK_NAME = "pypack_resources.pak"
+    PAK_MAGIC = b"PYPAKRS1"
+    PAK_HEADER = struct.Struct("<8sQQ")
+    BASE_DIR = getattr(sys, "_MEIPASS", None) or os.path.dirname(os.path.abspath(sys.executable))
+
+    _state = {}
+
+    def _archive():
+        """(mmap, index) de l'archive, ou (None, None) si elle est absente."""
+        if "pak" not in _state:
+            _state["pak"] = (None, None)
+            try:
+                with open(os.path.join(BASE_DIR, PAK_NAME), "rb") as f:
+                    mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError):
+                return _state["pak"]
+            magic, index_offset, index_size = PAK_HEADER.unpack_from(mm, 0)
+            if magic == PAK_MAGIC:
+                index = json.loads(bytes(mm[index_offset:index_offset + index_size]).decode("utf-8"))
+                _state["pak"] = (mm, index)
+        return _state["pak"]
+
+    def _norm(name):
+        name = name.replace("\\", "/").strip("/")
+        while name.startswith("./"):
+            name = name[2:]
+        return name
+
+    def names(prefix=""):
+        """Noms des ressources (chemins relatifs « / »), filtrés par préfixe de dossier."""
+        mm, index = _archive()
+        prefix = _norm(prefix)
+        if mm is None:
+            root = os.path.join(BASE_DIR, prefix)
+            found = []
+            for dirpath, _dirs, files in os.walk(root):
+                for fn in files:
+                    found.append(os.path.relpath(os.path.join(dirpath, fn), BASE_DIR).replace(os.sep, "/"))
+            return sorted(found)
+        if not prefix:
+            return sorted(index["files"])
+        return sorted(n for n in index["files"] if n == prefix or n.startswith(prefix + "/"))
+
+    def exists(name):
+        mm, index = _archive()
+        name = _norm(name)
+        if mm is None:
+            return os.path.exists(os.path.join(BASE_DIR, name))
+        return name in index["files"] or bool(names(name))
+
+    def read(name):
+        """Contenu de la ressource : memoryview sur l'archive projetée, sans copie."""
+        mm, index = _archive()
+        name = _norm(name)
+        if mm is None:
+            with open(os.path.join(BASE_DIR, name), "rb") as f:
+                return memoryview(f.read())
+        try:
+            offset, size = index["files"][name]
+        except KeyError:
+            raise FileNotFoundError(name) from None
+        return memoryview(mm)[offset:offset + size]
+
+    def open_resource(name, mode="rb", encoding=None):
+        """Objet fichier en lecture seule ("rb" ou "r")."""
+        stream = io.BytesIO(read(name))
+        if "b" in mode:
+            return stream
+        return io.TextIOWrapper(stream, encoding=encoding or "utf-8")
+
+    def _cache_root():
+        if os.name == "nt":
+            base = os.environ.get("LOCALAPPDATA") or os.path.expanduser("~")
+        else:
+            base = os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache")
+        return os.path.join(base, "pypack-resources")
+
+    def _materialize(name, dest_root):
+        dest = os.path.join(dest_root, *name.split("/"))
+        if os.path.exists(dest):
+            return
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        tmp = f"{dest}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(read(name))
+        os.replace(tmp, dest)
+
+    def path(name):
+        """Vrai chemin de la ressource (fichier ou dossier), extrait au besoin dans le cache."""
+        mm, index = _archive()
+        name = _norm(name)
+        if mm is None:
+            return os.path.join(BASE_DIR, name)
+        dest_root = os.path.join(_cache_root(), index["digest"])
+        members = [name] if name in index["files"] else names(name)
+        if not members:
+            raise FileNotFoundError(name)
+        for member in members:
+            _materialize(member, dest_root)
+        return os.path.join(dest_root, *name.split("/")) if name else dest_root
+
+    module = types.ModuleType("pypack_resources",
+                              "Ressources embarquées par PyPack Studio : names, exists, read, open, path.")
+    module.__dict__.update(names=names, exists=exists, read=read, open=open_resource, path=path)
+    sys.modules.setdefault("pypack_resources", module)
+
+
+_pypack_resources()
+del _pypack_resources
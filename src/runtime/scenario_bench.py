@@ -0,0 +1,57 @@
+"""
+Benchmark d'un scénario, exécuté par PyPack Studio (PGO, calibration des préréglages).
+
+Lance l'exécutable avec les arguments du scénario (meilleur temps sur RUNS
+exécutions), enregistre la mesure sous BENCH.json[KEY][LABEL] et, si BASELINE
+n'est pas « - », affiche la comparaison avec la mesure BASELINE de même KEY.
+
+Usage : scenario_bench.py BENCH.json KEY LABEL RUNS BASELINE EXE [ARGS...]
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+
+RUN_TIMEOUT = 300
+
+
+def main(argv):
+    bench_json, key, label, runs, baseline = argv[1], argv[2], argv[3], int(argv[4]), argv[5]
+    exe, args = argv[6], argv[7:]
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    best = float("inf")
+    for _ in range(runs):
+        start = time.perf_counter()
+        try:
+            code = subprocess.call([exe] + args, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                                   timeout=RUN_TIMEOUT)
+        except subprocess.TimeoutExpired:
+            print(f"[BENCH] Le scénario ne se termine pas en {RUN_TIMEOUT} s : {exe}", file=sys.stderr)
+            return 1
+        best = min(best, time.perf_counter() - start)
+        if code != 0:
+            print(f"[BENCH] Le scénario échoue (code {code}) : {exe}", file=sys.stderr)
+            return code
+    try:
+        with open(bench_json, encoding="utf-8") as f:
+            bench = json.load(f)
+    except (OSError, ValueError):
+        bench = {}
+    bench.setdefault(key, {})[label] = best
+    os.makedirs(os.path.dirname(bench_json), exist_ok=True)
+    with open(bench_json, "w", encoding="utf-8") as f:
+        json.dump(bench, f, indent=2)
+    print(f"[BENCH] Scénario ({label}) : {best * 1000:.0f} ms")
+    before = bench[key].get(baseline)
+    if before:
+        delta = (best - before) / before * 100
+        print(f"[BENCH] {baseline} -> {label} : {before * 1000:.0f} ms -> {best * 1000:.0f} ms ({delta:+.1f}%)")
+    sys.stdout.flush()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
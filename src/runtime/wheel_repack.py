@@ -0,0 +1,154 @@
+"""
+Reconstitution de wheels à partir des distributions installées, exécutée par
+PyPack Studio dans l'interpréteur qui les a installées (Python >= 3.8).
+
+Chaque distribution installée depuis un wheel (fichier WHEEL présent) est
+réempaquetée d'après son RECORD : fichiers du paquet et métadonnées, sans
+bytecode ni scripts générés (pip les recrée depuis entry_points.txt). Archives
+déterministes (dates fixes, ordre trié) : une même distribution donne toujours
+le même fichier, donc la même empreinte. Les installations éditables et les
+distributions sans RECORD sont ignorées.
+
+Usage : wheel_repack.py OUT_DIR REQUEST.json
+REQUEST.json : {"roots": [noms] ou null (toutes), "skip": [fichiers .whl déjà présents]}
+Sortie (JSON) : {"built": [fichiers], "present": [fichiers], "ignored": [[distribution, raison]]}
+"""
+
+import base64
+import hashlib
+import json
+import os
+import re
+import sys
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from importlib import metadata
+
+ZIP_DATE = (1980, 1, 1, 0, 0, 0)
+DROPPED_METADATA = {"INSTALLER", "REQUESTED", "RECORD", "direct_url.json"}
+
+
+def normalize(name):
+    return re.sub(r"[-_.]+", "_", name).lower()
+
+
+def wheel_tag(wheel_text):
+    """Étiquette de nom de fichier (py3-none-any...) depuis les lignes Tag: du fichier WHEEL."""
+    tags = [line.split(":", 1)[1].strip() for line in wheel_text.splitlines() if line.startswith("Tag:")]
+    if not tags:
+        return ""
+    parts = [[], [], []]
+    for tag in tags:
+        for i, value in enumerate(tag.split("-", 2)):
+            if value not in parts[i]:
+                parts[i].append(value)
+    return "-".join(".".join(values) for values in parts)
+
+
+def wheel_name(dist):
+    wheel_text = dist.read_text("WHEEL") or ""
+    tag = wheel_tag(wheel_text)
+    if not tag:
+        return ""
+    version = dist.version.replace("-", "_")
+    return f"{normalize(dist.metadata['Name'])}-{version}-{tag}.whl"
+
+
+def _editable(dist):
+    try:
+        info = json.loads(dist.read_text("direct_url.json") or "{}")
+    except ValueError:
+        return False
+    return bool(info.get("dir_info", {}).get("editable"))
+
+
+def _record_hash(data):
+    digest = base64.urlsafe_b64encode(hashlib.sha256(data).digest()).rstrip(b"=").decode("ascii")
+    return f"sha256={digest}"
+
+
+def repack(dist, out_dir):
+    """Écrit le wheel de `dist` dans `out_dir` ; retourne son nom de fichier."""
+    name = wheel_name(dist)
+    entries = []
+    dist_info = ""
+    for path in dist.files or []:
+        rel = path.as_posix()
+        if rel.startswith("../") or "/__pycache__/" in f"/{rel}" or rel.endswith(".pyc"):
+            continue
+        top = rel.split("/", 1)[0]
+        if top.endswith(".dist-info"):
+            dist_info = top
+            if rel.split("/", 1)[-1] in DROPPED_METADATA:
+                continue
+        full = str(dist.locate_file(path))
+        if os.path.isfile(full):
+            entries.append((rel, full))
+    record_lines = []
+    tmp = os.path.join(out_dir, name + ".part")
+    with zipfile.ZipFile(tmp, "w", zipfile.ZIP_DEFLATED) as zf:
+        for rel, full in sorted(entries):
+            with open(full, "rb") as f:
+                data = f.read()
+            info = zipfile.ZipInfo(rel, ZIP_DATE)
+            info.external_attr = (0o755 if os.access(full, os.X_OK) else 0o644) << 16
+            info.compress_type = zipfile.ZIP_DEFLATED
+            zf.writestr(info, data)
+            record_lines.append(f"{rel},{_record_hash(data)},{len(data)}")
+        record_lines.append(f"{dist_info}/RECORD,,")
+        info = zipfile.ZipInfo(f"{dist_info}/RECORD", ZIP_DATE)
+        info.external_attr = 0o644 << 16
+        info.compress_type = zipfile.ZIP_DEFLATED
+        zf.writestr(info, "\n".join(record_lines) + "\n")
+    os.replace(tmp, os.path.join(out_dir, name))
+    return name
+
+
+def closure(dists, roots):
+    """Distributions `roots` et leurs dépendances installées (extras ignorés)."""
+    wanted, pending = set(), [normalize(r) for r in roots]
+    while pending:
+        key = pending.pop()
+        if key in wanted or key not in dists:
+            continue
+        wanted.add(key)
+        for req in dists[key].requires or []:
+            if re.search(r";.*\bextra\s*==", req):
+                continue
+            match = re.match(r"\s*([A-Za-z0-9][A-Za-z0-9._-]*)", req)
+            if match:
+                pending.append(normalize(match.group(1)))
+    return wanted
+
+
+def main(argv):
+    out_dir = argv[1]
+    with open(argv[2], encoding="utf-8") as f:
+        request = json.load(f)
+    dists = {}
+    for dist in metadata.distributions():
+        if dist.metadata["Name"]:
+            dists.setdefault(normalize(dist.metadata["Name"]), dist)  # premier sur sys.path
+    keys = sorted(dists) if request.get("roots") is None else sorted(closure(dists, request["roots"]))
+    skip = set(request.get("skip", []))
+    result = {"built": [], "present": [], "ignored": []}
+    jobs = []
+    for key in keys:
+        dist = dists[key]
+        name = wheel_name(dist)
+        if not name or not dist.files:
+            result["ignored"].append([key, "pas installé depuis un wheel"])
+        elif _editable(dist):
+            result["ignored"].append([key, "installation éditable"])
+        elif name in skip:
+            result["present"].append(name)
+        else:
+            jobs.append(dist)
+    os.makedirs(out_dir, exist_ok=True)
+    with ThreadPoolExecutor(max_workers=min(8, (os.cpu_count() or 1) * 2)) as pool:
+        result["built"] = list(pool.map(lambda d: repack(d, out_dir), jobs))
+    sys.stdout.write(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main(sys.argv)
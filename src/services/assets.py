@@ -0,0 +1,206 @@
+# src/services/assets.py
+"""
+Optimisation des ressources avant leur collecte.
+
+- PNG recompressés sans perte (données d'image décompressées puis recompressées
+  par zlib au niveau maximal, métadonnées textuelles retirées), en parallèle ;
+  la version recompressée n'est retenue que si elle est plus petite.
+- Formats de travail (.psd, .xcf, ...) retirés du paquet.
+- Icône .ico multi-résolution générée depuis un PNG quand l'outil l'exige.
+
+Les résultats sont mis en cache par empreinte du fichier d'entrée : seules les
+ressources modifiées sont retraitées.
+"""
+import fnmatch
+import hashlib
+import json
+import os
+import struct
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+# Métadonnées sans effet sur le rendu
+PNG_DROP_CHUNKS = {b"tEXt", b"zTXt", b"iTXt", b"tIME"}
+DEFAULT_DROP_PATTERNS = ["*.psd", "*.psb", "*.xcf", "*.kra", "*.ora", "*.ai", "*.sketch", "*.fig",
+                         "*.afphoto", "*.afdesign", "*.svgz~", "Thumbs.db", ".DS_Store"]
+ICO_SIZES = (16, 24, 32, 48, 64, 128, 256)
+
+
+def _chunks(data: bytes):
+    pos = len(PNG_SIGNATURE)
+    while pos + 8 <= len(data):
+        length, kind = struct.unpack(">I4s", data[pos:pos + 8])
+        yield kind, data[pos + 8:pos + 8 + length]
+        pos += 12 + length
+        if kind == b"IEND":
+            return
+
+
+def _chunk(kind: bytes, payload: bytes) -> bytes:
+    return struct.pack(">I", len(payload)) + kind + payload + struct.pack(">I", zlib.crc32(kind + payload))
+
+
+def recompress_png(data: bytes) -> bytes:
+    """PNG équivalent au pixel près, avec un seul IDAT recompressé ; `data` si rien n'est gagné."""
+    if not data.startswith(PNG_SIGNATURE):
+        return data
+    chunks = list(_chunks(data))
+    try:
+        raw = zlib.decompress(b"".join(p for k, p in chunks if k == b"IDAT"))
+    except zlib.error:
+        return data
+    candidates = []
+    for strategy in (zlib.Z_DEFAULT_STRATEGY, zlib.Z_FILTERED):
+        comp = zlib.compressobj(9, zlib.DEFLATED, 15, 9, strategy)
+        candidates.append(comp.compress(raw) + comp.flush())
+    idat = min(candidates, key=len)
+    out, idat_written = [PNG_SIGNATURE], False
+    for kind, payload in chunks:
+        if kind in PNG_DROP_CHUNKS:
+            continue
+        if kind == b"IDAT":
+            if not idat_written:
+                out.append(_chunk(b"IDAT", idat))
+                idat_written = True
+            continue
+        out.append(_chunk(kind, payload))
+    result = b"".join(out)
+    return result if len(result) < len(data) else data
+
+
+def _optimize_png(src: str, dest: str) -> bool:
+    """Écrit la version recompressée dans `dest` ; faux si l'original est déjà optimal."""
+    data = Path(src).read_bytes()
+    result = recompress_png(data)
+    if result is data:
+        return False
+    tmp = dest + ".tmp"
+    Path(tmp).write_bytes(result)
+    os.replace(tmp, dest)
+    return True
+
+
+def _digest(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+class AssetCache:
+    """Index {empreinte d'entrée: optimisé ou non} et empreintes mémorisées par (taille, date)."""
+
+    def __init__(self, cache_dir: str):
+        self.dir = Path(cache_dir)
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.index_path = self.dir / "index.json"
+        try:
+            data = json.loads(self.index_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            data = {}
+        self.results: Dict[str, bool] = data.get("results", {})
+        self.stats: Dict[str, list] = data.get("stats", {})
+
+    def digest(self, path: str) -> str:
+        st = os.stat(path)
+        known = self.stats.get(path)
+        if known and known[0] == st.st_size and known[1] == st.st_mtime_ns:
+            return known[2]
+        digest = _digest(path)
+        self.stats[path] = [st.st_size, st.st_mtime_ns, digest]
+        return digest
+
+    def output(self, digest: str, suffix: str) -> str:
+        return str(self.dir / f"{digest}{suffix}")
+
+    def save(self):
+        self.index_path.write_text(json.dumps({"results": self.results, "stats": self.stats}), encoding="utf-8")
+
+
+def optimize_mapping(mapping: Dict[str, str], cache_dir: str,
+                     drop_patterns: Iterable[str] = ()) -> Tuple[Dict[str, str], dict]:
+    """{destination: source} avec les PNG remplacés par leur version optimisée et les
+    formats de travail retirés ; retourne aussi les statistiques du passage."""
+    patterns = DEFAULT_DROP_PATTERNS + [p for p in drop_patterns if p]
+    cache = AssetCache(cache_dir)
+    out, pending = {}, {}
+    stats = {"dropped": 0, "dropped_bytes": 0, "png": 0, "optimized": 0, "cached": 0, "saved_bytes": 0}
+    for dest, src in mapping.items():
+        name = dest.rsplit("/", 1)[-1]
+        if any(fnmatch.fnmatch(name.lower(), p.lower()) for p in patterns):
+            stats["dropped"] += 1
+            stats["dropped_bytes"] += os.path.getsize(src)
+            continue
+        out[dest] = src
+        if name.lower().endswith(".png"):
+            stats["png"] += 1
+            digest = cache.digest(src)
+            if digest in cache.results and (not cache.results[digest] or os.path.exists(cache.output(digest, ".png"))):
+                stats["cached"] += 1
+            else:
+                pending.setdefault(digest, src)
+    if pending:
+        # threads et non processus : zlib libère le GIL, et un processus lancé depuis le studio figé
+        # (Windows, spawn) relancerait l'application au lieu du travail
+        with ThreadPoolExecutor(max_workers=min(len(pending), os.cpu_count() or 1)) as pool:
+            digests = list(pending)
+            results = pool.map(_optimize_png, [pending[d] for d in digests],
+                               [cache.output(d, ".png") for d in digests])
+            for digest, optimized in zip(digests, results):
+                cache.results[digest] = optimized
+                stats["optimized"] += optimized
+    for dest, src in out.items():
+        if dest.lower().endswith(".png"):
+            digest = cache.digest(src)
+            if cache.results.get(digest):
+                optimized = cache.output(digest, ".png")
+                stats["saved_bytes"] += os.path.getsize(src) - os.path.getsize(optimized)
+                out[dest] = optimized
+    cache.save()
+    return out, stats
+
+
+def icon_needed(icon_path: str) -> bool:
+    """Vrai si l'icône doit être convertie en .ico (Windows, icône qui n'en est pas une)."""
+    return bool(icon_path) and os.name == 'nt' and not icon_path.lower().endswith(".ico")
+
+
+def icon_output(icon_path: str, cache_dir: str) -> str:
+    return str(Path(cache_dir) / "icons" / f"{_digest(icon_path)[:24]}.ico")
+
+
+def write_ico(image_path: str, dest: str, sizes: Iterable[int] = ICO_SIZES) -> str:
+    """Icône multi-résolution (images PNG dans un conteneur ICO) générée avec Qt ; en cache."""
+    if os.path.exists(dest):
+        return dest
+    from PySide6 import QtCore, QtGui
+    image = QtGui.QImage(image_path)
+    if image.isNull():
+        raise ValueError(f"Image illisible: {image_path}")
+    images: List[Tuple[int, bytes]] = []
+    for size in sizes:
+        scaled = image.scaled(size, size, QtCore.Qt.KeepAspectRatio, QtCore.Qt.SmoothTransformation)
+        square = QtGui.QImage(size, size, QtGui.QImage.Format_ARGB32)
+        square.fill(QtCore.Qt.transparent)
+        painter = QtGui.QPainter(square)
+        painter.drawImage((size - scaled.width()) // 2, (size - scaled.height()) // 2, scaled)
+        painter.end()
+        buffer = QtCore.QBuffer()
+        buffer.open(QtCore.QIODevice.WriteOnly)
+        square.save(buffer, "PNG")
+        images.append((size, recompress_png(bytes(buffer.data()))))
+    header = struct.pack("<HHH", 0, 1, len(images))
+    offset = len(header) + 16 * len(images)
+    entries, payload = [], []
+    for size, png in images:
+        dim = 0 if size >= 256 else size  # 0 = 256 dans le format ICO
+        entries.append(struct.pack("<BBBBHHII", dim, dim, 0, 0, 1, 32, len(png), offset))
+        payload.append(png)
+        offset += len(png)
+    Path(dest).parent.mkdir(parents=True, exist_ok=True)
+    Path(dest).write_bytes(header + b"".join(entries) + b"".join(payload))
+    return dest
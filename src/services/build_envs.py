@@ -0,0 +1,203 @@
+# src/services/build_envs.py
+"""
+Environnements de build gérés : un venv propre créé depuis le fichier de
+dépendances du projet (lockfile de préférence) et l'outil de packaging,
+identifié par l'empreinte de ces entrées et de l'interpréteur de base.
+
+Les venvs vivent dans un pool partagé entre projets (cache utilisateur) :
+des dépendances identiques réutilisent le même venv, une dépendance modifiée
+n'en crée qu'un nouveau, et les moins récemment utilisés sont supprimés
+au-delà de POOL_SIZE. Un venv n'est utilisable qu'une fois son env.json écrit :
+une création interrompue est effacée et reprise au build suivant.
+"""
+import hashlib
+import json
+import re
+import shutil
+import subprocess
+import time
+from dataclasses import replace
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from src.backends import BuildConfig, BuildStep
+from src.services import interpreters
+
+REQUIREMENT_FILES = ("requirements.lock", "requirements-lock.txt", "requirements.txt")  # par ordre de préférence
+BACKEND_PACKAGES = {"pyinstaller": ("pyinstaller",), "nuitka": ("nuitka",), "hybrid": ("pyinstaller", "nuitka")}
+POOL_SIZE = 4
+MARKER = "env.json"
+
+
+def pool_dir() -> Path:
+    return interpreters.cache_root() / "envs"
+
+
+def requirements_file(project_dir: str) -> str:
+    for name in REQUIREMENT_FILES:
+        path = Path(project_dir) / name
+        if path.is_file():
+            return str(path)
+    return ""
+
+
+def _requirement_lines(path: Path, seen: Optional[set] = None) -> List[str]:
+    """Lignes significatives, fichiers -r / -c référencés compris (commentaires et blancs ignorés)."""
+    seen = seen if seen is not None else set()
+    if path in seen or not path.is_file():
+        return []
+    seen.add(path)
+    lines = []
+    for raw in path.read_text(encoding="utf-8").splitlines():
+        line = re.sub(r"(^|\s)#.*$", "", raw).strip()
+        if not line:
+            continue
+        match = re.match(r"^(-r|-c|--requirement|--constraint)[\s=]+(.+)$", line)
+        if match:
+            lines.extend(_requirement_lines(path.parent / match.group(2).strip(), seen))
+        else:
+            lines.append(line)
+    return lines
+
+
+def requirement_names(path: str) -> List[str]:
+    """Noms des distributions demandées par un fichier de dépendances (options ignorées)."""
+    names = []
+    for line in _requirement_lines(Path(path)) if path else []:
+        match = re.match(r"^([A-Za-z0-9][A-Za-z0-9._-]*)", line)
+        if match:
+            names.append(match.group(1))
+    return names
+
+
+def backend_packages(cfg: BuildConfig) -> List[str]:
+    """Paquets de l'outil, épinglés à la version de l'interpréteur de base quand il les a."""
+    base = interpreters.describe(cfg.python_exe)
+    return [f"{name}=={getattr(base, name)}" if getattr(base, name) else name
+            for name in BACKEND_PACKAGES.get(cfg.backend, ())]
+
+
+def env_key(cfg: BuildConfig) -> str:
+    """Empreinte des entrées du venv : interpréteur de base, dépendances normalisées, outil."""
+    base = interpreters.describe(cfg.python_exe)
+    req = requirements_file(cfg.project_dir)
+    parts = [base.version, str(base.bits), interpreters.interpreter_key(cfg.python_exe)]
+    parts += sorted(_requirement_lines(Path(req))) if req else []
+    parts += ["--"] + backend_packages(cfg)
+    return hashlib.sha256("\n".join(parts).encode("utf-8")).hexdigest()[:16]
+
+
+def env_python(env_dir: Path) -> Path:
+    return env_dir / interpreters.VENV_BIN / interpreters.PYTHON_NAME
+
+
+def _ready(env_dir: Path) -> bool:
+    return (env_dir / MARKER).is_file() and env_python(env_dir).is_file()
+
+
+def _touch(env_dir: Path):
+    meta_path = env_dir / MARKER
+    meta = json.loads(meta_path.read_text(encoding="utf-8"))
+    meta["last_used"] = time.time()
+    meta_path.write_text(json.dumps(meta, indent=2), encoding="utf-8")
+
+
+def _last_used(env_dir: Path) -> float:
+    try:
+        return json.loads((env_dir / MARKER).read_text(encoding="utf-8"))["last_used"]
+    except (OSError, ValueError, KeyError):
+        return 0.0  # création interrompue : première candidate à l'éviction
+
+
+def evict(keep: str, pool_size: int = POOL_SIZE) -> List[str]:
+    """Supprime les venvs les moins récemment utilisés au-delà de `pool_size` (hors `keep`)."""
+    root = pool_dir()
+    if not root.is_dir():
+        return []
+    envs = sorted((p for p in root.iterdir() if p.is_dir() and p.name != keep), key=_last_used, reverse=True)
+    removed = []
+    for env_dir in envs[max(0, pool_size - 1):]:
+        shutil.rmtree(env_dir, ignore_errors=True)
+        removed.append(env_dir.name)
+    return removed
+
+
+def managed_config(cfg: BuildConfig) -> BuildConfig:
+    """Config dont python_exe est le venv géré correspondant (créé ou non)."""
+    return replace(cfg, python_exe=str(env_python(pool_dir() / env_key(cfg))))
+
+
+def provision(cfg: BuildConfig) -> Tuple[BuildConfig, List[BuildStep]]:
+    """(config dont python_exe est le venv géré, étapes qui le créent ou le réutilisent)."""
+    key = env_key(cfg)
+    env_dir = pool_dir() / key
+    env_cfg = replace(cfg, python_exe=str(env_python(env_dir)))
+    if _ready(env_dir):
+        def reuse(log):
+            _touch(env_dir)
+            log(f"[ENV] Environnement {key} réutilisé : {env_dir}")
+        return env_cfg, [BuildStep("env", func=reuse)]
+
+    req = requirements_file(cfg.project_dir)
+    packages = backend_packages(cfg)
+
+    def prepare(log):
+        shutil.rmtree(env_dir, ignore_errors=True)
+        removed = evict(key)
+        if removed:
+            log(f"[ENV] Environnements supprimés (LRU) : {', '.join(removed)}")
+        log(f"[ENV] Création de l'environnement {key} ({Path(req).name if req else 'sans dépendances'}"
+            f" + {', '.join(packages)})")
+
+    def ready(log):
+        (env_dir / MARKER).write_text(json.dumps({
+            "key": key, "base": cfg.python_exe, "requirements": req, "backend": packages,
+            "created": time.time(), "last_used": time.time(),
+        }, indent=2), encoding="utf-8")
+        log(f"[ENV] Environnement {key} prêt")
+
+    pip_args = (["-r", req] if req else []) + packages
+    if not cfg.wheelhouse:
+        install = [str(env_python(env_dir)), "-m", "pip", "install", "--disable-pip-version-check"] + pip_args
+        return env_cfg, [
+            BuildStep("env", func=prepare),
+            BuildStep("env-venv", cmd=[cfg.python_exe, "-m", "venv", str(env_dir)]),
+            BuildStep("env-install", cmd=install, workdir=cfg.project_dir),
+            BuildStep("env-ready", func=ready),
+        ]
+
+    from src.services import wheelhouse
+    roots = [p.split("==")[0] for p in packages] + requirement_names(req)
+
+    def fill(python_exe: str, roots: Optional[List[str]], log):
+        # une wheelhouse incomplète n'empêche pas le build : pip complète depuis l'index
+        wh = wheelhouse.Wheelhouse()
+        try:
+            collected = wh.collect([wheelhouse.pip_wheel_cache()] +
+                                   [Path(cfg.project_dir) / d for d in wheelhouse.PROJECT_WHEEL_DIRS])
+            added, present, _ignored = wh.fill(python_exe, roots)
+        except (OSError, RuntimeError, ValueError, subprocess.SubprocessError) as e:
+            log(f"[WHEELHOUSE] Remplissage impossible depuis {python_exe} : {e}")
+            return
+        removed = wh.evict()
+        wh.save()
+        log(f"[WHEELHOUSE] {added + collected} wheels ajoutés, {present} déjà présents, {len(removed)} supprimés "
+            f"(quota) ; {len(wh.wheels)} wheels, {wh.total_size() / 1024 ** 2:.0f} Mo")
+
+    return env_cfg, [
+        BuildStep("env", func=prepare),
+        BuildStep("wheelhouse", func=lambda log: fill(cfg.python_exe, roots, log)),
+        BuildStep("env-venv", cmd=[cfg.python_exe, "-m", "venv", str(env_dir)]),
+        BuildStep("env-install", cmd=wheelhouse.install_cmd(str(env_python(env_dir)), pip_args), workdir=cfg.project_dir),
+        BuildStep("wheelhouse-env", func=lambda log: fill(str(env_python(env_dir)), None, log)),
+        BuildStep("env-ready", func=ready),
+    ]
+
+
+def clear_pool() -> int:
+    """Supprime tous les environnements gérés ; retourne leur nombre."""
+    root = pool_dir()
+    envs = [p for p in root.iterdir() if p.is_dir()] if root.is_dir() else []
+    for env_dir in envs:
+        shutil.rmtree(env_dir, ignore_errors=True)
+    return len(envs)
@@ -0,0 +1,255 @@
+# src/services/build_inputs.py
+"""
+« Pourquoi ce rebuild ? » : les entrées complètes de chaque build réussi sont
+enregistrées (configuration normalisée, commandes lancées, variables
+d'environnement utiles, empreinte de l'interpréteur, empreintes des sources et
+des données incluses), puis comparées au build précédent le plus proche du
+même profil. Les différences sont classées selon la phase qu'elles
+invalident, de la plus coûteuse à la plus légère, et les écarts qui ne sont
+qu'une normalisation de chemin sont signalés comme tels.
+"""
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from src.backends import BuildConfig, BuildStep
+from src.services import build_phases, env_fingerprint, include_filter, onefile_cache, preflight
+
+HISTORY_DIR = "history"
+HISTORY_SIZE = 20
+HASH_WORKERS = min(8, (os.cpu_count() or 1) * 2)
+ENV_VARS = {"PATH", "SOURCE_DATE_EPOCH", "CC", "CXX", "CFLAGS", "LDFLAGS", "VIRTUAL_ENV", "CONDA_PREFIX"}
+# phase invalidée -> poids (ordre du classement)
+PHASES = {"analyse": 3, "collecte": 2, "assemblage": 1, "aucune": 0}
+
+
+@dataclass
+class Change:
+    category: str  # "config", "commande", "env", "interpréteur", "distribution", "source", "donnée"
+    key: str
+    before: object
+    after: object
+    phase: str
+    note: str = ""
+
+    def line(self) -> str:
+        note = f" — {self.note}" if self.note else ""
+        if isinstance(self.before, list) and isinstance(self.after, list) and self.category == "commande":
+            # arguments : seuls ceux qui diffèrent
+            pairs = [(a, b) for a, b in zip(self.before, self.after) if a != b]
+            removed = [a for a in self.before if a not in self.after]
+            added = [a for a in self.after if a not in self.before]
+            if len(self.before) == len(self.after) and pairs:
+                detail = ", ".join(f"{_short(a)} -> {_short(b)}" for a, b in pairs[:3])
+            else:
+                detail = f"retirés {_short(removed)}, ajoutés {_short(added)}"
+            return f"[{self.phase}] {self.category} {self.key} : {detail}{note}"
+        if self.category in ("source", "donnée"):
+            state = "ajouté" if self.before is None else "supprimé" if self.after is None else "contenu modifié"
+            return f"[{self.phase}] {self.category} {self.key} : {state}"
+        return f"[{self.phase}] {self.category} {self.key} : {_short(self.before)} -> {_short(self.after)}{note}"
+
+
+def _short(value, width: int = 60) -> str:
+    text = "absent" if value is None else json.dumps(value, ensure_ascii=False) if not isinstance(value, str) else value
+    return text if len(text) <= width else text[:width - 1] + "…"
+
+
+def history_dir(cfg: BuildConfig) -> Path:
+    return Path(cfg.work_dir()) / HISTORY_DIR
+
+
+def _hash_file(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(1024 * 1024):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def input_files(cfg: BuildConfig) -> Tuple[List[str], List[str]]:
+    """(sources du projet, données incluses) : chemins absolus."""
+    sources = set(preflight.project_sources(cfg))
+    data = set()
+    filters = include_filter.normalized_filters(cfg.include_filters)
+    for item in [src for src, _dest in cfg.add_data] + cfg.files_to_include + cfg.dirs_to_include + [cfg.icon_path]:
+        if item and os.path.isfile(item):
+            data.add(item)
+        elif item and os.path.isdir(item):
+            rules = include_filter.rules_for(filters, item) if item in cfg.dirs_to_include else []
+            data.update(os.path.join(item, rel) for rel, _size in include_filter.walk(item, rules))
+    return sorted(p for p in sources if p), sorted(data - sources)
+
+
+def file_hashes(paths: List[str], cache_path: Path) -> Dict[str, str]:
+    """{chemin: SHA-256}, seuls les fichiers dont la taille ou la date a changé sont relus."""
+    try:
+        cache = json.loads(cache_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        cache = {}
+    stats = {}
+    for path in paths:
+        try:
+            st = os.stat(path)
+            stats[path] = [st.st_size, st.st_mtime_ns]
+        except OSError:
+            continue
+    stale = [p for p, stat in stats.items() if cache.get(p, [None, None, ""])[:2] != stat]
+    with ThreadPoolExecutor(max_workers=HASH_WORKERS) as pool:
+        for path, digest in zip(stale, pool.map(_hash_file, stale)):
+            cache[path] = stats[path] + [digest]
+    cache = {p: cache[p] for p in stats}
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    cache_path.write_text(json.dumps(cache), encoding="utf-8")
+    return {p: entry[2] for p, entry in cache.items()}
+
+
+def collect(cfg: BuildConfig, steps: List[BuildStep], profile: str = "") -> dict:
+    """Entrées complètes du build sur le point d'être lancé."""
+    sources, data = input_files(cfg)
+    hashes = file_hashes(sources + data, history_dir(cfg) / "hashes.json")
+    env = {k: v for k, v in os.environ.items() if k in ENV_VARS or k.startswith("PYTHON")}
+    for step in steps:
+        env.update(step.env)
+    snapshot = env_fingerprint.snapshot(cfg.python_exe) if Path(cfg.python_exe).is_file() else {}
+    return {
+        "time": time.time(),
+        "profile": profile,
+        "config": json.loads(json.dumps(asdict(cfg))),
+        "commands": {s.label: onefile_cache.stable_command(s.cmd) for s in steps if s.cmd},
+        "env": env,
+        "interpreter": snapshot.get("interpreter"),
+        "dists": snapshot.get("dists", {}),
+        "sources": {p: hashes[p] for p in sources if p in hashes},
+        "data": {p: hashes[p] for p in data if p in hashes},
+    }
+
+
+def _path_only(before, after) -> bool:
+    """Vrai si deux valeurs ne diffèrent que par l'écriture d'un chemin (casse, séparateurs, liens, '..')."""
+    if isinstance(before, list) and isinstance(after, list):
+        return len(before) == len(after) and all(a == b or _path_only(a, b) for a, b in zip(before, after))
+    if not (isinstance(before, str) and isinstance(after, str) and before and after):
+        return False
+    norm = lambda p: os.path.normcase(os.path.normpath(p))
+    return norm(before) == norm(after) or os.path.realpath(before) == os.path.realpath(after)
+
+
+def _dict_changes(category: str, before: dict, after: dict, phase_of) -> List[Change]:
+    changes = []
+    for key in sorted(set(before) | set(after)):
+        old, new = before.get(key), after.get(key)
+        if old != new:
+            note = "normalisation de chemin uniquement" if _path_only(old, new) else ""
+            changes.append(Change(category, key, old, new, phase_of(key), note))
+    return changes
+
+
+def _config_phase(name: str) -> str:
+    if name in build_phases.IGNORED_FIELDS:
+        return "aucune"
+    return "assemblage" if name in build_phases.ASSEMBLY_FIELDS else "analyse"
+
+
+def explain(previous: dict, current: dict) -> List[Change]:
+    """Différences entre deux builds, de la phase la plus coûteuse à la plus légère."""
+    changes = _dict_changes("config", previous.get("config", {}), current["config"], _config_phase)
+    for change in changes:
+        if change.key == "clean" and change.after:
+            change.phase, change.note = "analyse", "nettoyage demandé : build complet"
+    commands = _dict_changes("commande", previous.get("commands", {}), current["commands"], lambda _k: "analyse")
+    for change in commands:
+        if isinstance(change.before, list) and [a for a in change.before if a != "--clean"] == change.after:
+            change.phase, change.note = "aucune", "nettoyage retiré"
+    changes += commands
+    changes += _dict_changes("env", previous.get("env", {}), current["env"], lambda _k: "analyse")
+    if previous.get("interpreter") != current["interpreter"]:
+        changes.append(Change("interpréteur", "exécutable", previous.get("interpreter"), current["interpreter"], "analyse"))
+    changes += _dict_changes("distribution", previous.get("dists", {}), current["dists"], lambda _k: "analyse")
+    changes += _dict_changes("source", previous.get("sources", {}), current["sources"], lambda _k: "analyse")
+    changes += _dict_changes("donnée", previous.get("data", {}), current["data"], lambda _k: "collecte")
+    return sorted(changes, key=lambda c: -PHASES[c.phase])
+
+
+def _distance(previous: dict, current: dict) -> int:
+    return len(explain(previous, current))
+
+
+def load_history(cfg: BuildConfig) -> List[dict]:
+    entries = []
+    for path in sorted(history_dir(cfg).glob("build-*.json")):
+        try:
+            entries.append(json.loads(path.read_text(encoding="utf-8")))
+        except (OSError, ValueError):
+            continue
+    return entries
+
+
+def closest(history: List[dict], current: dict) -> Optional[dict]:
+    """Build précédent le plus proche, du même profil s'il y en a ; le plus récent à égalité."""
+    same = [h for h in history if h.get("profile") == current.get("profile")] or history
+    if not same:
+        return None
+    return min(reversed(same), key=lambda h: _distance(h, current))
+
+
+def record(cfg: BuildConfig, current: dict):
+    root = history_dir(cfg)
+    root.mkdir(parents=True, exist_ok=True)
+    (root / f"build-{int(current['time'] * 1000)}.json").write_text(json.dumps(current), encoding="utf-8")
+    for old in sorted(root.glob("build-*.json"))[:-HISTORY_SIZE]:
+        old.unlink()
+
+
+def report_lines(changes: List[Change], previous: Optional[dict], limit: int = 0) -> List[str]:
+    """Résumé par phase puis une ligne par changement (les `limit` premiers si limit > 0)."""
+    if previous is None:
+        return ["Aucun build précédent enregistré : tout est à construire."]
+    when = time.strftime("%d/%m %H:%M", time.localtime(previous["time"]))
+    if not changes:
+        return [f"Entrées identiques au build du {when}."]
+    by_phase: Dict[str, int] = {}
+    for change in changes:
+        by_phase[change.phase] = by_phase.get(change.phase, 0) + 1
+    lines = [f"Comparé au build du {when} (profil « {previous.get('profile') or 'aucun'} ») : "
+             + ", ".join(f"{count} changement(s) → {phase}" for phase, count in by_phase.items())]
+    shown = changes[:limit] if limit else changes
+    lines += [change.line() for change in shown]
+    if len(shown) < len(changes):
+        lines.append(f"… et {len(changes) - len(shown)} autres")
+    return lines
+
+
+def record_steps(cfg: BuildConfig, steps: List[BuildStep], profile: str) -> Tuple[BuildStep, BuildStep]:
+    """(étape qui relève les entrées du build et journalise ce qui a changé, étape finale qui les
+    enregistre) : seuls les builds réussis entrent dans l'historique et servent de référence."""
+    collected = {}
+
+    def explain_inputs(log):
+        collected["current"] = current = collect(cfg, steps, profile)
+        previous = closest(load_history(cfg), current)
+        changes = explain(previous, current) if previous else []
+        for line in report_lines(changes, previous, limit=10):
+            log(f"[POURQUOI] {line}")
+        if cfg.clean and previous:
+            log("[POURQUOI] Nettoyage (--clean) coché : build complet quelles que soient les entrées")
+
+    def save_inputs(log):
+        record(cfg, collected["current"])
+
+    return BuildStep("inputs", func=explain_inputs), BuildStep("inputs-record", func=save_inputs)
+
+
+def last_explanation(cfg: BuildConfig) -> List[str]:
+    """Explication du dernier build réussi par rapport au plus proche de ceux qui le précèdent."""
+    history = load_history(cfg)
+    if not history:
+        return ["Aucun build enregistré pour ce projet."]
+    current = history[-1]
+    previous = closest(history[:-1], current)
+    return report_lines(explain(previous, current) if previous else [], previous)
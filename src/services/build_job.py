@@ -0,0 +1,56 @@
+# src/services/build_job.py
+"""
+Instantané d'un build, pris une seule fois au clic sur « Construire » : la
+configuration normalisée (préréglage appliqué, venv géré résolu) et les options
+lues dans l'interface. Tout le pipeline, jusqu'aux étapes de fin (copies,
+setup, ouverture du dossier), lit ce même objet : modifier l'interface pendant
+le build n'a plus d'effet sur le build en cours, et les chemins ne sont plus
+renormalisés à chaque étape.
+"""
+import copy
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import MappingProxyType
+from typing import Mapping
+
+from src.backends import BuildConfig, normpath
+
+
+@dataclass(frozen=True)
+class BuildJob:
+    """Build figé au lancement.
+
+    `frozen=True` ne protège que les attributs : `cfg` et `base_cfg` restent des
+    BuildConfig modifiables, mais ce sont des copies propres au build que ni
+    l'interface ni les étapes ne modifient. Les chemins normalisés sont
+    calculés à la capture et exposés en lecture seule.
+    """
+    cfg: BuildConfig  # config du build (python_exe pointe sur le venv géré s'il y en a un)
+    base_cfg: BuildConfig  # config avant provisionnement du venv géré
+    profile: str = ""
+    create_setup: bool = False
+    open_output_dir: bool = False
+    started: float = field(default_factory=time.time)
+    paths: Mapping[str, str] = field(default_factory=lambda: MappingProxyType({}), repr=False, compare=False)
+
+    @classmethod
+    def capture(cls, cfg: BuildConfig, base_cfg: BuildConfig, **options) -> "BuildJob":
+        """Copie profonde des configs : les étapes ne partagent aucune liste avec l'interface."""
+        cfg, base_cfg = copy.deepcopy(cfg), copy.deepcopy(base_cfg)
+        # chemins relus en fin de build (éléments copiés dans le dossier de sortie), normalisés une fois
+        paths = {p: normpath(p) for p in cfg.directories_to_create if p}
+        return cls(cfg, base_cfg, paths=MappingProxyType(paths), **options)
+
+    def path(self, p: str) -> str:
+        """Chemin normalisé (absolu, liens résolus) : celui de la capture s'il y en a un."""
+        return self.paths.get(p) or normpath(p)
+
+    @property
+    def output_dir(self) -> Path:
+        return Path(self.cfg.output_dir)
+
+    @property
+    def app_dir(self) -> Path:
+        """Dossier de l'application dans le dossier de sortie."""
+        return self.output_dir / self.cfg.name
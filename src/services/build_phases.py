@@ -0,0 +1,72 @@
+# src/services/build_phases.py
+"""
+Classement des changements de configuration par phase de build.
+
+La configuration du dernier build réussi est enregistrée dans le dossier de
+travail ; au build suivant, les champs modifiés disent quelle phase est
+invalidée. Si seuls des réglages d'assemblage (nom, icône, console, ...) ont
+changé, l'analyse des dépendances précédente est réutilisée et seuls les
+exécutables sont reconstruits.
+"""
+import json
+from dataclasses import asdict
+from pathlib import Path
+from typing import List, Optional
+
+from src.backends import BuildConfig
+
+# Réglages qui ne concernent que les exécutables / le dossier final
+ASSEMBLY_FIELDS = {"name", "icon_path", "windowed", "console", "onefile", "dual_output", "output_dir"}
+# Réglages sans effet sur les fichiers produits (le préréglage est déjà appliqué aux autres champs,
+# le venv géré se retrouve dans python_exe) ; "clean" coché impose à lui seul un build complet
+IGNORED_FIELDS = {"clean", "create_setup", "preset", "bench_args", "managed_env", "wheelhouse"}
+RECORD_NAME = "last_build.json"
+
+
+def record_path(cfg: BuildConfig) -> Path:
+    return Path(cfg.work_dir()) / RECORD_NAME
+
+
+def _as_json(cfg: BuildConfig) -> dict:
+    # aller-retour JSON : les tuples deviennent des listes, comme dans le fichier enregistré
+    return json.loads(json.dumps(asdict(cfg)))
+
+
+def load_previous(cfg: BuildConfig) -> Optional[dict]:
+    try:
+        return json.loads(record_path(cfg).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def save(cfg: BuildConfig):
+    path = record_path(cfg)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(_as_json(cfg), indent=2), encoding="utf-8")
+
+
+def changed_fields(previous: Optional[dict], cfg: BuildConfig) -> Optional[List[str]]:
+    """Champs modifiés depuis le dernier build réussi, ou None s'il n'y en a pas eu."""
+    if previous is None:
+        return None
+    current = _as_json(cfg)
+    return sorted(k for k, v in current.items() if k not in IGNORED_FIELDS and previous.get(k) != v)
+
+
+def assembly_only(changed: Optional[List[str]]) -> bool:
+    return changed is not None and all(f in ASSEMBLY_FIELDS for f in changed)
+
+
+def describe(changed: Optional[List[str]], reused: bool, backend: str, clean: bool = False) -> str:
+    if changed is None:
+        return "[PHASE] Aucun build précédent pour ce projet : build complet"
+    if not assembly_only(changed):
+        invalidating = [f for f in changed if f not in ASSEMBLY_FIELDS]
+        return f"[PHASE] Analyse invalidée par: {', '.join(invalidating)} ; build complet"
+    what = f"assemblage seul ({', '.join(changed)})" if changed else "configuration inchangée"
+    if clean:
+        return (f"[PHASE] {what.capitalize()}, mais nettoyage (--clean) demandé : build complet "
+                "(décochez « Nettoyage » pour ne reconstruire que les exécutables)")
+    if reused:
+        return f"[PHASE] {what.capitalize()} : analyse réutilisée, seuls les exécutables sont reconstruits"
+    return f"[PHASE] {what.capitalize()}, mais {backend} ne réutilise pas l'analyse précédente : build complet"
@@ -0,0 +1,146 @@
+# src/services/env_fingerprint.py
+"""
+Empreinte de l'environnement d'un interpréteur, sans lancer `pip freeze` :
+contenu des dossiers site-packages, date des RECORD des .dist-info et stat
+de l'exécutable. Tout se lit par stat, et le résultat est mis en cache tant
+que l'exécutable et les dossiers site-packages n'ont pas changé (installer,
+mettre à jour ou désinstaller une distribution modifie le dossier).
+
+L'instantané du dernier build réussi est enregistré dans le dossier de travail,
+par profil, pour lister les distributions ajoutées, retirées, mises à jour ou
+réinstallées depuis le dernier build du profil. Celui du dernier build du
+dossier, quel que soit le profil, décide de la réutilisation de l'analyse.
+"""
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from src.backends import BuildConfig
+from src.services import interpreters
+
+SNAPSHOT_NAME = "last_env.json"
+METADATA_SUFFIXES = (".dist-info", ".egg-info")
+
+
+def cache_path() -> Path:
+    return interpreters.cache_root() / "env_fingerprints.json"
+
+
+def _stat(path: str) -> List[int]:
+    try:
+        st = os.stat(path)
+        return [st.st_size, st.st_mtime_ns]
+    except OSError:
+        return [0, 0]
+
+
+def site_dirs(python_exe: str) -> List[str]:
+    info = interpreters.describe(python_exe)
+    # site-packages utilisateur en premier, comme sur sys.path : sa version d'une distribution l'emporte
+    dirs = [d for d in dict.fromkeys((info.usersite, info.purelib, info.platlib)) if d and os.path.isdir(d)]
+    return dirs
+
+
+def _dist_entry(site_dir: str, name: str) -> Optional[List]:
+    """[nom normalisé, version, mtime du RECORD] d'un dossier .dist-info / .egg-info."""
+    stem, _dot, _suffix = name.rpartition(".")
+    dist, _sep, version = stem.partition("-")
+    record = os.path.join(site_dir, name, "RECORD")
+    mtime = _stat(record if os.path.isfile(record) else os.path.join(site_dir, name))[1]
+    return [re.sub(r"[-_.]+", "_", dist).lower(), version.split("-")[0], mtime]
+
+
+def snapshot(python_exe: str, use_cache: bool = True) -> dict:
+    """{"fingerprint", "interpreter": [taille, mtime], "dists": {nom: [version, mtime RECORD]}}."""
+    exe = os.path.realpath(python_exe)
+    dirs = site_dirs(python_exe)
+    stamp = [_stat(exe)] + [[d, _stat(d)[1]] for d in dirs]
+    try:
+        cache = json.loads(cache_path().read_text(encoding="utf-8")) if use_cache else {}
+    except (OSError, ValueError):
+        cache = {}
+    entry = cache.get(python_exe)
+    if entry and entry["stamp"] == stamp:
+        return entry["snapshot"]
+    h = hashlib.sha256(json.dumps(stamp[0]).encode("utf-8"))
+    dists: Dict[str, List] = {}
+    for site_dir in dirs:
+        names = sorted(os.listdir(site_dir))
+        h.update("\0".join([site_dir] + names).encode("utf-8"))
+        for name in names:
+            if name.endswith(METADATA_SUFFIXES):
+                key, version, mtime = _dist_entry(site_dir, name)
+                dists.setdefault(key, [version, mtime])
+                h.update(f"{name}:{mtime}".encode("utf-8"))
+    result = {"fingerprint": h.hexdigest(), "interpreter": stamp[0], "dists": dists}
+    if use_cache:
+        cache[python_exe] = {"stamp": stamp, "snapshot": result}
+        cache_path().parent.mkdir(parents=True, exist_ok=True)
+        cache_path().write_text(json.dumps(cache), encoding="utf-8")
+    return result
+
+
+def diff(previous: Optional[dict], current: dict) -> List[str]:
+    """Changements d'environnement, une ligne par distribution (vide si identique)."""
+    if previous is None or previous.get("fingerprint") == current["fingerprint"]:
+        return []
+    lines = []
+    if previous.get("interpreter") != current["interpreter"]:
+        lines.append("~ interpréteur modifié (exécutable remplacé ou mis à jour)")
+    before, after = previous.get("dists", {}), current["dists"]
+    for name in sorted(set(before) | set(after)):
+        if name not in before:
+            lines.append(f"+ {name} {after[name][0]}")
+        elif name not in after:
+            lines.append(f"- {name} {before[name][0]}")
+        elif before[name][0] != after[name][0]:
+            lines.append(f"~ {name} {before[name][0]} -> {after[name][0]}")
+        elif before[name][1] != after[name][1]:
+            lines.append(f"~ {name} {after[name][0]} (réinstallé)")
+    return lines or ["~ contenu de site-packages modifié (fichiers hors distributions)"]
+
+
+def snapshot_path(cfg: BuildConfig) -> Path:
+    return Path(cfg.work_dir()) / SNAPSHOT_NAME
+
+
+def _load(cfg: BuildConfig) -> dict:
+    """{"last": instantané du dernier build du dossier, "profiles": {profil: instantané}}."""
+    try:
+        data = json.loads(snapshot_path(cfg).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {"last": None, "profiles": {}}
+    if "fingerprint" in data:  # ancien format : un seul instantané, sans profil
+        return {"last": data, "profiles": {}}
+    return {"last": data.get("last"), "profiles": data.get("profiles", {})}
+
+
+def load_previous(cfg: BuildConfig, profile: Optional[str] = None) -> Optional[dict]:
+    """Instantané du dernier build réussi du profil (du dossier de travail si `profile` est None)."""
+    data = _load(cfg)
+    return data["last"] if profile is None else data["profiles"].get(profile)
+
+
+def save(cfg: BuildConfig, current: Optional[dict] = None, profile: str = ""):
+    data = _load(cfg)
+    current = current or snapshot(cfg.python_exe)
+    data["last"] = current
+    data["profiles"][profile] = current
+    path = snapshot_path(cfg)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+
+
+def changes_since_last_build(cfg: BuildConfig, profile: str = "") -> Tuple[List[str], bool]:
+    """(changements depuis le dernier build du profil, analyse du dossier invalidée).
+
+    Sans build précédent du profil, les changements sont ceux depuis le dernier
+    build du dossier de travail.
+    """
+    current = snapshot(cfg.python_exe)
+    data = _load(cfg)
+    previous = data["profiles"].get(profile, data["last"])
+    return diff(previous, current), bool(diff(data["last"], current))
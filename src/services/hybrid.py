@@ -0,0 +1,43 @@
+# src/services/hybrid.py
+"""
+Backend hybride : les modules chauds du projet sont compilés en extensions par
+Nuitka (src/runtime/hybrid_compile.py), le reste est figé en bytecode par
+PyInstaller. Le .spec généré remplace le bytecode de ces modules par leur
+extension ; l'Analysis voit toujours leur source, donc leurs imports.
+"""
+import json
+from pathlib import Path
+from typing import List
+
+PROFILE_TIMEOUT = 120  # secondes : au-delà, le scénario est jugé sans fin (boucle d'événements d'une GUI)
+
+
+def resolve_modules(names: List[str], project_dir: str) -> List[list]:
+    """[module, chemin source] pour les modules nommés du projet (fichiers .py, pas les paquets)."""
+    resolved = []
+    for name in names:
+        path = Path(project_dir, *name.split(".")).with_suffix(".py")
+        if not path.is_file():
+            raise FileNotFoundError(f"Module introuvable dans le projet: {name} ({path})")
+        resolved.append([name, str(path)])
+    return resolved
+
+
+def write_modules(names: List[str], project_dir: str, dest: str) -> List[list]:
+    modules = resolve_modules(names, project_dir)
+    Path(dest).parent.mkdir(parents=True, exist_ok=True)
+    Path(dest).write_text(json.dumps(modules), encoding="utf-8")
+    return modules
+
+
+def spec_block(manifest: str) -> str:
+    """Code du .spec : retire les modules compilés du PYZ et ajoute leurs extensions."""
+    return (
+        "# Modules compilés par Nuitka : l'extension remplace le bytecode\n"
+        "import json as _pypack_json, os as _pypack_os\n"
+        f"with open({manifest!r}, encoding='utf-8') as _pypack_f:\n"
+        "    _pypack_hot = dict(_pypack_json.load(_pypack_f))\n"
+        "a.pure = [e for e in a.pure if e[0] not in _pypack_hot]\n"
+        "a.binaries += [(_pypack_os.path.join(*m.split('.')[:-1], _pypack_os.path.basename(p)), p, 'EXTENSION')\n"
+        "               for m, p in sorted(_pypack_hot.items())]"
+    )
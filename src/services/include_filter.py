@@ -0,0 +1,113 @@
+# src/services/include_filter.py
+"""
+Règles d'inclusion des dossiers inclus : motifs glob par dossier, une règle
+par ligne ; `!motif` exclut, les autres motifs limitent l'inclusion aux
+fichiers correspondants (tout est inclus s'il n'y en a pas).
+
+Un motif sans « / » porte sur le nom du fichier ou du dossier, à toute
+profondeur ; avec « / », sur le chemin relatif au dossier inclus. Un dossier
+exclu n'est pas parcouru. Les motifs sont compilés en une seule expression
+régulière par type de règle, évaluée pendant un parcours os.scandir parallèle.
+"""
+import fnmatch
+import os
+import re
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Suggestion affichée dans l'interface
+DEFAULT_RULES = ["!__pycache__", "!.git", "!.svn", "!.hg", "!.idea", "!.vscode", "!tests",
+                 "!*.pyc", "!*~", "!*.swp", "!.DS_Store", "!Thumbs.db"]
+WALK_WORKERS = min(16, (os.cpu_count() or 1) * 2)  # parcours limité par les E/S
+
+
+def _compile(patterns: List[str]) -> Tuple[Optional[re.Pattern], Optional[re.Pattern]]:
+    """(expression sur le nom, expression sur le chemin relatif)."""
+    names = [fnmatch.translate(p) for p in patterns if "/" not in p]
+    paths = [fnmatch.translate(p.strip("/")) for p in patterns if "/" in p]
+    return (re.compile("|".join(names)) if names else None,
+            re.compile("|".join(paths)) if paths else None)
+
+
+class RuleMatcher:
+    """Règles d'un dossier compilées ; chemins relatifs au format posix."""
+
+    def __init__(self, rules: Iterable[str]):
+        rules = [r.strip() for r in rules if r.strip() and not r.strip().startswith("#")]
+        self.has_includes = any(not r.startswith("!") for r in rules)
+        self._exclude = _compile([r[1:] for r in rules if r.startswith("!")])
+        self._include = _compile([r for r in rules if not r.startswith("!")])
+
+    @staticmethod
+    def _match(compiled, name: str, rel: str) -> bool:
+        by_name, by_path = compiled
+        return bool((by_name and by_name.match(name)) or (by_path and by_path.match(rel)))
+
+    def excluded(self, name: str, rel: str) -> bool:
+        return self._match(self._exclude, name, rel)
+
+    def accepts_file(self, name: str, rel: str) -> bool:
+        if self.excluded(name, rel):
+            return False
+        return not self.has_includes or self._match(self._include, name, rel)
+
+
+def _scan(root: str, rel: str, matcher: RuleMatcher) -> Tuple[List[Tuple[str, int]], List[str]]:
+    files, subdirs = [], []
+    with os.scandir(os.path.join(root, rel) if rel else root) as it:
+        for entry in it:
+            child = f"{rel}/{entry.name}" if rel else entry.name
+            if matcher.excluded(entry.name, child):
+                continue
+            if entry.is_dir():
+                subdirs.append(child)
+            elif entry.is_file() and matcher.accepts_file(entry.name, child):
+                files.append((child, entry.stat().st_size))
+    return files, subdirs
+
+
+def walk(root: str, rules: Iterable[str] = ()) -> List[Tuple[str, int]]:
+    """(chemin relatif, taille) des fichiers retenus sous `root`, triés."""
+    matcher = RuleMatcher(rules)
+    found = []
+    with ThreadPoolExecutor(max_workers=WALK_WORKERS) as pool:
+        pending = {pool.submit(_scan, root, "", matcher)}
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                files, subdirs = future.result()
+                found.extend(files)
+                pending |= {pool.submit(_scan, root, d, matcher) for d in subdirs}
+    return sorted(found)
+
+
+def filter_key(directory: str) -> str:
+    """Clé d'un dossier dans les règles : chemin réel (casse normalisée sous Windows)."""
+    return os.path.normcase(os.path.realpath(os.path.expanduser(directory)))
+
+
+def rules_for(filters: Dict[str, List[str]], directory: str) -> List[str]:
+    return filters.get(filter_key(directory), [])
+
+
+def normalized_filters(filters: Dict[str, List[str]]) -> Dict[str, List[str]]:
+    """Clés normalisées (filter_key) ; les dossiers sans règle sont retirés."""
+    out = {}
+    for directory, rules in filters.items():
+        rules = [r.strip() for r in rules if r.strip()]
+        if directory and rules:
+            out[filter_key(directory)] = rules
+    return out
+
+
+def preview(items: Iterable[str], filters: Dict[str, List[str]]) -> Tuple[int, int]:
+    """(nombre de fichiers, octets) retenus pour les fichiers et dossiers inclus."""
+    filters = normalized_filters(filters)
+    count = total = 0
+    for item in items:
+        if os.path.isfile(item):
+            count, total = count + 1, total + os.path.getsize(item)
+        elif os.path.isdir(item):
+            files = walk(item, rules_for(filters, item))
+            count, total = count + len(files), total + sum(size for _, size in files)
+    return count, total
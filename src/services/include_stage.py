@@ -0,0 +1,86 @@
+# src/services/include_stage.py
+"""
+Arborescence d'inclusion préparée : les données ajoutées (add_data), fichiers
+et dossiers inclus sont résolus en un seul ensemble dédoublonné
+{destination dans le paquet: source canonique}, matérialisé par des liens
+physiques (copie si impossible) reproduisant la disposition du paquet. Le
+backend reçoit alors un seul dossier au lieu d'un argument par entrée.
+
+Destinations : celles de --add-data (SRC:DEST, DEST étant un dossier) ; un
+fichier inclus va à la racine, un dossier inclus sous son propre nom, filtré
+par ses règles (src/services/include_filter.py).
+"""
+import os
+import shutil
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from src.services import include_filter, resource_pack
+
+
+def resolve(add_data: Iterable[Tuple[str, str]], files: Iterable[str], dirs: Iterable[str],
+            filters: Optional[Dict[str, List[str]]] = None) -> Tuple[Dict[str, str], int]:
+    """Retourne ({destination: source}, nombre de doublons écartés).
+
+    Une même destination n'est retenue qu'une fois (la dernière déclarée l'emporte,
+    comme pour --add-data) ; les sources sont résolues (liens symboliques compris).
+    """
+    entries: List[Tuple[str, str]] = []
+    for src, dst in add_data:
+        if not src:
+            continue
+        src_p = Path(src).expanduser().resolve()
+        base = Path(dst or ".")
+        if src_p.is_file():
+            entries.append(((base / src_p.name).as_posix(), str(src_p)))
+        elif src_p.is_dir():
+            entries.extend(((base / rel).as_posix(), str(src_p / rel)) for rel, _size in include_filter.walk(str(src_p)))
+    entries.extend(resource_pack.collect_entries(files, dirs, filters))
+    mapping: Dict[str, str] = {}
+    for dest, src in entries:
+        mapping[os.path.normpath(dest).replace(os.sep, "/")] = os.path.realpath(src)
+    return mapping, len(entries) - len(mapping)
+
+
+def _up_to_date(src: str, dest: Path) -> bool:
+    try:
+        s, d = os.stat(src), dest.stat()
+    except OSError:
+        return False
+    if (s.st_dev, s.st_ino) == (d.st_dev, d.st_ino):
+        return True
+    # copie d'un précédent passage (liens impossibles entre volumes)
+    return s.st_size == d.st_size and s.st_mtime_ns == d.st_mtime_ns
+
+
+def materialize(mapping: Dict[str, str], stage_dir: str) -> Tuple[int, int, int, int]:
+    """Met l'arborescence `stage_dir` en conformité avec `mapping`.
+
+    Retourne (fichiers créés, fichiers réutilisés, fichiers retirés, octets).
+    """
+    root = Path(stage_dir)
+    root.mkdir(parents=True, exist_ok=True)
+    removed = 0
+    for rel, _size in include_filter.walk(str(root)):
+        if rel not in mapping:
+            (root / rel).unlink()
+            removed += 1
+    for dirpath, dirnames, filenames in os.walk(root, topdown=False):
+        if dirpath != str(root) and not filenames and not any((Path(dirpath) / d).exists() for d in dirnames):
+            os.rmdir(dirpath)
+    created = reused = total = 0
+    for rel, src in mapping.items():
+        dest = root / rel
+        total += os.path.getsize(src)
+        if _up_to_date(src, dest):
+            reused += 1
+            continue
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        if dest.exists():
+            dest.unlink()
+        try:
+            os.link(src, dest)
+        except OSError:
+            shutil.copy2(src, dest)
+        created += 1
+    return created, reused, removed, total
@@ -0,0 +1,239 @@
+# src/services/interpreters.py
+"""
+Découverte des interpréteurs Python : environnements du projet, conda, pyenv
+et PATH. Chaque interpréteur est sondé (src/runtime/interpreter_probe.py)
+en parallèle ; le résultat est mis en cache par chemin, date de modification
+de l'exécutable et de ses site-packages (dont celui de l'utilisateur), si bien
+qu'un démarrage ultérieur ne lance aucun sous-processus tant que rien n'a
+changé.
+"""
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+RUNTIME_DIR = Path(__file__).resolve().parent.parent / "runtime"
+PROBE_TIMEOUT = 20
+PROBE_VERSION = 2  # à incrémenter quand la sonde renvoie de nouveaux champs : invalide le cache
+PROBE_WORKERS = 8
+CONDA_ROOTS = ("miniconda3", "miniconda", "anaconda3", "miniforge3", "mambaforge")
+PATH_NAMES = ["python3", "python"] + [f"python3.{minor}" for minor in range(6, 16)]
+VENV_BIN = "Scripts" if os.name == 'nt' else "bin"
+PYTHON_NAME = "python.exe" if os.name == 'nt' else "python"
+
+
+@dataclass
+class Interpreter:
+    path: str
+    source: str  # "projet", "conda", "pyenv", "PATH" ou "courant"
+    version: str = ""
+    implementation: str = ""
+    bits: int = 0
+    machine: str = ""
+    prefix: str = ""
+    purelib: str = ""
+    platlib: str = ""
+    usersite: str = ""
+    pyinstaller: str = ""
+    nuitka: str = ""
+    error: str = ""
+
+    @property
+    def valid(self) -> bool:
+        return bool(self.version) and not self.error
+
+    def label(self) -> str:
+        if not self.valid:
+            return f"{self.path} (invalide : {self.error or 'sonde sans résultat'})"
+        return f"Python {self.version} {self.bits} bits [{self.source}] — {self.path}"
+
+
+def cache_root() -> Path:
+    """Cache utilisateur de PyPack Studio, partagé entre projets."""
+    base = os.environ.get("LOCALAPPDATA") if os.name == 'nt' else os.environ.get("XDG_CACHE_HOME")
+    return Path(base or Path.home() / ".cache") / "pypack_studio"
+
+
+def default_cache_path() -> Path:
+    return cache_root() / "interpreters.json"
+
+
+def _env_python(env_dir: Path) -> Optional[Path]:
+    for candidate in (env_dir / VENV_BIN / PYTHON_NAME, env_dir / PYTHON_NAME):
+        if candidate.is_file():
+            return candidate
+    return None
+
+
+def interpreter_key(path: str) -> str:
+    """Clé d'identité : python3 -> python3.11 ou /bin -> /usr/bin sont le même interpréteur,
+    mais pas le python d'un venv, lien vers l'interpréteur de base dans un autre dossier."""
+    return os.path.normcase(os.path.join(os.path.realpath(os.path.dirname(os.path.abspath(path))),
+                                         os.path.basename(os.path.realpath(path))))
+
+
+def _conda_envs() -> List[Path]:
+    roots = []
+    for var in ("CONDA_PREFIX", "CONDA_EXE"):
+        value = os.environ.get(var)
+        if value:
+            path = Path(value)
+            roots.append(path.parent.parent if var == "CONDA_EXE" else path)
+    roots += [Path.home() / name for name in CONDA_ROOTS]
+    envs = []
+    for root in roots:
+        envs.append(root)
+        if (root / "envs").is_dir():
+            envs.extend(sorted(p for p in (root / "envs").iterdir() if p.is_dir()))
+    listing = Path.home() / ".conda" / "environments.txt"
+    if listing.is_file():
+        envs.extend(Path(line.strip()) for line in listing.read_text(encoding="utf-8").splitlines() if line.strip())
+    return envs
+
+
+def candidates(project_dir: str = "") -> List[Tuple[str, str]]:
+    """(chemin, source) des interpréteurs trouvés, sans doublon, dans l'ordre de préférence."""
+    found: List[Tuple[Path, str]] = []
+    if project_dir and Path(project_dir).is_dir():
+        # environnements virtuels du projet : tout dossier direct contenant pyvenv.cfg
+        for child in sorted(Path(project_dir).iterdir()):
+            if child.is_dir() and (child / "pyvenv.cfg").is_file():
+                python = _env_python(child)
+                if python:
+                    found.append((python, "projet"))
+    found.append((Path(sys.executable), "courant"))
+    for env in _conda_envs():
+        python = _env_python(env)
+        if python:
+            found.append((python, "conda"))
+    pyenv_root = Path(os.environ.get("PYENV_ROOT") or Path.home() / ".pyenv")
+    if (pyenv_root / "versions").is_dir():
+        for version in sorted((pyenv_root / "versions").iterdir()):
+            python = _env_python(version)
+            if python:
+                found.append((python, "pyenv"))
+    for directory in os.environ.get("PATH", "").split(os.pathsep):
+        if not directory or "shims" in Path(directory).parts:  # les shims pyenv dépendent du dossier courant
+            continue
+        for name in PATH_NAMES:
+            python = shutil.which(name, path=directory)
+            if python:
+                found.append((Path(python), "PATH"))
+    out, seen = [], set()
+    for path, source in found:
+        key = interpreter_key(str(path))
+        if key not in seen:
+            seen.add(key)
+            out.append((str(Path(path).absolute()), source))
+    return out
+
+
+def _stamp(path: str) -> List[int]:
+    try:
+        return [os.stat(path).st_mtime_ns]
+    except OSError:
+        return [0]
+
+
+class InterpreterCache:
+    """Sondes mémorisées : {chemin: {"stamp": [...], "info": {...}}}."""
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = Path(path or default_cache_path())
+        try:
+            self.entries: Dict[str, dict] = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            self.entries = {}
+
+    @staticmethod
+    def stamp(path: str, info: dict) -> List[int]:
+        # l'installation d'un paquet modifie site-packages (ou celui de l'utilisateur), pas l'exécutable
+        dirs = [info.get(key, "") for key in ("purelib", "usersite")]
+        return [PROBE_VERSION] + _stamp(path) + [t for d in dirs if d for t in _stamp(d)]
+
+    def get(self, path: str) -> Optional[dict]:
+        entry = self.entries.get(path)
+        if entry and entry["stamp"] == self.stamp(path, entry["info"]):
+            return entry["info"]
+        return None
+
+    def put(self, path: str, info: dict):
+        self.entries[path] = {"stamp": self.stamp(path, info), "info": info}
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps(self.entries, indent=1), encoding="utf-8")
+
+
+def _run_probe(path: str) -> dict:
+    try:
+        # sans -s : un outil installé avec `pip install --user` doit être vu comme au build
+        proc = subprocess.run([path, "-E", str(RUNTIME_DIR / "interpreter_probe.py")],
+                              capture_output=True, text=True, timeout=PROBE_TIMEOUT)
+        if proc.returncode != 0:
+            return {"error": (proc.stderr.strip().splitlines() or [f"code {proc.returncode}"])[-1]}
+        return json.loads(proc.stdout)
+    except (OSError, ValueError, subprocess.SubprocessError) as e:
+        return {"error": str(e)}
+
+
+def probe(paths: List[Tuple[str, str]], cache: Optional[InterpreterCache] = None) -> List[Interpreter]:
+    """Interpréteurs sondés en parallèle ; seuls ceux absents du cache ou modifiés lancent un sous-processus."""
+    cache = cache or InterpreterCache()
+    infos = {path: cache.get(path) for path, _source in paths}
+    missing = [path for path, info in infos.items() if info is None]
+    if missing:
+        with ThreadPoolExecutor(max_workers=min(PROBE_WORKERS, len(missing))) as pool:
+            for path, info in zip(missing, pool.map(_run_probe, missing)):
+                infos[path] = info
+                if not info.get("error"):
+                    cache.put(path, info)
+        cache.save()
+    fields = set(Interpreter.__dataclass_fields__)
+    return [Interpreter(path=path, source=source, **{k: v for k, v in infos[path].items() if k in fields})
+            for path, source in paths]
+
+
+def discover(project_dir: str = "", cache: Optional[InterpreterCache] = None) -> List[Interpreter]:
+    return probe(candidates(project_dir), cache)
+
+
+def describe(path: str, cache: Optional[InterpreterCache] = None) -> Interpreter:
+    """Un interpréteur choisi à la main, sondé (ou lu dans le cache)."""
+    if not path or not Path(path).is_file():
+        return Interpreter(path=path, source="manuel", error="fichier introuvable")
+    return probe([(str(Path(path).absolute()), "manuel")], cache)[0]
+
+
+def ccache_version(cache: Optional[InterpreterCache] = None) -> str:
+    """Version de ccache trouvé dans le PATH (vide s'il est absent), mise en cache comme les interpréteurs."""
+    exe = shutil.which("ccache")
+    if not exe:
+        return ""
+    cache = cache or InterpreterCache()
+    info = cache.get(exe)
+    if info is None:
+        try:
+            out = subprocess.run([exe, "--version"], capture_output=True, text=True, timeout=PROBE_TIMEOUT).stdout
+        except (OSError, subprocess.SubprocessError):
+            out = ""
+        match = re.search(r"(\d+\.\d+(?:\.\d+)?)", out)
+        info = {"version": match.group(1) if match else ""}
+        cache.put(exe, info)
+        cache.save()
+    return info["version"]
+
+
+
+BACKEND_TOOLS = {"pyinstaller": ("pyinstaller",), "nuitka": ("nuitka",), "hybrid": ("pyinstaller", "nuitka")}
+
+
+def missing_tools(interpreter: Interpreter, backend: str) -> List[str]:
+    """Outils requis par `backend` absents de l'interpréteur."""
+    return [tool for tool in BACKEND_TOOLS.get(backend, ()) if not getattr(interpreter, tool)]
@@ -0,0 +1,138 @@
+# src/services/lazy_imports.py
+"""
+Imports différés : génération du hook LazyLoader, suggestion des modules lourds
+à partir d'un profil `-X importtime` et vérification du démarrage.
+"""
+import os
+import re
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Set, Tuple
+
+RUNTIME_DIR = Path(__file__).resolve().parent.parent / "runtime"
+HOOK_TEMPLATE = RUNTIME_DIR / "lazy_import_hook.py"
+
+# Exécute le niveau module du script sans lancer son bloc __main__
+PROBE_CODE = (
+    "import runpy, sys; sys.argv = [{entry!r}]; sys.path.insert(0, {root!r}); "
+    "runpy.run_path({entry!r}, run_name={run_name!r})"
+)
+# Modules de la bibliothèque standard de l'interpréteur cible (liste du dossier stdlib avant 3.10)
+STDLIB_CODE = (
+    "import os, sys, sysconfig; names = set(getattr(sys, 'stdlib_module_names', ())) or "
+    "{n.split('.')[0] for n in os.listdir(sysconfig.get_paths()['stdlib'])} | set(sys.builtin_module_names); "
+    "print('\\n'.join(sorted(names)))"
+)
+EXTENSION_SUFFIXES = (".py", ".pyw", ".so", ".pyd")
+IMPORTTIME_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s+)(\S+)")
+
+
+@dataclass
+class LazyVerification:
+    ok: bool
+    baseline_s: float = 0.0
+    lazy_s: float = 0.0
+    message: str = ""
+
+
+def write_hook(modules: List[str], dest: str) -> str:
+    """Génère le hook d'exécution pour la liste de modules donnée."""
+    text = HOOK_TEMPLATE.read_text(encoding="utf-8")
+    text = text.replace("LAZY_MODULES = frozenset()", f"LAZY_MODULES = frozenset({sorted(set(modules))!r})", 1)
+    Path(dest).parent.mkdir(parents=True, exist_ok=True)
+    Path(dest).write_text(text, encoding="utf-8")
+    return dest
+
+
+def _probe_cmd(python_exe: str, entry_script: str, hook: str = "", run_name: str = "__pypack_probe__") -> List[str]:
+    code = PROBE_CODE.format(entry=entry_script, root=str(Path(entry_script).parent), run_name=run_name)
+    if hook:
+        code = f"exec(compile(open({hook!r}, encoding='utf-8').read(), {hook!r}, 'exec')); " + code
+    return [python_exe, "-c", code]
+
+
+def _probe_env() -> dict:
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")  # pas de fenêtre pendant les mesures
+    return env
+
+
+def stdlib_modules(python_exe: str, timeout: float = 30) -> Set[str]:
+    """Modules de premier niveau de la bibliothèque standard de l'interpréteur cible."""
+    proc = subprocess.run([python_exe, "-c", STDLIB_CODE], capture_output=True, text=True, timeout=timeout)
+    if proc.returncode != 0:
+        # interpréteur cible inutilisable : à défaut, la bibliothèque standard du studio
+        return set(getattr(sys, "stdlib_module_names", ()))
+    return set(proc.stdout.split())
+
+
+def is_project_module(name: str, roots: List[str]) -> bool:
+    """Module ou paquet du projet : il sera embarqué avec le code, pas à différer comme une dépendance."""
+    for root in filter(None, roots):
+        base = Path(root)
+        if (base / name).is_dir() or any(p.suffix in EXTENSION_SUFFIXES for p in base.glob(f"{name}.*")):
+            return True
+    return False
+
+
+def profile_imports(python_exe: str, entry_script: str, project_dir: str = "", timeout: float = 60,
+                    min_ms: float = 20.0) -> List[Tuple[str, float]]:
+    """Retourne les paquets tiers de premier niveau les plus coûteux à importer (nom, ms)."""
+    cmd = [python_exe, "-X", "importtime"] + _probe_cmd(python_exe, entry_script)[1:]
+    proc = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout,
+                          cwd=str(Path(entry_script).parent), env=_probe_env())
+    stdlib = stdlib_modules(python_exe)
+    roots = [str(Path(entry_script).parent), project_dir]
+    costs = {}
+    for line in proc.stderr.splitlines():
+        m = IMPORTTIME_RE.match(line)
+        if not m:
+            continue
+        cumulative_us, indent, name = int(m.group(2)), m.group(3), m.group(4)
+        top = name.split(".")[0]
+        # Seuls les imports de premier niveau comptent (les imbriqués sont dans leur cumul)
+        if len(indent) > 1 or top in stdlib or top.startswith("_"):
+            continue
+        costs[top] = costs.get(top, 0.0) + cumulative_us / 1000.0
+    return sorted(((n, ms) for n, ms in costs.items() if ms >= min_ms and not is_project_module(n, roots)),
+                  key=lambda x: -x[1])
+
+
+def _best_time(cmd: List[str], cwd: str, runs: int, timeout: float) -> Tuple[float, subprocess.CompletedProcess]:
+    best, proc = float("inf"), None
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        proc = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout, cwd=cwd, env=_probe_env())
+        best = min(best, time.perf_counter() - t0)
+        if proc.returncode != 0:
+            break
+    return best, proc
+
+
+def verify(python_exe: str, entry_script: str, hook: str, runs: int = 3,
+           start_timeout: float = 5.0) -> LazyVerification:
+    """Compare le démarrage à froid avec/sans hook et vérifie que l'application démarre."""
+    cwd = str(Path(entry_script).parent)
+    baseline, proc = _best_time(_probe_cmd(python_exe, entry_script), cwd, runs, 120)
+    if proc.returncode != 0:
+        return LazyVerification(False, message=f"Le script échoue sans hook:\n{proc.stderr[-2000:]}")
+    lazy, proc = _best_time(_probe_cmd(python_exe, entry_script, hook), cwd, runs, 120)
+    if proc.returncode != 0:
+        return LazyVerification(False, baseline, message=f"Le script échoue avec le hook:\n{proc.stderr[-2000:]}")
+    # Démarrage complet : l'application doit tourner (ou finir proprement) pendant start_timeout
+    full = subprocess.Popen(
+        _probe_cmd(python_exe, entry_script, hook, run_name="__main__"), cwd=cwd, env=_probe_env(),
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    try:
+        _out, err = full.communicate(timeout=start_timeout)
+        if full.returncode != 0:
+            return LazyVerification(False, baseline, lazy, f"L'application s'arrête avec le code {full.returncode}:\n{err[-2000:]}")
+    except subprocess.TimeoutExpired:
+        full.kill()
+        full.communicate()
+    delta = (lazy - baseline) / baseline * 100 if baseline else 0.0
+    return LazyVerification(True, baseline, lazy,
+                            f"Démarrage à froid: {baseline * 1000:.0f} ms -> {lazy * 1000:.0f} ms ({delta:+.0f}%)")
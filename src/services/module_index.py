@@ -0,0 +1,99 @@
+# src/services/module_index.py
+"""
+Index des modules embarqués : construit après le build à partir du dossier de
+l'application, lu au démarrage par src/runtime/module_index_hook.py.
+"""
+import json
+import marshal
+import os
+import subprocess
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Tuple
+
+RUNTIME_DIR = Path(__file__).resolve().parent.parent / "runtime"
+HOOK_TEMPLATE = RUNTIME_DIR / "module_index_hook.py"
+INDEX_NAME = "pypack_modules.idx"
+MODULE_SUFFIXES = (".py", ".pyc", ".pyd", ".so")
+# Dossiers d'extensions de la bibliothèque standard, importées comme modules de premier niveau
+DYNLOAD_GLOBS = ("lib-dynload", "*/lib-dynload")
+
+
+def _module_name(rel_parts: Tuple[str, ...]) -> str:
+    """Nom pointé d'un fichier module (« pkg/mod.cpython-311-x86_64-linux-gnu.so » -> « pkg.mod »)."""
+    stem = rel_parts[-1].split(".", 1)[0]
+    parts = list(rel_parts[:-1]) + ([] if stem == "__init__" else [stem])
+    if not parts or not all(p.isidentifier() for p in parts):
+        return ""
+    return ".".join(parts)
+
+
+def build_index(bundle_dir: str) -> Dict[str, Tuple[str, bool]]:
+    """Recense les modules présents sur disque : nom -> (chemin relatif, paquet)."""
+    base = Path(bundle_dir)
+    index: Dict[str, Tuple[str, bool]] = {}
+    dynload = [p for pattern in DYNLOAD_GLOBS for p in base.glob(pattern) if p.is_dir()]
+    for root in [base] + dynload:
+        for dirpath, dirnames, filenames in os.walk(root):
+            rel_dir = Path(dirpath).relative_to(root)
+            # lib-dynload est parcouru séparément, comme racine de modules
+            dirnames[:] = [d for d in dirnames if Path(dirpath) / d not in dynload]
+            for fn in filenames:
+                if not fn.endswith(MODULE_SUFFIXES):
+                    continue
+                name = _module_name(rel_dir.parts + (fn,))
+                if not name:
+                    continue
+                rel = (Path(dirpath) / fn).relative_to(base).as_posix()
+                is_pkg = fn.split(".", 1)[0] == "__init__"
+                # Les modules compilés priment sur les sources en cas de doublon
+                if name not in index or not index[name][0].endswith((".pyd", ".so")):
+                    index[name] = (rel, is_pkg)
+    return dict(sorted(index.items()))
+
+
+def write_hook(dest: str) -> str:
+    Path(dest).parent.mkdir(parents=True, exist_ok=True)
+    Path(dest).write_text(HOOK_TEMPLATE.read_text(encoding="utf-8"), encoding="utf-8")
+    return dest
+
+
+def write_index(bundle_dir: str) -> Tuple[str, int]:
+    index = build_index(bundle_dir)
+    dest = Path(bundle_dir) / INDEX_NAME
+    with open(dest, "wb") as f:
+        marshal.dump(index, f)
+    return str(dest), len(index)
+
+
+def _bench_once(exe: str, use_index: bool, timeout: float) -> dict:
+    fd, out = tempfile.mkstemp(suffix=".json")
+    os.close(fd)
+    env = dict(os.environ, PYPACK_IMPORT_BENCH=out, PYPACK_MODULE_INDEX="1" if use_index else "0")
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    try:
+        t0 = time.perf_counter()
+        subprocess.run([exe], env=env, timeout=timeout, capture_output=True)
+        wall = time.perf_counter() - t0
+        with open(out, encoding="utf-8") as f:
+            result = json.load(f)
+        result["wall"] = wall
+        return result
+    finally:
+        os.unlink(out)
+
+
+def benchmark(exe: str, runs: int = 3, timeout: float = 120) -> Dict[str, dict]:
+    """Importe tous les modules indexés avec et sans le finder (meilleur de `runs`)."""
+    if not Path(exe).exists():
+        raise FileNotFoundError(exe)
+    results = {}
+    for label, use_index in (("sans index", False), ("avec index", True)):
+        best = None
+        for _ in range(runs):
+            r = _bench_once(exe, use_index, timeout)
+            if best is None or r["seconds"] < best["seconds"]:
+                best = r
+        results[label] = best
+    return results
@@ -0,0 +1,46 @@
+# src/services/multi_exe.py
+"""
+Plusieurs exécutables pour un même projet : une seule analyse des dépendances
+et un dossier d'exécution commun.
+
+PyInstaller : l'Analysis porte sur tous les scripts d'entrée ; le .spec généré
+crée un EXE par script et un seul COLLECT, donc un seul `_internal`
+(voir pyi_spec.targets_block). Nuitka : mode multidist (`--main`
+répété), un binaire qui choisit le script d'après son nom d'invocation ; les
+autres exécutables en sont des liens.
+"""
+import os
+import shutil
+from pathlib import Path
+from typing import List
+
+
+def entry_name(script: str) -> str:
+    return Path(script).stem
+
+
+def check_names(reserved: List[str], scripts: List[str]) -> str:
+    """Message d'erreur si un exécutable reprend un nom réservé ou celui d'un autre, sinon ""."""
+    seen = {os.path.normcase(n) for n in reserved}
+    for script in scripts:
+        name = os.path.normcase(entry_name(script))
+        if name in seen:
+            return f"Nom d'exécutable en double: {entry_name(script)} ({script})"
+        seen.add(name)
+    return ""
+
+
+def link_executables(binary: str, names: List[str]) -> List[str]:
+    """Crée à côté de `binary` un lien (ou une copie) par nom ; retourne les chemins créés."""
+    src = Path(binary)
+    created = []
+    for name in names:
+        dest = src.with_name(name + src.suffix)
+        if dest.exists():
+            dest.unlink()
+        try:
+            os.link(src, dest)
+        except OSError:
+            shutil.copy2(src, dest)
+        created.append(str(dest))
+    return created
@@ -0,0 +1,60 @@
+# src/services/onefile_cache.py
+"""
+Mode « onefile en cache » (Nuitka) : un seul fichier livré, extrait une seule fois.
+
+Le chargeur onefile de Nuitka, natif, extrait l'application dans un dossier fixe
+du cache utilisateur puis, aux lancements suivants, ne réécrit que les fichiers
+dont le CRC diffère. Le dossier est nommé d'après l'empreinte des entrées du
+build (sources, commande, environnement) : deux builds différents ne partagent
+rien, et un hook d'exécution supprime les anciennes versions au démarrage.
+
+PyInstaller n'a pas d'équivalent : son onefile décompresse tout à chaque
+lancement, et un lanceur lui-même onefile ne ferait qu'ajouter ce coût.
+"""
+import hashlib
+from pathlib import Path
+from typing import List
+
+from src.backends import BuildConfig
+
+RUNTIME_DIR = Path(__file__).resolve().parent.parent / "runtime"
+HOOK_TEMPLATE = RUNTIME_DIR / "onefile_cache_hook.py"
+SPEC_OPTION = "--onefile-tempdir-spec="
+SPEC_ROOT = "{CACHE_DIR}/{COMPANY}/{PRODUCT}"
+KEY_LENGTH = 16
+
+
+def supported(cfg: BuildConfig) -> bool:
+    return cfg.onefile_cache and cfg.backend == "nuitka" and (cfg.onefile or cfg.dual_output)
+
+
+def cache_key(cfg: BuildConfig, build_cmd: List[str]) -> str:
+    """Empreinte des sources Python du projet, de la commande (hors dossier d'extraction) et de l'environnement."""
+    from src.services import env_fingerprint, preflight
+    h = hashlib.sha256()
+    root = Path(cfg.project_dir)
+    for path in preflight.project_sources(cfg):
+        p = Path(path)
+        h.update(p.relative_to(root).as_posix().encode("utf-8") if p.is_relative_to(root) else path.encode("utf-8"))
+        h.update(b"\0" + p.read_bytes())
+    h.update("\0".join(a for a in build_cmd if not a.startswith(SPEC_OPTION)).encode("utf-8"))
+    h.update(env_fingerprint.snapshot(cfg.python_exe)["fingerprint"].encode("ascii"))
+    return h.hexdigest()[:KEY_LENGTH]
+
+
+def tempdir_arg(key: str) -> str:
+    return f"{SPEC_OPTION}{SPEC_ROOT}/{key}"
+
+
+def stable_command(cmd: List[str]) -> List[str]:
+    """Commande sans l'empreinte du dossier d'extraction (déjà couverte par les sources et l'environnement)."""
+    return [tempdir_arg("<empreinte>") if a.startswith(SPEC_OPTION) else a for a in cmd]
+
+
+def write_hook(key: str, dest: str) -> str:
+    """Hook de nettoyage des anciennes versions, limité aux dossiers du cache de cette application."""
+    text = HOOK_TEMPLATE.read_text(encoding="utf-8")
+    text = text.replace('KEY = ""', f"KEY = {key!r}", 1).replace("KEY_LENGTH = 0", f"KEY_LENGTH = {KEY_LENGTH}", 1)
+    Path(dest).parent.mkdir(parents=True, exist_ok=True)
+    Path(dest).write_text(text, encoding="utf-8")
+    return dest
@@ -0,0 +1,109 @@
+# src/services/payload_filter.py
+"""
+Filtre du contenu des paquets tiers : tests, documentation, stubs, exemples et
+métadonnées redondantes des .dist-info retirés de ce que collecte le backend.
+
+Règles par défaut complétées par des règles globales (« * ») et par paquet,
+au format de src/runtime/payload_filter.py (`!motif` conserve). PyInstaller
+applique les règles exactement, dans le .spec, sur a.pure/a.datas/a.binaries ;
+Nuitka ne reçoit que des --noinclude-data-files, qui ne savent pas conserver un
+fichier pour un seul paquet : une règle par défaut annulée pour un paquet n'y
+est pas appliquée du tout. Aucun --nofollow-import-to : le motif porterait sur
+tout module de ce nom, ceux du projet compris (`from monpaquet import docs`),
+et Nuitka ne compile de toute façon que les modules importés.
+"""
+import json
+import subprocess
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+RUNTIME_DIR = Path(__file__).resolve().parent.parent / "runtime"
+DEFAULT_RULES = ["tests", "test", "docs", "doc", "examples", "__pycache__", "*.pyi", "py.typed", "*.pyx", "*.pxd",
+                 "*.dist-info/RECORD", "*.dist-info/INSTALLER", "*.dist-info/REQUESTED", "*.dist-info/direct_url.json"]
+SIMULATE_TIMEOUT = 300
+
+
+def effective_rules(rules: Dict[str, List[str]]) -> Dict[str, List[str]]:
+    """Règles par défaut suivies des règles globales, puis règles par paquet."""
+    out = {k: list(v) for k, v in rules.items() if k != "*" and v}
+    out["*"] = DEFAULT_RULES + list(rules.get("*", []))
+    return out
+
+
+def parse_rules(text: str) -> Dict[str, List[str]]:
+    """Une ligne par paquet : `paquet: règle règle ...` (« * » pour tous les paquets)."""
+    rules: Dict[str, List[str]] = {}
+    for line in text.splitlines():
+        package, sep, values = line.partition(":")
+        if sep and package.strip() and values.split():
+            rules.setdefault(package.strip(), []).extend(values.split())
+    return rules
+
+
+def format_rules(rules: Dict[str, List[str]]) -> str:
+    return "\n".join(f"{package}: {' '.join(values)}" for package, values in rules.items() if values)
+
+
+def spec_block(rules: Dict[str, List[str]], report_path: str) -> str:
+    """Code du .spec : TOC filtrées par src/runtime/payload_filter.py, rapport écrit dans `report_path`."""
+    return (
+        "# Contenu des paquets tiers filtré (tests, docs, stubs...)\n"
+        "import sys as _pypack_sys\n"
+        f"_pypack_sys.path.insert(0, {str(RUNTIME_DIR)!r})\n"
+        "import payload_filter as _pypack_payload\n"
+        f"_pypack_rules = _pypack_payload.PayloadRules({effective_rules(rules)!r})\n"
+        "_pypack_removed = {}\n"
+        "a.pure = _pypack_payload.filter_toc(a.pure, _pypack_rules, 'pure', _pypack_removed)\n"
+        "a.datas = _pypack_payload.filter_toc(a.datas, _pypack_rules, 'datas', _pypack_removed)\n"
+        "a.binaries = _pypack_payload.filter_toc(a.binaries, _pypack_rules, 'binaries', _pypack_removed)\n"
+        f"_pypack_payload.write_report(_pypack_removed, {report_path!r})"
+    )
+
+
+def _nuitka_patterns(package: str, pattern: str) -> List[str]:
+    if ".dist-info/" in pattern or ".egg-info/" in pattern:
+        return []  # métadonnées non copiées par Nuitka sans --include-distribution-metadata
+    if "/" in pattern:
+        return [f"--noinclude-data-files={pattern.strip('/')}"]
+    bases = ["*"] if package == "*" else [package, f"{package}/*"]
+    tails = ("",) if "." in pattern else ("", "/*")  # nom de dossier : son contenu aussi
+    return [f"--noinclude-data-files={base}/{pattern}{tail}" for base in bases for tail in tails]
+
+
+def nuitka_args(rules: Dict[str, List[str]]) -> Tuple[List[str], List[str]]:
+    """(options Nuitka, règles globales non appliquées car annulées pour un paquet)."""
+    rules = effective_rules(rules)
+    kept = {r[1:] for package, values in rules.items() if package != "*" for r in values if r.startswith("!")}
+    args, skipped = [], []
+    for package, values in rules.items():
+        for rule in values:
+            if rule.startswith("!") or rule.startswith("#"):
+                continue
+            if package == "*" and rule in kept:
+                skipped.append(rule)
+                continue
+            args.extend(a for a in _nuitka_patterns(package, rule) if a not in args)
+    return args, skipped
+
+
+def simulate(python_exe: str, rules: Dict[str, List[str]], work_dir: str) -> Dict[str, List[int]]:
+    """Simulation dans l'interpréteur cible : {paquet: [retirés, octets retirés, fichiers, octets]}."""
+    work = Path(work_dir)
+    work.mkdir(parents=True, exist_ok=True)
+    rules_json, out_json = work / "rules.json", work / "simulation.json"
+    rules_json.write_text(json.dumps(effective_rules(rules)), encoding="utf-8")
+    proc = subprocess.run([python_exe, str(RUNTIME_DIR / "payload_filter.py"), str(rules_json), str(out_json)],
+                          capture_output=True, text=True, timeout=SIMULATE_TIMEOUT)
+    if proc.returncode != 0:
+        raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "échec de la simulation")
+    return json.loads(out_json.read_text(encoding="utf-8"))
+
+
+def report_lines(report: Dict[str, List[int]]) -> List[str]:
+    """Une ligne par paquet touché, du plus gros gain au plus petit."""
+    lines = []
+    for package, stats in sorted(report.items(), key=lambda kv: -kv[1][1]):
+        if stats[0]:
+            total = f" sur {stats[2]}" if len(stats) > 2 else ""
+            lines.append(f"{package}: {stats[0]} fichiers{total}, {stats[1] / (1024 * 1024):.1f} Mo")
+    return lines
@@ -0,0 +1,78 @@
+# src/services/pgo.py
+"""
+Optimisation guidée par profil (PGO) des builds Nuitka, au niveau du compilateur C.
+
+Passe 1 : build instrumenté (-fprofile-generate) puis exécution du scénario
+d'entraînement sans fenêtre ; passe 2 : build final (-fprofile-use). Le profil
+est rangé par empreinte des sources du projet et réutilisé tant qu'elles ne
+changent pas. Les deux passes compilent dans le même dossier .build : GCC
+retrouve les données de profil d'après le chemin des objets.
+
+Les options de profil sont celles de GCC (MinGW64 sous Windows) : MSVC et clang
+n'en ont pas d'équivalent compatible, le build est refusé dès la validation.
+"""
+import hashlib
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Dict, List, Mapping
+
+SKIP_DIRS = {"build", "dist", "venv", ".venv", "__pycache__", ".git"}
+PROFILE_SUFFIX = ".gcda"
+BENCH_RUNS = 3
+
+
+def compiler_error(extra_args: List[str], env: Mapping[str, str] = os.environ) -> str:
+    """Message d'erreur si Nuitka compilera avec autre chose que GCC, chaîne vide sinon."""
+    cc = Path(env.get("CC", "")).stem.lower()
+    if "--clang" in extra_args or "clang" in cc:
+        return "PGO : clang n'est pas pris en charge (options de profil GCC). Retirez --clang ou la variable CC."
+    if sys.platform == "darwin":
+        return "PGO : non disponible sous macOS, Nuitka y compile avec clang."
+    if os.name == "nt" and "--mingw64" not in extra_args:
+        return "PGO : MSVC n'est pas pris en charge. Ajoutez --mingw64 aux arguments supplémentaires pour compiler avec GCC."
+    if cc == "cl":
+        return "PGO : MSVC n'est pas pris en charge (variable CC). Utilisez GCC."
+    return ""
+
+
+def source_key(project_dir: str, training_args: List[str], build_cmd: List[str]) -> str:
+    """Empreinte des sources Python du projet, du scénario et de la commande de build."""
+    h = hashlib.sha256()
+    root = Path(project_dir)
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d not in SKIP_DIRS)
+        for fn in sorted(filenames):
+            if fn.endswith(".py"):
+                p = Path(dirpath) / fn
+                h.update(p.relative_to(root).as_posix().encode("utf-8") + b"\0")
+                h.update(p.read_bytes())
+    h.update("\0".join(training_args + build_cmd + [sys.version]).encode("utf-8"))
+    return h.hexdigest()[:24]
+
+
+def has_profile(profile_dir: str) -> bool:
+    p = Path(profile_dir)
+    return p.is_dir() and any(f.endswith(PROFILE_SUFFIX) for _, _, files in os.walk(p) for f in files)
+
+
+def has_timing(bench_json: str, key: str, label: str) -> bool:
+    try:
+        return label in json.loads(Path(bench_json).read_text(encoding="utf-8")).get(key, {})
+    except (OSError, ValueError):
+        return False
+
+
+def generate_env(profile_dir: str) -> Dict[str, str]:
+    flags = f"-fprofile-generate={profile_dir} -fprofile-update=prefer-atomic"
+    return {"CCFLAGS": flags, "LDFLAGS": f"-fprofile-generate={profile_dir}"}
+
+
+def use_env(profile_dir: str) -> Dict[str, str]:
+    # Code C régénéré à l'identique ; les objets sans profil ne doivent pas bloquer le build
+    return {"CCFLAGS": f"-fprofile-use={profile_dir} -fprofile-correction -Wno-missing-profile"}
+
+
+def training_env() -> Dict[str, str]:
+    return {"QT_QPA_PLATFORM": "offscreen"}
@@ -0,0 +1,223 @@
+# src/services/preflight.py
+"""
+Vérifications préalables au build, lancées en parallèle avant la première
+commande : compilation des sources et import de l'outil de packaging dans
+l'interpréteur cible (src/runtime/preflight.py), chemins inclus présents et
+lisibles, espace disque suffisant pour la taille prévue. Toutes les erreurs
+sont réunies dans un seul rapport au lieu d'apparaître au fil du build.
+
+Une erreur de syntaxe ne bloque le build que dans un module atteint par les
+imports des scripts d'entrée (et des imports cachés) : un script de test ou
+un brouillon cassé ailleurs dans le projet n'est qu'un avertissement.
+"""
+import ast
+import json
+import os
+import shutil
+import subprocess
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List, Set, Tuple
+
+from src.backends import BuildConfig
+from src.services import include_filter
+
+RUNTIME_DIR = Path(__file__).resolve().parent.parent / "runtime"
+SKIP_DIRS = {"build", "dist", "venv", ".venv", "__pycache__", ".git"}
+BACKEND_MODULES = {"pyinstaller": ["PyInstaller"], "nuitka": ["nuitka"], "hybrid": ["PyInstaller", "nuitka"]}
+# place prise par l'outil en plus des données (dossier de build + sortie), en octets
+BACKEND_OVERHEAD = {"pyinstaller": 200 * 1024 ** 2, "nuitka": 800 * 1024 ** 2, "hybrid": 1000 * 1024 ** 2}
+CHECK_TIMEOUT = 60
+
+
+@dataclass
+class PreflightReport:
+    errors: List[str] = field(default_factory=list)
+    warnings: List[str] = field(default_factory=list)
+    compiled: int = 0
+    data_bytes: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+    def summary(self) -> str:
+        return (f"[PREFLIGHT] {self.compiled} modules compilés, {self.data_bytes / (1024 * 1024):.1f} Mo de données "
+                f"vérifiés en {self.elapsed:.2f} s")
+
+
+def project_sources(cfg: BuildConfig) -> List[str]:
+    """Sources du projet (hors dossiers de build, de sortie et environnements) et scripts d'entrée."""
+    skip = {os.path.normcase(p) for p in (cfg.output_dir, cfg.build_root()) if p}
+    sources = {cfg.entry_script, *cfg.extra_entries}
+    for dirpath, dirnames, filenames in os.walk(cfg.project_dir):
+        dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS and not d.startswith(".")
+                       and os.path.normcase(os.path.join(dirpath, d)) not in skip
+                       and not os.path.isfile(os.path.join(dirpath, d, "pyvenv.cfg"))]
+        sources.update(os.path.join(dirpath, fn) for fn in filenames if fn.endswith(".py"))
+    return sorted(p for p in sources if p)
+
+
+def _module_files(base: str, parts: List[str]) -> Iterator[str]:
+    """Fichiers candidats d'un module : paquets parents (__init__.py) puis le module lui-même."""
+    for i in range(1, len(parts) + 1):
+        path = os.path.join(base, *parts[:i])
+        yield os.path.join(path, "__init__.py")
+        yield path + ".py"
+
+
+def _imported_files(path: str, roots: List[str]) -> Iterator[str]:
+    """Fichiers que `path` peut importer, d'après ses instructions import (résolution statique)."""
+    try:
+        tree = ast.parse(Path(path).read_bytes(), filename=path)
+    except (OSError, SyntaxError, ValueError):
+        return
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                for root in roots:
+                    yield from _module_files(root, alias.name.split("."))
+        elif isinstance(node, ast.ImportFrom):
+            module = node.module.split(".") if node.module else []
+            if node.level:
+                base = os.path.dirname(path)
+                for _ in range(node.level - 1):
+                    base = os.path.dirname(base)
+                bases = [base]
+            else:
+                bases = roots
+            for base in bases:
+                yield from _module_files(base, module) if module else ()
+                # from paquet import sous_module
+                for alias in node.names:
+                    yield from _module_files(base, module + [alias.name])
+
+
+def import_graph(cfg: BuildConfig, sources: List[str]) -> Set[str]:
+    """Sources du projet atteintes depuis les scripts d'entrée et les imports cachés (chemins normcase)."""
+    known = {os.path.normcase(p) for p in sources}
+    roots = list(dict.fromkeys([os.path.dirname(cfg.entry_script), cfg.project_dir]))
+    pending = [cfg.entry_script, *cfg.extra_entries]
+    pending += [f for module in cfg.hidden_imports for root in roots for f in _module_files(root, module.split("."))]
+    graph: Set[str] = set()
+    while pending:
+        key = os.path.normcase(pending.pop())
+        if key in known and key not in graph:
+            graph.add(key)
+            pending.extend(_imported_files(key, roots))
+    return graph
+
+
+def check_interpreter(cfg: BuildConfig, sources: List[str],
+                      check_backend: bool = True) -> Tuple[List[str], List[str], int]:
+    """(erreurs, avertissements, modules compilés) dans l'interpréteur cible."""
+    work = Path(cfg.work_dir()) / "preflight"
+    work.mkdir(parents=True, exist_ok=True)
+    request = work / "request.json"
+    imports, find = (BACKEND_MODULES.get(cfg.backend, []), cfg.hidden_imports) if check_backend else ([], [])
+    paths = list(dict.fromkeys([os.path.dirname(os.path.abspath(cfg.entry_script)), os.path.abspath(cfg.project_dir)]))
+    request.write_text(json.dumps({"sources": sources, "imports": imports, "find": find, "paths": paths}),
+                       encoding="utf-8")
+    try:
+        proc = subprocess.run([cfg.python_exe, str(RUNTIME_DIR / "preflight.py"), str(request)],
+                              capture_output=True, text=True, timeout=CHECK_TIMEOUT, cwd=cfg.project_dir)
+    except subprocess.TimeoutExpired:
+        return [], [f"Vérification dans l'interpréteur interrompue après {CHECK_TIMEOUT} s"], 0
+    except OSError as e:
+        return [f"Interpréteur inutilisable ({cfg.python_exe}) : {e}"], [], 0
+    if proc.returncode != 0:
+        last = proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else f"code {proc.returncode}"
+        return [f"Interpréteur inutilisable ({cfg.python_exe}) : {last}"], [], 0
+    result = json.loads(proc.stdout)
+    graph = import_graph(cfg, sources) if result["syntax"] else set()
+    errors, warnings = [], []
+    for path, line, msg in result["syntax"]:
+        text = f"Erreur de syntaxe : {os.path.relpath(path, cfg.project_dir)}:{line} : {msg}"
+        if os.path.normcase(path) in graph:
+            errors.append(text)
+        else:
+            warnings.append(f"{text} (module non importé par le script d'entrée)")
+    errors += [f"{module} ne s'importe pas dans {cfg.python_exe} : {error}"
+               for module, error in result["imports"].items()]
+    warnings += [f"Import caché introuvable : {module}" for module in result["find"]]
+    return errors, warnings, result["compiled"]
+
+
+def _readable(path: str) -> bool:
+    return os.access(path, os.R_OK)
+
+
+def check_includes(cfg: BuildConfig) -> Tuple[List[str], int]:
+    """(erreurs, octets) des données ajoutées, fichiers et dossiers inclus."""
+    errors, total = [], 0
+    filters = include_filter.normalized_filters(cfg.include_filters)
+    files = [src for src, _dest in cfg.add_data] + list(cfg.files_to_include)
+    for path in files:
+        if not os.path.isfile(path) and not os.path.isdir(path):
+            errors.append(f"Fichier inclus introuvable : {path}")
+        elif os.path.isdir(path):
+            files.extend(os.path.join(path, rel) for rel, _size in include_filter.walk(path))
+        elif not _readable(path):
+            errors.append(f"Fichier inclus illisible : {path}")
+        else:
+            total += os.path.getsize(path)
+    for directory in cfg.dirs_to_include:
+        if not os.path.isdir(directory):
+            errors.append(f"Dossier inclus introuvable : {directory}")
+            continue
+        try:
+            entries = include_filter.walk(directory, include_filter.rules_for(filters, directory))
+        except OSError as e:
+            errors.append(f"Dossier inclus illisible : {directory} ({e})")
+            continue
+        unreadable = [rel for rel, _size in entries if not _readable(os.path.join(directory, rel))]
+        errors.extend(f"Fichier inclus illisible : {os.path.join(directory, rel)}" for rel in unreadable[:5])
+        if len(unreadable) > 5:
+            errors.append(f"… et {len(unreadable) - 5} autres fichiers illisibles dans {directory}")
+        total += sum(size for _rel, size in entries)
+    return errors, total
+
+
+def _existing_parent(path: str) -> str:
+    p = Path(path)
+    while not p.exists() and p != p.parent:
+        p = p.parent
+    return str(p)
+
+
+def check_disk(cfg: BuildConfig, data_bytes: int) -> List[str]:
+    """Espace libre des volumes du build et de la sortie face à la taille prévue
+    (données copiées dans le build puis dans la sortie, plus l'encombrement de l'outil)."""
+    needed: Dict[int, Tuple[str, int]] = {}
+    overhead = BACKEND_OVERHEAD.get(cfg.backend, BACKEND_OVERHEAD["pyinstaller"])
+    for path, size in ((cfg.build_root(), data_bytes + overhead // 2), (cfg.output_dir, data_bytes + overhead // 2)):
+        root = _existing_parent(path)
+        device = os.stat(root).st_dev
+        previous = needed.get(device, (root, 0))
+        needed[device] = (previous[0], previous[1] + size)
+    errors = []
+    for root, size in needed.values():
+        free = shutil.disk_usage(root).free
+        if free < size:
+            errors.append(f"Espace disque insuffisant sur {root} : {free / 1024 ** 2:.0f} Mo libres, "
+                          f"environ {size / 1024 ** 2:.0f} Mo nécessaires")
+    return errors
+
+
+def run(cfg: BuildConfig, check_backend: bool = True) -> PreflightReport:
+    """Toutes les vérifications en parallèle ; le rapport réunit leurs erreurs.
+    `check_backend` faux : l'outil et les dépendances ne sont pas encore installés (environnement
+    géré à créer), seule la compilation des sources est vérifiée dans l'interpréteur."""
+    start = time.perf_counter()
+    report = PreflightReport()
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        interpreter = pool.submit(lambda: check_interpreter(cfg, project_sources(cfg), check_backend))
+        include_errors, report.data_bytes = check_includes(cfg)
+        disk_errors = check_disk(cfg, report.data_bytes)
+        errors, report.warnings, report.compiled = interpreter.result()
+    report.errors = errors + include_errors + disk_errors
+    report.elapsed = time.perf_counter() - start
+    return report
@@ -0,0 +1,147 @@
+# src/services/presets.py
+"""
+Préréglages de performance : chaque préréglage ajuste la configuration et
+ajoute des options propres au backend, sans écraser celles déjà données dans
+les arguments supplémentaires.
+"""
+import ctypes
+import json
+import os
+import sys
+from dataclasses import replace
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from src.backends import BuildConfig
+
+PRESETS: Dict[str, str] = {
+    "fastest_build": "Build le plus rapide",
+    "fastest_startup": "Démarrage le plus rapide",
+    "smallest": "Le plus petit",
+    "fastest_runtime": "Exécution la plus rapide",
+}
+# Mémoire réservée par job du compilateur C (l'édition de liens LTO est plus gourmande)
+JOB_MEMORY = 1 << 30
+JOB_MEMORY_LTO = 2 << 30
+NUITKA_NOFOLLOW_MODES = ("setuptools", "pytest", "unittest", "IPython")
+
+
+def available_memory() -> Optional[int]:
+    """Mémoire physique disponible en octets, ou None si elle n'est pas mesurable."""
+    if os.name == 'nt':
+        class MemoryStatus(ctypes.Structure):
+            _fields_ = [("dwLength", ctypes.c_ulong), ("dwMemoryLoad", ctypes.c_ulong),
+                        ("ullTotalPhys", ctypes.c_ulonglong), ("ullAvailPhys", ctypes.c_ulonglong),
+                        ("ullTotalPageFile", ctypes.c_ulonglong), ("ullAvailPageFile", ctypes.c_ulonglong),
+                        ("ullTotalVirtual", ctypes.c_ulonglong), ("ullAvailVirtual", ctypes.c_ulonglong),
+                        ("ullAvailExtendedVirtual", ctypes.c_ulonglong)]
+        status = MemoryStatus(dwLength=ctypes.sizeof(MemoryStatus))
+        if ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status)):
+            return status.ullAvailPhys
+        return None
+    try:
+        with open("/proc/meminfo", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (ValueError, OSError, AttributeError):
+        return None
+
+
+def nuitka_jobs(lto: bool) -> int:
+    """Jobs du compilateur C : un par cœur, dans la limite de la mémoire disponible."""
+    cores = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else (os.cpu_count() or 1)
+    memory = available_memory()
+    if memory is None:
+        return cores
+    return max(1, min(cores, memory // (JOB_MEMORY_LTO if lto else JOB_MEMORY)))
+
+
+def _option_name(arg: str) -> str:
+    return arg.split("=", 1)[0]
+
+
+def _merge_args(user_args: List[str], preset_args: List[str]) -> List[str]:
+    """Ajoute les options du préréglage absentes des arguments de l'utilisateur."""
+    taken = {_option_name(a) for a in user_args if a.startswith("-")}
+    # Options répétables : une valeur identique suffit à considérer l'option comme donnée
+    repeatable = {"--python-flag", "--debug"}
+    added = [a for a in preset_args
+             if (a not in user_args if _option_name(a) in repeatable else _option_name(a) not in taken)]
+    return list(user_args) + added
+
+
+def _nuitka(cfg: BuildConfig, preset: str) -> BuildConfig:
+    lto = preset in ("smallest", "fastest_runtime")
+    args = [f"--jobs={nuitka_jobs(lto)}", f"--lto={'yes' if lto else 'no' if preset == 'fastest_build' else 'auto'}"]
+    if preset != "fastest_runtime":
+        # anti-bloat : ne pas suivre les outils de test/dev importés par certaines bibliothèques
+        args += [f"--noinclude-{mode}-mode=nofollow" for mode in NUITKA_NOFOLLOW_MODES]
+    changes = {}
+    if preset == "fastest_startup":
+        args.append("--python-flag=no_site")
+    if preset == "smallest":
+        changes["optimize"] = 2
+    return replace(cfg, extra_args=_merge_args(cfg.extra_args, args), **changes)
+
+
+def _pyinstaller(cfg: BuildConfig, preset: str) -> BuildConfig:
+    args, changes = [], {}
+    if preset == "fastest_build":
+        args.append("--noupx")
+        changes["clean"] = False
+    elif preset == "fastest_startup":
+        # .pyc sur disque (pas de décompression de l'archive), résolus par l'index des modules
+        args += ["--noupx", "--debug=noarchive"]
+        changes.update(optimize=max(cfg.optimize, 1), module_index=True)
+    elif preset == "smallest":
+        # UPX est utilisé s'il est trouvé dans le PATH
+        if os.name != 'nt':
+            args.append("--strip")
+        changes["optimize"] = 2
+    elif preset == "fastest_runtime":
+        args.append("--noupx")
+        changes["optimize"] = max(cfg.optimize, 1)
+    return replace(cfg, extra_args=_merge_args(cfg.extra_args, args), **changes)
+
+
+def apply_preset(cfg: BuildConfig) -> BuildConfig:
+    """Configuration effective du build pour le préréglage choisi (inchangée sans préréglage)."""
+    if cfg.preset not in PRESETS:
+        return cfg
+    if cfg.backend == "nuitka":
+        return _nuitka(cfg, cfg.preset)
+    return _pyinstaller(cfg, cfg.preset)
+
+
+def calibration_dir(cfg: BuildConfig) -> Path:
+    return Path(cfg.work_dir()) / "calibration"
+
+
+def output_size(path: str) -> int:
+    p = Path(path)
+    if p.is_file():
+        return p.stat().st_size
+    return sum(f.stat().st_size for f in p.rglob("*") if f.is_file())
+
+
+def pick_winner(results: Dict[str, dict]) -> Optional[str]:
+    """Préréglage au scénario le plus rapide ; à égalité (5 %), le plus petit."""
+    measured = {p: r for p, r in results.items() if r.get("scenario_s")}
+    if not measured:
+        return None
+    best = min(r["scenario_s"] for r in measured.values())
+    close = [p for p, r in measured.items() if r["scenario_s"] <= best * 1.05]
+    return min(close, key=lambda p: measured[p]["size"])
+
+
+def save_results(cfg: BuildConfig, results: Dict[str, dict], winner: Optional[str]) -> str:
+    dest = calibration_dir(cfg) / "results.json"
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    dest.write_text(json.dumps({"backend": cfg.backend, "python": sys.version, "winner": winner,
+                                "results": results}, indent=2), encoding="utf-8")
+    return str(dest)
@@ -0,0 +1,102 @@
+# src/services/pyi_spec.py
+"""
+Fichier .spec PyInstaller généré : pour les réglages sans option en ligne de
+commande, le .spec est produit par makespec avec les mêmes options que le
+build direct, complété par des blocs de code insérés après l'Analysis, puis
+construit.
+"""
+import os
+from pathlib import Path
+from typing import List, Tuple
+
+MAKESPEC_MODULE = "PyInstaller.utils.cliutils.makespec"
+# Options propres au build, refusées par makespec : posées par build_command ou ignorées
+BUILD_ONLY_FLAGS = {"--clean", "--noconfirm", "-y", "--version", "-v"}
+BUILD_ONLY_VALUES = {"--distpath", "--workpath"}
+# Options propres au build, transmises à la commande de build
+BUILD_FORWARD_VALUES = {"--upx-dir"}
+# Options acceptées par les deux : verbosité de makespec comme du build
+SHARED_VALUES = {"--log-level"}
+# Remplacée par le dossier du .spec géré
+OVERRIDDEN_VALUES = {"--specpath"}
+PATCH_ANCHOR = "pyz = PYZ("
+# Suffixe de l'exécutable onefile produit à côté du dossier (renommé après le build)
+ONEFILE_SUFFIX = "-onefile"
+
+
+def split_args(args: List[str]) -> Tuple[List[str], List[str]]:
+    """(arguments de makespec, arguments du build) d'une ligne de commande PyInstaller."""
+    valued = BUILD_ONLY_VALUES | BUILD_FORWARD_VALUES | SHARED_VALUES | OVERRIDDEN_VALUES
+    makespec, build = [], []
+    i = 0
+    while i < len(args):
+        arg = args[i]
+        option = arg.split("=", 1)[0]
+        # `--option valeur` ou `--option=valeur`
+        item = args[i:i + 2] if arg in valued else [arg]
+        i += len(item)
+        if option in BUILD_ONLY_FLAGS or option in BUILD_ONLY_VALUES or option in OVERRIDDEN_VALUES:
+            continue
+        if option in BUILD_FORWARD_VALUES or option in SHARED_VALUES:
+            build.extend(item)
+        if option not in BUILD_FORWARD_VALUES:
+            makespec.extend(item)
+    return makespec, build
+
+
+def makespec_command(build_cmd: List[str], spec_dir: str) -> List[str]:
+    """Commande makespec équivalente à une commande `python -m PyInstaller ...`."""
+    return [build_cmd[0], "-m", MAKESPEC_MODULE, "--specpath", spec_dir] + split_args(build_cmd[3:])[0]
+
+
+def patch_spec(spec_path: str, blocks: List[str]) -> str:
+    """Insère les blocs de code juste après l'Analysis (avant la création du PYZ)."""
+    text = Path(spec_path).read_text(encoding="utf-8")
+    pos = text.find(PATCH_ANCHOR)
+    if pos < 0:
+        raise ValueError(f"Fichier spec inattendu (pas de '{PATCH_ANCHOR}'): {spec_path}")
+    inserted = "# --- PyPack Studio ---\n" + "\n".join(b.rstrip() + "\n" for b in blocks) + "# ---\n"
+    Path(spec_path).write_text(text[:pos] + inserted + text[pos:], encoding="utf-8")
+    return spec_path
+
+
+def targets_block(entries: List[Tuple[str, str]], with_onefile: bool = False) -> str:
+    """Code du .spec (mode dossier) : EXE remplacé par un EXE par (nom, script) et,
+    avec `with_onefile`, par un exécutable onefile de plus par script, issu de la
+    même Analysis. COLLECT regroupe les EXE du dossier dans un seul `_internal`.
+    """
+    return (
+        "# Exécutables produits par la même Analysis\n"
+        "import os as _pypack_os\n"
+        f"_pypack_entries = {[(n, os.path.normcase(s)) for n, s in entries]!r}\n"
+        f"_pypack_onefile = {ONEFILE_SUFFIX if with_onefile else ''!r}\n"
+        "_pypack_EXE, _pypack_COLLECT = EXE, COLLECT\n"
+        "def EXE(pyz, scripts, *args, **kwargs):\n"
+        "    own = lambda s: _pypack_os.path.normcase(s[1])\n"
+        "    paths = {p for _, p in _pypack_entries}\n"
+        "    common = [s for s in scripts if own(s) not in paths]  # hooks d'exécution\n"
+        "    exes = []\n"
+        "    for n, p in _pypack_entries:\n"
+        "        entry_scripts = common + [s for s in scripts if own(s) == p]\n"
+        "        exes.append(_pypack_EXE(pyz, entry_scripts, *args, **dict(kwargs, name=n)))\n"
+        "        if _pypack_onefile:\n"
+        "            _pypack_EXE(pyz, entry_scripts, a.binaries, a.datas, [],\n"
+        "                        **dict(kwargs, name=n + _pypack_onefile, exclude_binaries=False))\n"
+        "    return exes\n"
+        "def COLLECT(*args, **kwargs):\n"
+        "    flat = []\n"
+        "    for arg in args:\n"
+        "        is_exes = isinstance(arg, list) and arg and all(isinstance(x, _pypack_EXE) for x in arg)\n"
+        "        flat.extend(arg if is_exes else [arg])\n"
+        "    return _pypack_COLLECT(*flat, **kwargs)"
+    )
+
+
+def build_command(python_exe: str, spec_path: str, dist_dir: str, work_dir: str, clean: bool,
+                  extra_args: List[str] = ()) -> List[str]:
+    """Build du .spec ; `extra_args` : options propres au build (cf. split_args)."""
+    cmd = [python_exe, "-m", "PyInstaller"]
+    if clean:
+        cmd.append("--clean")
+    cmd.extend(["--noconfirm", "--distpath", dist_dir, "--workpath", work_dir, *extra_args, spec_path])
+    return cmd
@@ -0,0 +1,122 @@
+# src/services/reproducible.py
+"""
+Builds reproductibles : environnement figé (SOURCE_DATE_EPOCH, PYTHONHASHSEED)
+transmis à chaque commande, dates de la sortie ramenées à SOURCE_DATE_EPOCH,
+et vérification par deux builds isolés lancés en parallèle dont les fichiers
+produits sont comparés par empreinte.
+"""
+import hashlib
+import os
+import shutil
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from src.backends import BuildConfig, BuildStep
+
+HASH_SEED = "0"
+SKIP_DIRS = {"build", "dist", "venv", ".venv", "__pycache__", ".git"}
+HASH_WORKERS = min(8, (os.cpu_count() or 1) * 2)
+
+
+def source_date_epoch(project_dir: str) -> int:
+    """Date du dernier commit du projet, sinon date du source .py le plus récent."""
+    try:
+        out = subprocess.run(["git", "log", "-1", "--format=%ct"], cwd=project_dir,
+                             capture_output=True, text=True, timeout=10)
+        if out.returncode == 0 and out.stdout.strip().isdigit():
+            return int(out.stdout.strip())
+    except (OSError, subprocess.SubprocessError):
+        pass
+    latest = 0
+    for dirpath, dirnames, filenames in os.walk(project_dir):
+        dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS and not d.startswith(".")]
+        for fn in filenames:
+            if fn.endswith(".py"):
+                latest = max(latest, int(os.path.getmtime(os.path.join(dirpath, fn))))
+    return latest
+
+
+def build_env(cfg: BuildConfig) -> Dict[str, str]:
+    return {"SOURCE_DATE_EPOCH": str(source_date_epoch(cfg.project_dir)), "PYTHONHASHSEED": HASH_SEED}
+
+
+def with_env(steps: List[BuildStep], env: Dict[str, str]) -> List[BuildStep]:
+    """Étapes de commande complétées par `env` (les variables propres à l'étape priment)."""
+    return [replace(s, env={**env, **s.env}) if s.cmd else s for s in steps]
+
+
+def normalize_tree(root: str, epoch: int) -> int:
+    """Dates de tous les fichiers et dossiers sous `root` fixées à `epoch` ; retourne le nombre d'entrées."""
+    count = 0
+    if os.path.isfile(root):
+        os.utime(root, (epoch, epoch))
+        return 1
+    for dirpath, dirnames, filenames in os.walk(root, topdown=False):
+        for name in filenames + dirnames:
+            path = os.path.join(dirpath, name)
+            if os.path.islink(path):
+                continue
+            os.utime(path, (epoch, epoch))
+            count += 1
+    os.utime(root, (epoch, epoch))
+    return count + 1
+
+
+def normalize_step(cfg: BuildConfig, env: Dict[str, str]) -> BuildStep:
+    def normalize(log):
+        count = normalize_tree(cfg.output_dir, int(env["SOURCE_DATE_EPOCH"]))
+        log(f"[REPRO] {count} dates normalisées à SOURCE_DATE_EPOCH={env['SOURCE_DATE_EPOCH']} dans {cfg.output_dir}")
+    return BuildStep("reproducible", func=normalize)
+
+
+def _digest(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(1024 * 1024):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def tree_digests(root: str) -> Dict[str, str]:
+    """{chemin relatif: SHA-256} des fichiers sous `root`, calculés en parallèle."""
+    paths = sorted(str(p.relative_to(root).as_posix()) for p in Path(root).rglob("*") if p.is_file())
+    with ThreadPoolExecutor(max_workers=HASH_WORKERS) as pool:
+        return dict(zip(paths, pool.map(lambda rel: _digest(os.path.join(root, rel)), paths)))
+
+
+def compare(first: Dict[str, str], second: Dict[str, str]) -> List[Tuple[str, str]]:
+    """(chemin, motif) des fichiers qui diffèrent entre deux builds."""
+    diffs = []
+    for rel in sorted(set(first) | set(second)):
+        if rel not in second:
+            diffs.append((rel, "absent du 2e build"))
+        elif rel not in first:
+            diffs.append((rel, "absent du 1er build"))
+        elif first[rel] != second[rel]:
+            diffs.append((rel, "contenu différent"))
+    return diffs
+
+
+def verification_runs(backend, cfg: BuildConfig) -> Tuple[Dict[str, str], List[Tuple[BuildConfig, List[BuildStep]]]]:
+    """Deux pipelines isolés (dossiers de build et de sortie propres), à lancer en parallèle."""
+    root = Path(cfg.work_dir()) / "repro"
+    env = build_env(cfg)
+    runs = []
+    for i in (1, 2):
+        run_root = root / f"run{i}"
+        shutil.rmtree(run_root, ignore_errors=True)
+        run_cfg = replace(cfg, work_root=str(run_root / "build"), output_dir=str(run_root / "dist"),
+                          clean=True, reproducible=True, create_setup=False)
+        runs.append((run_cfg, with_env(backend.build_steps(run_cfg), env) + [normalize_step(run_cfg, env)]))
+    return env, runs
+
+
+def compare_outputs(first_dir: str, second_dir: str, report_path: str) -> Tuple[int, List[Tuple[str, str]]]:
+    """(fichiers comparés, différences) entre deux sorties ; les différences sont aussi écrites dans `report_path`."""
+    first, second = tree_digests(first_dir), tree_digests(second_dir)
+    diffs = compare(first, second)
+    Path(report_path).write_text("".join(f"{rel}\t{reason}\n" for rel, reason in diffs), encoding="utf-8")
+    return len(set(first) | set(second)), diffs
@@ -0,0 +1,94 @@
+# src/services/resource_pack.py
+"""
+Archive de ressources : les fichiers et dossiers inclus sont regroupés dans un
+seul fichier indexé, lu par projection mémoire (src/runtime/resource_pack_hook.py).
+
+Format : en-tête (magie, position et taille de l'index), données non
+compressées alignées sur 16 octets, puis index JSON
+{"digest": sha256, "files": {nom: [position, taille]}}.
+"""
+import hashlib
+import json
+import os
+import struct
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+RUNTIME_DIR = Path(__file__).resolve().parent.parent / "runtime"
+HOOK_TEMPLATE = RUNTIME_DIR / "resource_pack_hook.py"
+PAK_NAME = "pypack_resources.pak"
+PAK_MAGIC = b"PYPAKRS1"
+PAK_HEADER = struct.Struct("<8sQQ")
+ALIGN = 16
+
+
+def collect_entries(files: Iterable[str], dirs: Iterable[str],
+                    filters: Optional[Dict[str, List[str]]] = None) -> List[Tuple[str, str]]:
+    """(nom dans l'archive, chemin source), avec les mêmes destinations que --add-data :
+    un fichier à la racine, un dossier sous son propre nom (filtré par ses règles)."""
+    from src.services import include_filter
+    filters = include_filter.normalized_filters(filters or {})
+    entries = {}
+    for item in list(files) + list(dirs):
+        if not item:
+            continue
+        src = Path(item).expanduser().resolve()
+        if src.is_file():
+            entries[src.name] = str(src)
+        elif src.is_dir():
+            for rel, _size in include_filter.walk(str(src), include_filter.rules_for(filters, str(src))):
+                entries[f"{src.name}/{rel}"] = str(src / rel)
+    return sorted(entries.items())
+
+
+def _stamp(entries: List[Tuple[str, str]]) -> str:
+    h = hashlib.sha256()
+    for name, src in entries:
+        st = os.stat(src)
+        h.update(f"{name}\0{src}\0{st.st_size}\0{st.st_mtime_ns}\n".encode("utf-8"))
+    return h.hexdigest()
+
+
+def pack(entries: List[Tuple[str, str]], dest: str) -> Tuple[int, int, bool]:
+    """Écrit l'archive ; retourne (fichiers, octets, réutilisée).
+
+    L'archive précédente est conservée si aucun fichier source n'a changé
+    (noms, tailles, dates de modification).
+    """
+    dest_p = Path(dest)
+    stamp_p = dest_p.with_suffix(".stamp")
+    stamp = _stamp(entries)
+    total = sum(os.path.getsize(src) for _name, src in entries)
+    if dest_p.exists() and stamp_p.exists() and stamp_p.read_text(encoding="utf-8") == stamp:
+        return len(entries), total, True
+    dest_p.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dest_p.with_suffix(".tmp")
+    digest = hashlib.sha256()
+    index = {}
+    with open(tmp, "wb") as out:
+        out.write(b"\0" * PAK_HEADER.size)
+        for name, src in entries:
+            pad = -out.tell() % ALIGN
+            out.write(b"\0" * pad)
+            offset = out.tell()
+            with open(src, "rb") as f:
+                while chunk := f.read(1024 * 1024):
+                    out.write(chunk)
+                    digest.update(chunk)
+            index[name] = [offset, out.tell() - offset]
+            digest.update(name.encode("utf-8"))
+        raw_index = json.dumps({"digest": digest.hexdigest(), "files": index},
+                               sort_keys=True, separators=(",", ":")).encode("utf-8")
+        index_offset = out.tell()
+        out.write(raw_index)
+        out.seek(0)
+        out.write(PAK_HEADER.pack(PAK_MAGIC, index_offset, len(raw_index)))
+    os.replace(tmp, dest_p)
+    stamp_p.write_text(stamp, encoding="utf-8")
+    return len(entries), total, False
+
+
+def write_hook(dest: str) -> str:
+    Path(dest).parent.mkdir(parents=True, exist_ok=True)
+    Path(dest).write_text(HOOK_TEMPLATE.read_text(encoding="utf-8"), encoding="utf-8")
+    return dest
@@ -0,0 +1,139 @@
+# src/services/unused_data.py
+"""
+Détection des fichiers de données inclus jamais utilisés.
+
+Deux sources de preuves : les chaînes littérales des sources du projet
+(analyse AST en parallèle, mise en cache par empreinte de fichier) et, en
+option, la trace des fichiers ouverts pendant une exécution de l'application
+(src/runtime/open_trace.py). Un fichier dont seul le dossier est cité ou
+listé reste « incertain » et n'est pas signalé.
+"""
+import ast
+import fnmatch
+import glob
+import hashlib
+import json
+import os
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from src.services import include_filter, resource_pack
+
+RUNTIME_DIR = Path(__file__).resolve().parent.parent / "runtime"
+SKIP_DIRS = {"build", "dist", "venv", ".venv", "__pycache__", ".git"}
+TRACE_TIMEOUT = 15.0
+
+
+@dataclass
+class UnusedReport:
+    unused: List[Tuple[str, str, int]] = field(default_factory=list)  # (destination, source, octets)
+    uncertain: int = 0  # fichiers dont seul le dossier est référencé
+    used: int = 0
+
+    @property
+    def unused_bytes(self) -> int:
+        return sum(size for _, _, size in self.unused)
+
+
+def source_literals(path: str) -> List[str]:
+    """Chaînes littérales d'un fichier source (f-strings comprises), normalisées en chemins posix."""
+    try:
+        tree = ast.parse(Path(path).read_bytes(), filename=path)
+    except (SyntaxError, ValueError, OSError):
+        return []
+    found = {node.value.replace("\\", "/").strip() for node in ast.walk(tree)
+             if isinstance(node, ast.Constant) and isinstance(node.value, str) and len(node.value) < 260}
+    return sorted(s for s in found if s and "\n" not in s)
+
+
+def _project_sources(project_dir: str) -> List[Path]:
+    sources = []
+    for dirpath, dirnames, filenames in os.walk(project_dir):
+        dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS and not d.startswith(".")]
+        sources.extend(Path(dirpath) / fn for fn in filenames if fn.endswith(".py"))
+    return sources
+
+
+def scan_sources(project_dir: str, cache_path: str) -> Set[str]:
+    """Littéraux de tous les sources du projet ; seuls les fichiers modifiés sont ré-analysés."""
+    try:
+        cache = json.loads(Path(cache_path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        cache = {}
+    digests = {str(p): hashlib.sha256(p.read_bytes()).hexdigest() for p in _project_sources(project_dir)}
+    missing = {d: p for p, d in digests.items() if d not in cache}
+    if len(missing) > 1:
+        # threads : pas de processus lancé depuis le studio figé (voir assets.optimize_mapping)
+        with ThreadPoolExecutor(max_workers=min(len(missing), os.cpu_count() or 1)) as pool:
+            for digest, literals in zip(missing, pool.map(source_literals, missing.values())):
+                cache[digest] = literals
+    else:
+        cache.update({d: source_literals(p) for d, p in missing.items()})
+    cache = {d: cache[d] for d in set(digests.values())}
+    Path(cache_path).parent.mkdir(parents=True, exist_ok=True)
+    Path(cache_path).write_text(json.dumps(cache), encoding="utf-8")
+    return {lit for literals in cache.values() for lit in literals}
+
+
+def trace_opens(python_exe: str, entry_script: str, out_json: str, args: Iterable[str] = (),
+                timeout: float = TRACE_TIMEOUT) -> Tuple[Set[str], Set[str]]:
+    """(fichiers ouverts, dossiers listés) pendant une exécution de l'application."""
+    Path(out_json).parent.mkdir(parents=True, exist_ok=True)
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    subprocess.run([python_exe, str(RUNTIME_DIR / "open_trace.py"), out_json, str(timeout), entry_script, *args],
+                   capture_output=True, timeout=timeout + 30, cwd=str(Path(entry_script).parent), env=env)
+    data = json.loads(Path(out_json).read_text(encoding="utf-8"))
+    norm = lambda paths: {os.path.normcase(p) for p in paths}
+    return norm(data.get("opened", [])), norm(data.get("listed", []))
+
+
+def find_unused(entries: List[Tuple[str, str]], literals: Set[str],
+                opened: Optional[Set[str]] = None, listed: Optional[Set[str]] = None) -> UnusedReport:
+    """Classe les fichiers inclus (destination, source) d'après les références relevées.
+
+    Utilisé : nom ou nom sans extension cité, motif glob correspondant, ou fichier
+    ouvert. Incertain : dossier parent listé à l'exécution ou, sans trace, cité
+    dans les sources (nom calculé possible).
+    """
+    names = {lit.rstrip("/").rsplit("/", 1)[-1] for lit in literals}
+    patterns = [lit.rsplit("/", 1)[-1] for lit in literals if "*" in lit or "?" in lit]
+    traced = opened is not None
+    opened, listed = opened or set(), listed or set()
+    report = UnusedReport()
+    for dest, src in entries:
+        parts = dest.split("/")
+        real = os.path.normcase(os.path.realpath(src))
+        if (parts[-1] in names or os.path.splitext(parts[-1])[0] in names or real in opened
+                or any(fnmatch.fnmatch(parts[-1], p) for p in patterns)):
+            report.used += 1
+        elif os.path.dirname(real) in listed or (not traced and len(parts) > 1 and parts[-2] in names):
+            report.uncertain += 1
+        else:
+            report.unused.append((dest, src, os.path.getsize(src)))
+    return report
+
+
+def included_entries(files: Iterable[str], filters: Dict[str, List[str]]) -> List[Tuple[str, str]]:
+    return resource_pack.collect_entries(files, [], filters)
+
+
+def exclusion_rules(unused_sources: Iterable[str], items: Iterable[str]) -> Tuple[List[str], Dict[str, List[str]]]:
+    """(éléments inclus à retirer, règles d'exclusion par dossier inclus) pour les sources données."""
+    remove, rules = [], {}
+    items = [i for i in items if i]
+    for src in unused_sources:
+        real = os.path.realpath(src)
+        for item in items:
+            item_real = os.path.realpath(item)
+            if real == item_real:
+                remove.append(item)
+                break
+            if real.startswith(item_real + os.sep):
+                rel = os.path.relpath(real, item_real).replace(os.sep, "/")
+                # « / » en tête : règle sur le chemin relatif, pas sur le nom à toute profondeur
+                rules.setdefault(include_filter.filter_key(item), []).append(f"!/{glob.escape(rel)}")
+                break
+    return remove, rules
@@ -0,0 +1,147 @@
+# src/services/wheelhouse.py
+"""
+Wheelhouse locale partagée entre projets, pour créer les environnements de
+build hors ligne (--no-index --find-links) à la vitesse d'une copie locale.
+
+Remplie à partir des environnements déjà vus : wheels reconstitués depuis les
+distributions installées (src/runtime/wheel_repack.py, dans l'interpréteur
+concerné) et wheels existants (cache de wheels de pip, dossier wheelhouse/ ou
+wheels/ du projet). Dédoublonnée par empreinte SHA-256 ; au-delà du quota, les
+wheels les moins récemment utilisés sont supprimés.
+"""
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from src.services import interpreters
+
+RUNTIME_DIR = Path(__file__).resolve().parent.parent / "runtime"
+QUOTA = 2 * 1024 ** 3  # octets
+PROJECT_WHEEL_DIRS = ("wheelhouse", "wheels")
+REPACK_TIMEOUT = 600
+
+
+def wheelhouse_dir() -> Path:
+    return interpreters.cache_root() / "wheelhouse"
+
+
+def pip_wheel_cache() -> Path:
+    if os.name == 'nt':
+        return Path(os.environ.get("LOCALAPPDATA", Path.home())) / "pip" / "Cache" / "wheels"
+    if sys.platform == "darwin":
+        return Path.home() / "Library" / "Caches" / "pip" / "wheels"
+    return Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "pip" / "wheels"
+
+
+def _sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(1024 * 1024):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class Wheelhouse:
+    """Index : {"wheels": {sha256: {"file", "size", "last_used"}}, "sources": {chemin: [taille, mtime_ns]}}."""
+
+    def __init__(self, root: Optional[Path] = None):
+        self.root = Path(root or wheelhouse_dir())
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.index_path = self.root / "index.json"
+        try:
+            index = json.loads(self.index_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            index = {}
+        # wheels supprimés à la main : oubliés
+        self.wheels: Dict[str, dict] = {sha: w for sha, w in index.get("wheels", {}).items()
+                                        if (self.root / w["file"]).is_file()}
+        self.sources: Dict[str, List[int]] = index.get("sources", {})
+
+    def files(self) -> List[str]:
+        return sorted(w["file"] for w in self.wheels.values())
+
+    def total_size(self) -> int:
+        return sum(w["size"] for w in self.wheels.values())
+
+    def save(self):
+        self.index_path.write_text(json.dumps({"wheels": self.wheels, "sources": self.sources}, indent=1),
+                                   encoding="utf-8")
+
+    def add(self, path: Path, move: bool = False) -> bool:
+        """Ajoute un wheel ; faux s'il est déjà présent (même empreinte, ou même nom de fichier)."""
+        sha = _sha256(path)
+        known = {w["file"] for w in self.wheels.values()}
+        if sha in self.wheels or path.name in known:
+            if sha in self.wheels:
+                self.wheels[sha]["last_used"] = time.time()
+            if move:
+                path.unlink()
+            return False
+        dest = self.root / path.name
+        (shutil.move if move else shutil.copy2)(str(path), str(dest))
+        self.wheels[sha] = {"file": path.name, "size": dest.stat().st_size, "last_used": time.time()}
+        return True
+
+    def touch(self, names: Iterable[str]):
+        names, now = set(names), time.time()
+        for wheel in self.wheels.values():
+            if wheel["file"] in names:
+                wheel["last_used"] = now
+
+    def collect(self, dirs: Iterable[Path]) -> int:
+        """Wheels existants sous `dirs` ; seuls les fichiers nouveaux ou modifiés sont lus."""
+        added = 0
+        for directory in dirs:
+            if not directory.is_dir():
+                continue
+            for path in directory.rglob("*.whl"):
+                stat = path.stat()
+                stamp = [stat.st_size, stat.st_mtime_ns]
+                if self.sources.get(str(path)) == stamp:
+                    continue
+                added += self.add(path)
+                self.sources[str(path)] = stamp
+        return added
+
+    def fill(self, python_exe: str, roots: Optional[List[str]] = None) -> Tuple[int, int, List[List[str]]]:
+        """Wheels reconstitués depuis les distributions de `python_exe` (`roots` et leurs
+        dépendances, ou toutes) : (ajoutés, déjà présents, [distribution, raison] ignorées)."""
+        incoming = self.root / ".incoming"
+        shutil.rmtree(incoming, ignore_errors=True)
+        incoming.mkdir()
+        request = incoming / "request.json"
+        request.write_text(json.dumps({"roots": roots, "skip": self.files()}), encoding="utf-8")
+        proc = subprocess.run([python_exe, str(RUNTIME_DIR / "wheel_repack.py"), str(incoming), str(request)],
+                              capture_output=True, text=True, timeout=REPACK_TIMEOUT)
+        if proc.returncode != 0:
+            shutil.rmtree(incoming, ignore_errors=True)
+            raise RuntimeError(proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else "échec de la reconstitution")
+        result = json.loads(proc.stdout)
+        added = sum(self.add(incoming / name, move=True) for name in result["built"])
+        self.touch(result["present"])
+        shutil.rmtree(incoming, ignore_errors=True)
+        return added, len(result["present"]), result["ignored"]
+
+    def evict(self, quota: int = QUOTA) -> List[str]:
+        """Supprime les wheels les moins récemment utilisés jusqu'à respecter `quota`."""
+        removed = []
+        total = self.total_size()
+        for sha, wheel in sorted(self.wheels.items(), key=lambda kv: kv[1]["last_used"]):
+            if total <= quota:
+                break
+            (self.root / wheel["file"]).unlink(missing_ok=True)
+            del self.wheels[sha]
+            total -= wheel["size"]
+            removed.append(wheel["file"])
+        return removed
+
+
+def install_cmd(env_python: str, args: List[str]) -> List[str]:
+    """pip install hors ligne depuis la wheelhouse, puis depuis l'index si elle ne suffit pas."""
+    return [env_python, str(RUNTIME_DIR / "pip_offline.py"), str(wheelhouse_dir())] + args
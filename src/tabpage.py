@@ -5,8 +5,9 @@ Fichier contenant les pages du stack pour l'application PyPack Studio.
 from PySide6 import QtCore, QtGui, QtWidgets
 import os
 from src.backends import BACKENDS, BuildConfig
-from src.widgets import LabeledLineEdit, PathPicker, AddDataTable, AddFilesAndDirectoriesWidget
+from src.widgets import LabeledLineEdit, PathPicker, AddDataTable, AddFilesAndDirectoriesWidget, InterpreterPicker
 from src.backends import detect_python_exe
+from src.services.presets import PRESETS
 
 
 class TabPage(QtWidgets.QWidget):
@@ -125,6 +126,16 @@ class OutputTabPage(TabPage):
             if current_value < 100:
                 self.progress_bar.setValue(current_value + 1)
         
+    def append_lines(self, lines: list, level: str = "INFO", update_progress: bool = False):
+        """Ajoute un lot de lignes au log en une seule insertion (un horodatage par lot)."""
+        from datetime import datetime
+        prefix = f"{datetime.now().strftime('[%H:%M:%S]')} [{level.upper()}] "
+        cursor = self.txt_log.textCursor()
+        cursor.movePosition(QtGui.QTextCursor.End)
+        cursor.insertText("".join(f"{prefix}{ln}\n" for ln in lines))
+        if update_progress:
+            self.progress_bar.setValue(min(100, self.progress_bar.value() + len(lines)))
+
     def _setup_ui(self):
         v = QtWidgets.QVBoxLayout(self)
         self.txt_log = QtWidgets.QTextEdit()
@@ -168,8 +179,11 @@ class OutputTabPage(TabPage):
                 border: 1px solid #2a2a2a;
             }
         """)
+        self.btn_why = QtWidgets.QPushButton("Pourquoi ce rebuild ?")
+        self.btn_why.setToolTip("Différences d'entrées avec le build précédent le plus proche, par phase invalidée.")
         h.addWidget(self.lbl_status)
         h.addStretch(1)
+        h.addWidget(self.btn_why)
         h.addWidget(self.btn_stop)
         v.addWidget(self.txt_log, 1)
         v.addWidget(self.progress_bar)
@@ -418,14 +432,153 @@ class OptionsTabPage(TabPage):
         
         chk_onefile = QtWidgets.QCheckBox("Un seul-fichier")
         chk_onefile.setChecked(True)
+        chk_dual_output = QtWidgets.QCheckBox("Dossier et onefile à partir d'une seule analyse")
+        chk_dual_output.setToolTip("Le dossier est la sortie principale ; l'exécutable onefile est produit en plus.")
+        chk_dual_output.toggled.connect(lambda on: (chk_onefile.setChecked(chk_onefile.isChecked() and not on),
+                                                    chk_onefile.setEnabled(not on)))
         chk_windowed = QtWidgets.QCheckBox("GUI / sans console")
         chk_windowed.setChecked(True)
         chk_clean = QtWidgets.QCheckBox("Nettoyage --clean")
         chk_clean.setChecked(True)
         chk_console = QtWidgets.QCheckBox("Forcer console")        
+        chk_onefile_cache = QtWidgets.QCheckBox("Extraire une seule fois dans un cache utilisateur")
+        chk_onefile_cache.setToolTip("Nuitka, onefile : l'application est extraite au premier lancement puis réutilisée.")
+        chk_onefile_cache.setEnabled(False)
+        index_box = QtWidgets.QWidget()
+        index_layout = QtWidgets.QHBoxLayout(index_box)
+        index_layout.setContentsMargins(0, 0, 0, 0)
+        chk_module_index = QtWidgets.QCheckBox("Index des modules embarqués (imports sans parcours de sys.path)")
+        btn_index_bench = QtWidgets.QPushButton("Benchmark")
+        index_layout.addWidget(chk_module_index)
+        index_layout.addStretch(1)
+        index_layout.addWidget(btn_index_bench)
+        chk_resource_pack = QtWidgets.QCheckBox("Regrouper les fichiers inclus dans une archive (lecture mmap)")
+        chk_resource_pack.setToolTip("Une seule entrée au lieu d'une par fichier ; accès via le module pypack_resources.")
+        chk_stage_includes = QtWidgets.QCheckBox("Préparer les données incluses (liens physiques, sans doublons)")
+        chk_stage_includes.setToolTip("Un seul dossier transmis à l'outil au lieu d'un argument par fichier ou dossier.")
+        # Optimisation des ressources avant collecte
+        assets_box = QtWidgets.QWidget()
+        assets_layout = QtWidgets.QHBoxLayout(assets_box)
+        assets_layout.setContentsMargins(0, 0, 0, 0)
+        chk_optimize_assets = QtWidgets.QCheckBox("Optimiser les ressources")
+        chk_optimize_assets.setToolTip("PNG recompressés sans perte, fichiers de travail (.psd, .xcf...) retirés, "
+                                       "icône .ico multi-résolution générée depuis une image.")
+        ed_asset_drop = QtWidgets.QLineEdit()
+        ed_asset_drop.setPlaceholderText("Motifs retirés en plus, ex: *.blend, *.wav")
+        assets_layout.addWidget(chk_optimize_assets)
+        assets_layout.addWidget(ed_asset_drop, 1)
+        # Build reproductible + vérification par deux builds parallèles
+        repro_box = QtWidgets.QWidget()
+        repro_layout = QtWidgets.QHBoxLayout(repro_box)
+        repro_layout.setContentsMargins(0, 0, 0, 0)
+        chk_reproducible = QtWidgets.QCheckBox("Build reproductible (SOURCE_DATE_EPOCH, PYTHONHASHSEED, dates normalisées)")
+        btn_verify_repro = QtWidgets.QPushButton("Vérifier")
+        btn_verify_repro.setToolTip("Construit deux fois en parallèle et liste les fichiers qui diffèrent.")
+        repro_layout.addWidget(chk_reproducible)
+        repro_layout.addStretch(1)
+        repro_layout.addWidget(btn_verify_repro)
+        # Environnement de build géré (venv mis en commun par empreinte des dépendances)
+        env_box = QtWidgets.QWidget()
+        env_layout = QtWidgets.QHBoxLayout(env_box)
+        env_layout.setContentsMargins(0, 0, 0, 0)
+        chk_managed_env = QtWidgets.QCheckBox("Venv de build géré (requirements/lockfile + outil, réutilisé tant qu'ils ne changent pas)")
+        chk_managed_env.setToolTip("Le Python choisi sert de base ; le venv remplace python_exe pendant le build.")
+        chk_wheelhouse = QtWidgets.QCheckBox("Wheelhouse locale (hors ligne)")
+        chk_wheelhouse.setToolTip("Wheels reconstitués depuis les environnements déjà vus ; "
+                                  "installation --no-index --find-links, l'index seulement en secours.")
+        chk_managed_env.toggled.connect(chk_wheelhouse.setEnabled)
+        chk_wheelhouse.setEnabled(False)
+        btn_clear_envs = QtWidgets.QPushButton("Vider le cache")
+        env_layout.addWidget(chk_managed_env)
+        env_layout.addWidget(chk_wheelhouse)
+        env_layout.addStretch(1)
+        env_layout.addWidget(btn_clear_envs)
+        # Optimisation du bytecode (-O / -OO) avec exceptions par paquet
+        optimize_box = QtWidgets.QWidget()
+        optimize_layout = QtWidgets.QHBoxLayout(optimize_box)
+        optimize_layout.setContentsMargins(0, 0, 0, 0)
+        cmb_optimize = QtWidgets.QComboBox()
+        cmb_optimize.addItems(["0 - aucune", "1 - sans assert (-O)", "2 - sans assert ni docstrings (-OO)"])
+        ed_keep_docstrings = QtWidgets.QLineEdit()
+        ed_keep_docstrings.setPlaceholderText("Paquets gardant leurs docstrings, ex: numpy, docopt")
+        optimize_layout.addWidget(cmb_optimize)
+        optimize_layout.addWidget(ed_keep_docstrings, 1)
+        # Préréglage de performance + calibration sur un scénario
+        preset_box = QtWidgets.QWidget()
+        preset_layout = QtWidgets.QHBoxLayout(preset_box)
+        preset_layout.setContentsMargins(0, 0, 0, 0)
+        cmb_preset = QtWidgets.QComboBox()
+        cmb_preset.addItem("Aucun", "")
+        for key, label in PRESETS.items():
+            cmb_preset.addItem(label, key)
+        ed_bench_args = QtWidgets.QLineEdit()
+        ed_bench_args.setPlaceholderText("Arguments du scénario mesuré, ex: --bench")
+        btn_calibrate = QtWidgets.QPushButton("Calibrer")
+        btn_calibrate.setToolTip("Construit le profil avec chaque préréglage et retient le plus rapide sur le scénario.")
+        preset_layout.addWidget(cmb_preset)
+        preset_layout.addWidget(ed_bench_args, 1)
+        preset_layout.addWidget(btn_calibrate)
+        # Backend hybride : modules chauds compilés par Nuitka, le reste par PyInstaller
+        hybrid_box = QtWidgets.QWidget()
+        hybrid_layout = QtWidgets.QHBoxLayout(hybrid_box)
+        hybrid_layout.setContentsMargins(0, 0, 0, 0)
+        ed_hybrid_workload = PathPicker("", is_file=True, placeholder="Scénario profilé, qui se termine seul (défaut : script d'entrée)")
+        ed_hybrid_modules = QtWidgets.QLineEdit()
+        ed_hybrid_modules.setPlaceholderText("Modules imposés, ex: pkg.calcul")
+        spn_hybrid_max = QtWidgets.QSpinBox()
+        spn_hybrid_max.setRange(1, 50)
+        spn_hybrid_max.setValue(5)
+        spn_hybrid_max.setPrefix("max ")
+        hybrid_layout.addWidget(ed_hybrid_workload, 2)
+        hybrid_layout.addWidget(ed_hybrid_modules, 1)
+        hybrid_layout.addWidget(spn_hybrid_max)
+        hybrid_box.setEnabled(False)
+        cmb_backend.currentTextChanged.connect(lambda b: hybrid_box.setEnabled(b == "hybrid"))
+        # PGO Nuitka : build instrumenté, scénario d'entraînement, build final
+        pgo_box = QtWidgets.QWidget()
+        pgo_layout = QtWidgets.QHBoxLayout(pgo_box)
+        pgo_layout.setContentsMargins(0, 0, 0, 0)
+        chk_pgo = QtWidgets.QCheckBox("Optimisation guidée par profil")
+        chk_pgo.setToolTip("GCC uniquement (MinGW64 sous Windows : ajoutez --mingw64) ; MSVC et clang sont refusés.")
+        ed_pgo_args = QtWidgets.QLineEdit()
+        ed_pgo_args.setPlaceholderText("Arguments du scénario d'entraînement, ex: --bench data/sample.csv")
+        pgo_layout.addWidget(chk_pgo)
+        pgo_layout.addWidget(ed_pgo_args, 1)
+        pgo_box.setEnabled(False)
+        cmb_backend.currentTextChanged.connect(lambda b: pgo_box.setEnabled(b == "nuitka"))
+        cmb_backend.currentTextChanged.connect(lambda b: chk_onefile_cache.setEnabled(b == "nuitka"))
         
         # Widget pour les répertoires et fichiers à inclure avec leur contenu
         tbl_dirs_to_include = AddFilesAndDirectoriesWidget()
+        # Fichiers inclus jamais référencés (analyse des sources + trace d'exécution optionnelle)
+        unused_box = QtWidgets.QWidget()
+        unused_layout = QtWidgets.QHBoxLayout(unused_box)
+        unused_layout.setContentsMargins(0, 0, 0, 0)
+        chk_unused_trace = QtWidgets.QCheckBox("Tracer aussi une exécution de l'application")
+        btn_unused_data = QtWidgets.QPushButton("Détecter les fichiers inutilisés")
+        unused_layout.addWidget(chk_unused_trace)
+        unused_layout.addStretch(1)
+        unused_layout.addWidget(btn_unused_data)
+        # Contenu des paquets tiers filtré (tests, docs, stubs...) avec règles par paquet
+        payload_box = QtWidgets.QWidget()
+        payload_layout = QtWidgets.QGridLayout(payload_box)
+        payload_layout.setContentsMargins(0, 0, 0, 0)
+        chk_payload_filter = QtWidgets.QCheckBox("Retirer tests, docs, stubs et exemples des paquets tiers")
+        btn_payload_simulate = QtWidgets.QPushButton("Simuler")
+        btn_payload_simulate.setToolTip("Fichiers et octets retirés par paquet installé, sans construire.")
+        ed_payload_rules = QtWidgets.QPlainTextEdit()
+        ed_payload_rules.setPlaceholderText("Règles en plus des défauts, une ligne par paquet (!motif conserve), ex:\n"
+                                            "numpy: !tests\n*: *.md")
+        ed_payload_rules.setMaximumHeight(70)
+        payload_layout.addWidget(chk_payload_filter, 0, 0)
+        payload_layout.addWidget(btn_payload_simulate, 0, 1)
+        payload_layout.addWidget(ed_payload_rules, 1, 0, 1, 2)
+        payload_layout.setColumnStretch(0, 1)
+        
+        # Exécutables supplémentaires : même analyse, dossier d'exécution commun
+        ed_extra_entries = QtWidgets.QPlainTextEdit()
+        ed_extra_entries.setPlaceholderText("Un script par ligne, ex:\noutils/convertir.py\nservice.py")
+        ed_extra_entries.setMaximumHeight(70)
         
         ed_hidden = QtWidgets.QPlainTextEdit()
         ed_hidden.setPlaceholderText("module_a\npackage_b.sousmodule\n...")
@@ -433,32 +586,98 @@ class OptionsTabPage(TabPage):
         ed_extra = QtWidgets.QPlainTextEdit()
         ed_extra.setPlaceholderText("Args supplémentaires ligne par ligne, ex: \n--exclude-module some_heavy_pkg\n--onedir")
         
-        ed_python = LabeledLineEdit("Python (optionnel)")
-        ed_python.setText(detect_python_exe())
+        # Imports différés : liste éditable + suggestion/vérification
+        lazy_box = QtWidgets.QWidget()
+        lazy_layout = QtWidgets.QVBoxLayout(lazy_box)
+        lazy_layout.setContentsMargins(0, 0, 0, 0)
+        ed_lazy = QtWidgets.QPlainTextEdit()
+        ed_lazy.setPlaceholderText("Modules chargés au premier accès, ex:\nnumpy\npandas")
+        ed_lazy.setMaximumHeight(90)
+        btn_lazy_suggest = QtWidgets.QPushButton("Suggérer (profil d'import)")
+        btn_lazy_verify = QtWidgets.QPushButton("Vérifier le démarrage")
+        lazy_buttons = QtWidgets.QHBoxLayout()
+        lazy_buttons.addStretch(1)
+        lazy_buttons.addWidget(btn_lazy_suggest)
+        lazy_buttons.addWidget(btn_lazy_verify)
+        lazy_layout.addWidget(ed_lazy)
+        lazy_layout.addLayout(lazy_buttons)
+        
+        cmb_python = InterpreterPicker("Python (optionnel)")
+        cmb_python.setText(detect_python_exe())
+        cmb_python.setBackend(cmb_backend.currentText())
+        cmb_backend.currentTextChanged.connect(cmb_python.setBackend)
         
         # Stocker les widgets dans le widget de la page pour y accéder depuis l'extérieur
         content_widget.widgets = {
             'cmb_backend': cmb_backend,
             'chk_onefile': chk_onefile,
+            'chk_dual_output': chk_dual_output,
             'chk_windowed': chk_windowed,
             'chk_clean': chk_clean,
             'chk_console': chk_console,
+            'chk_onefile_cache': chk_onefile_cache,
+            'chk_module_index': chk_module_index,
+            'btn_index_bench': btn_index_bench,
+            'chk_resource_pack': chk_resource_pack,
+            'chk_stage_includes': chk_stage_includes,
+            'chk_optimize_assets': chk_optimize_assets,
+            'chk_reproducible': chk_reproducible,
+            'btn_verify_repro': btn_verify_repro,
+            'chk_managed_env': chk_managed_env,
+            'chk_wheelhouse': chk_wheelhouse,
+            'btn_clear_envs': btn_clear_envs,
+            'ed_asset_drop': ed_asset_drop,
+            'cmb_optimize': cmb_optimize,
+            'ed_keep_docstrings': ed_keep_docstrings,
+            'cmb_preset': cmb_preset,
+            'ed_bench_args': ed_bench_args,
+            'btn_calibrate': btn_calibrate,
+            'ed_hybrid_workload': ed_hybrid_workload,
+            'ed_hybrid_modules': ed_hybrid_modules,
+            'spn_hybrid_max': spn_hybrid_max,
+            'chk_pgo': chk_pgo,
+            'ed_pgo_args': ed_pgo_args,
+            'ed_extra_entries': ed_extra_entries,
             'tbl_dirs_to_include': tbl_dirs_to_include,
+            'chk_unused_trace': chk_unused_trace,
+            'btn_unused_data': btn_unused_data,
+            'chk_payload_filter': chk_payload_filter,
+            'btn_payload_simulate': btn_payload_simulate,
+            'ed_payload_rules': ed_payload_rules,
             'ed_hidden': ed_hidden,
             'ed_extra': ed_extra,
-            'ed_python': ed_python
+            'ed_lazy': ed_lazy,
+            'btn_lazy_suggest': btn_lazy_suggest,
+            'btn_lazy_verify': btn_lazy_verify,
+            'cmb_python': cmb_python
         }
         
         for row in [
             ("Outil", cmb_backend),
+            ("Préréglage", preset_box),
+            ("Hybride", hybrid_box),
+            ("PGO (Nuitka)", pgo_box),
             ("Un fichier", chk_onefile),
+            ("Double sortie", chk_dual_output),
             ("Fenêtre GUI", chk_windowed),
             ("Nettoyer", chk_clean),
             ("Console", chk_console),
+            ("Cache onefile", chk_onefile_cache),
+            ("Index modules", index_box),
+            ("Archive ressources", chk_resource_pack),
+            ("Données préparées", chk_stage_includes),
+            ("Ressources", assets_box),
+            ("Reproductible", repro_box),
+            ("Optimisation", optimize_box),
+            ("Exécutables supplémentaires", ed_extra_entries),
             ("Fichiers/Répertoires à inclure", tbl_dirs_to_include),
+            ("Données inutilisées", unused_box),
+            ("Paquets tiers", payload_box),
             ("Hidden imports", ed_hidden),
             ("Args extra", ed_extra),
-            ("Python", ed_python),
+            ("Imports différés", lazy_box),
+            ("Python", cmb_python),
+            ("Environnement", env_box),
         ]:
             form.addRow(row[0], row[1])
         
@@ -2,8 +2,9 @@
 Fichier contenant les classes d'interface utilisateur personnalisées pour l'application PyPack Studio.
 """
 
+import os
 from PySide6 import QtCore, QtGui, QtWidgets
-from typing import List, Tuple
+from typing import Dict, List, Tuple
 
 
 class LabeledLineEdit(QtWidgets.QWidget):
@@ -48,6 +49,153 @@ class PathPicker(LabeledLineEdit):
         if path:
             self.setText(path)
 
+
+class InterpreterPicker(QtWidgets.QWidget):
+    """Choix de l'interpréteur Python : interpréteurs découverts (projet, conda, pyenv, PATH),
+    saisie ou sélection d'un fichier, validés par src/services/interpreters.py en arrière-plan."""
+    textChanged = QtCore.Signal(str)
+    # génération, (liste d'Interpreter, version de ccache) (émis depuis le thread de découverte)
+    interpretersReady = QtCore.Signal(int, object)
+
+    def __init__(self, label: str, parent=None):
+        super().__init__(parent)
+        self._generation = 0
+        self._project_dir = ""
+        self._backend = ""
+        self._known = {}  # chemin normalisé -> Interpreter
+        self._ccache = ""
+        self.combo = QtWidgets.QComboBox()
+        self.combo.setEditable(True)
+        self.combo.setInsertPolicy(QtWidgets.QComboBox.NoInsert)
+        self.combo.setSizePolicy(QtWidgets.QSizePolicy.Expanding, QtWidgets.QSizePolicy.Fixed)
+        self.combo.lineEdit().setPlaceholderText("Interpréteur courant")
+        self.combo.currentTextChanged.connect(self.textChanged)
+        self.combo.currentTextChanged.connect(self._schedule_check)
+        btn_browse = QtWidgets.QToolButton()
+        btn_browse.setText("…")
+        btn_browse.clicked.connect(self._pick)
+        btn_refresh = QtWidgets.QToolButton()
+        btn_refresh.setText("⟳")
+        btn_refresh.setToolTip("Relancer la découverte des interpréteurs")
+        btn_refresh.clicked.connect(self.refresh)
+        self.lbl_status = QtWidgets.QLabel("")
+        self.lbl_status.setWordWrap(True)
+        self._timer = QtCore.QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(300)
+        self._timer.timeout.connect(self._discover)
+        self.interpretersReady.connect(self._show_interpreters)
+        v = QtWidgets.QVBoxLayout(self)
+        v.setContentsMargins(0, 0, 0, 0)
+        h = QtWidgets.QHBoxLayout()
+        if label:
+            h.addWidget(QtWidgets.QLabel(label))
+        h.addWidget(self.combo)
+        h.addWidget(btn_browse)
+        h.addWidget(btn_refresh)
+        v.addLayout(h)
+        v.addWidget(self.lbl_status)
+        self.refresh()
+
+    def text(self) -> str:
+        return self.combo.currentText().strip()
+
+    def setText(self, s: str):
+        self.combo.setEditText(s)
+
+    def setProjectDir(self, path: str):
+        if path != self._project_dir:
+            self._project_dir = path
+            self._timer.start()
+
+    def setBackend(self, name: str):
+        self._backend = name
+        self._update_status()
+
+    def refresh(self):
+        self._known = {}
+        self._timer.start()
+
+    def _pick(self):
+        path, _ = QtWidgets.QFileDialog.getOpenFileName(self, "Choisir un interpréteur Python")
+        if path:
+            self.setText(path)
+
+    def _schedule_check(self, *_):
+        if self._key(self.text()) in self._known or not self.text():
+            self._update_status()
+        else:
+            self._timer.start()
+
+    @staticmethod
+    def _key(path: str) -> str:
+        from src.services import interpreters
+        return interpreters.interpreter_key(path) if path else ""
+
+    def _discover(self):
+        """Découverte et sonde dans un thread ; seul le dernier résultat est affiché."""
+        import threading
+        from src.services import interpreters
+        self._generation += 1
+        generation, project_dir, current = self._generation, self._project_dir, self.text()
+        self.lbl_status.setText("Recherche des interpréteurs…")
+
+        def run():
+            cache = interpreters.InterpreterCache()
+            try:
+                found = interpreters.discover(project_dir, cache)
+                if current and self._key(current) not in {self._key(i.path) for i in found}:
+                    found.append(interpreters.describe(current, cache))
+                ccache = interpreters.ccache_version(cache)
+            except OSError:
+                found, ccache = [], ""
+            self.interpretersReady.emit(generation, (found, ccache))
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def _show_interpreters(self, generation: int, result: tuple):
+        if generation != self._generation:
+            return
+        found, self._ccache = result
+        current = self.text()
+        self._known = {self._key(i.path): i for i in found}
+        self.combo.blockSignals(True)
+        self.combo.clear()
+        for interp in found:
+            if interp.source != "manuel" and interp.valid:
+                self.combo.addItem(interp.path)
+                self.combo.setItemData(self.combo.count() - 1, interp.label(), QtCore.Qt.ToolTipRole)
+        self.combo.setEditText(current)
+        self.combo.blockSignals(False)
+        self._update_status()
+
+    def _update_status(self):
+        from src.services import interpreters
+        path = self.text()
+        if not path:
+            self.lbl_status.setText(f"{self.combo.count()} interpréteur(s) trouvé(s) ; vide = interpréteur courant")
+            self.lbl_status.setStyleSheet("")
+            return
+        interp = self._known.get(self._key(path))
+        if interp is None:
+            self.lbl_status.setText("Vérification…")
+            return
+        if not interp.valid:
+            self.lbl_status.setText(f"Interpréteur invalide : {interp.error or 'sonde sans résultat'}")
+            self.lbl_status.setStyleSheet("color: #d9534f;")
+            return
+        tools = ", ".join(f"{name} {getattr(interp, name)}" for name in ("pyinstaller", "nuitka")
+                          if getattr(interp, name)) or "aucun outil de packaging"
+        if self._backend in ("nuitka", "hybrid"):
+            tools += f", ccache {self._ccache}" if self._ccache else ", sans ccache"
+        text = f"Python {interp.version} {interp.bits} bits ({interp.source}) — {tools}"
+        missing = interpreters.missing_tools(interp, self._backend)
+        if missing:
+            text += f" — manquant pour {self._backend} : {', '.join(missing)}"
+        self.lbl_status.setText(text)
+        self.lbl_status.setStyleSheet("color: #f0ad4e;" if missing else "")
+
+
 from typing import List, Tuple
 from PySide6 import QtWidgets, QtCore
 
@@ -343,9 +491,32 @@ if __name__ == "__main__":
 
 
 class AddFilesAndDirectoriesWidget(QtWidgets.QWidget):
+    # génération de l'aperçu, nombre de fichiers, octets (émis depuis le thread de calcul)
+    previewReady = QtCore.Signal(int, int, int)
+
     def __init__(self, parent=None):
         super().__init__(parent)
+        self._filters = {}  # règles glob par dossier (clés normalisées, cf. include_filter)
+        self._preview_generation = 0
         self.list_widget = QtWidgets.QListWidget()
+        self.list_widget.currentItemChanged.connect(self._show_rules)
+        self.list_widget.model().rowsInserted.connect(self._schedule_preview)
+        self.list_widget.model().rowsRemoved.connect(self._schedule_preview)
+        # Règles du dossier sélectionné
+        self.ed_rules = QtWidgets.QPlainTextEdit()
+        self.ed_rules.setPlaceholderText("Règles du dossier sélectionné, une par ligne :\n"
+                                         "!__pycache__   (exclut)\n*.png   (n'inclut que)")
+        self.ed_rules.setEnabled(False)
+        self.ed_rules.textChanged.connect(self._store_rules)
+        btn_default_rules = QtWidgets.QPushButton("Règles par défaut")
+        btn_default_rules.setToolTip("Exclut caches, dépôts, tests et fichiers d'éditeur.")
+        btn_default_rules.clicked.connect(self._apply_default_rules)
+        self.lbl_preview = QtWidgets.QLabel("")
+        self._preview_timer = QtCore.QTimer(self)
+        self._preview_timer.setSingleShot(True)
+        self._preview_timer.setInterval(300)
+        self._preview_timer.timeout.connect(self._start_preview)
+        self.previewReady.connect(self._show_preview)
         btn_add_dir = QtWidgets.QPushButton("Ajouter dossier")
         btn_add_file = QtWidgets.QPushButton("Ajouter fichier")
         btn_del = QtWidgets.QPushButton("Supprimer")
@@ -353,9 +524,14 @@ class AddFilesAndDirectoriesWidget(QtWidgets.QWidget):
         btn_add_file.clicked.connect(self.add_file)
         btn_del.clicked.connect(self.del_selected)
         v = QtWidgets.QVBoxLayout(self)
-        v.addWidget(self.list_widget)
+        lists = QtWidgets.QHBoxLayout()
+        lists.addWidget(self.list_widget, 3)
+        lists.addWidget(self.ed_rules, 2)
+        v.addLayout(lists)
         h = QtWidgets.QHBoxLayout()
+        h.addWidget(self.lbl_preview)
         h.addStretch(1)
+        h.addWidget(btn_default_rules)
         h.addWidget(btn_add_dir)
         h.addWidget(btn_add_file)
         h.addWidget(btn_del)
@@ -363,6 +539,73 @@ class AddFilesAndDirectoriesWidget(QtWidgets.QWidget):
         self.setMaximumHeight(250)
         v.setSpacing(5)  # Réduire l'espacement entre les widgets
 
+    def _current_key(self) -> str:
+        from src.services import include_filter
+        item = self.list_widget.currentItem()
+        if item is None or not os.path.isdir(item.text().strip()):
+            return ""
+        return include_filter.filter_key(item.text().strip())
+
+    def _show_rules(self, *_):
+        key = self._current_key()
+        self.ed_rules.blockSignals(True)
+        self.ed_rules.setPlainText("\n".join(self._filters.get(key, [])))
+        self.ed_rules.blockSignals(False)
+        self.ed_rules.setEnabled(bool(key))
+
+    def _store_rules(self):
+        key = self._current_key()
+        if not key:
+            return
+        rules = [ln.strip() for ln in self.ed_rules.toPlainText().splitlines() if ln.strip()]
+        if rules:
+            self._filters[key] = rules
+        else:
+            self._filters.pop(key, None)
+        self._schedule_preview()
+
+    def _apply_default_rules(self):
+        from src.services import include_filter
+        if self._current_key():
+            self.ed_rules.setPlainText("\n".join(include_filter.DEFAULT_RULES))
+
+    def _schedule_preview(self, *_):
+        self._preview_timer.start()
+
+    def _start_preview(self):
+        """Compte les fichiers retenus dans un thread ; seul le dernier calcul est affiché."""
+        import threading
+        from src.services import include_filter
+        self._preview_generation += 1
+        generation, items, filters = self._preview_generation, self.value(), dict(self._filters)
+        self.lbl_preview.setText("Aperçu : calcul…")
+
+        def run():
+            try:
+                count, total = include_filter.preview(items, filters)
+            except OSError:
+                count, total = -1, 0
+            self.previewReady.emit(generation, count, total)
+
+        threading.Thread(target=run, daemon=True).start()
+
+    def _show_preview(self, generation: int, count: int, total: int):
+        if generation != self._preview_generation:
+            return
+        if count < 0:
+            self.lbl_preview.setText("Aperçu : dossier illisible")
+        else:
+            self.lbl_preview.setText(f"Aperçu : {count} fichiers, {total / (1024 * 1024):.1f} Mo")
+
+    def filters(self) -> Dict[str, List[str]]:
+        return dict(self._filters)
+
+    def setFilters(self, filters: Dict[str, List[str]]):
+        from src.services import include_filter
+        self._filters = include_filter.normalized_filters(filters or {})
+        self._show_rules()
+        self._schedule_preview()
+
     def add_directory(self):
         # Créer une boîte de dialogue pour sélectionner un répertoire
         dialog = QtWidgets.QFileDialog(self, "Sélectionner un répertoire")
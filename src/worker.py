@@ -1,14 +1,18 @@
 """
-Fichier contenant la classe BuildWorker pour l'application PyPack Studio.
+Fichier contenant les classes BuildWorker et StepWorker pour l'application PyPack Studio.
 """
 
 from PySide6 import QtCore
+import codecs
 import shlex
 
+# Intervalle de regroupement des lignes de sortie (≈ 30 images/s) : un signal par lot, pas par ligne
+FLUSH_INTERVAL_MS = 33
+
 
 class BuildWorker(QtCore.QObject):
     started = QtCore.Signal(list)
-    line = QtCore.Signal(str)
+    lines = QtCore.Signal(list)  # lot de lignes reçues depuis le dernier envoi
     finished = QtCore.Signal(int)
 
     def __init__(self, cmd: list[str], workdir: str | None = None, env: dict[str, str] | None = None):
@@ -21,6 +25,14 @@ class BuildWorker(QtCore.QObject):
         self.proc.setProcessChannelMode(QtCore.QProcess.MergedChannels)
         self.proc.readyReadStandardOutput.connect(self._on_ready)
         self.proc.finished.connect(self._on_finished)
+        # Sortie décodée au fil de l'eau : un caractère ou une ligne coupés entre deux lectures sont recollés
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._partial = ""
+        self._pending: list[str] = []
+        self._flush_timer = QtCore.QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(FLUSH_INTERVAL_MS)
+        self._flush_timer.timeout.connect(self._flush)
 
     def start(self):
         self.started.emit(self.cmd)
@@ -41,18 +53,65 @@ class BuildWorker(QtCore.QObject):
     def _on_ready(self):
         data = self.proc.readAllStandardOutput()
         if data:
-            try:
-                text = bytes(data).decode(errors='replace')
-            except Exception:
-                text = str(data)
-            for ln in text.splitlines():
-                self.line.emit(ln)
+            parts = (self._partial + self._decoder.decode(bytes(data))).splitlines(keepends=True)
+            tail = parts[-1] if parts else ""
+            # ligne inachevée, ou terminée par \r dont le \n peut arriver à la lecture suivante
+            self._partial = parts.pop() if tail.endswith("\r") or tail.splitlines() == [tail] else ""
+            self._pending.extend("".join(parts).splitlines())
+            # premier lot après FLUSH_INTERVAL_MS, les lignes suivantes s'y ajoutent d'ici là
+            if self._pending and not self._flush_timer.isActive():
+                self._flush_timer.start()
+
+    @QtCore.Slot()
+    def _flush(self):
+        if self._pending:
+            batch, self._pending = self._pending, []
+            self.lines.emit(batch)
 
     @QtCore.Slot(int, QtCore.QProcess.ExitStatus)
     def _on_finished(self, code: int, _status):
-        # print(f"_on_finished called with code: {code}")  # Débogage
+        # dernières lignes (et ligne finale sans retour) envoyées avant la fin
+        self._on_ready()
+        self._partial += self._decoder.decode(b"", final=True)
+        if self._partial:
+            self._pending.extend(self._partial.splitlines())
+            self._partial = ""
+        self._flush_timer.stop()
+        self._flush()
         self.finished.emit(code)
 
     def kill(self):
         if self.proc.state() != QtCore.QProcess.NotRunning:
-            self.proc.kill()
\ No newline at end of file
+            self.proc.kill()
+
+
+class StepWorker(QtCore.QObject):
+    """Étape Python du pipeline (compression, liens, empreintes…) exécutée hors du thread de l'interface.
+
+    Même interface que BuildWorker : les messages arrivent par `lines`, la fin par
+    `finished` (0 si l'étape a réussi, 1 sinon, avec le message dans `error`).
+    """
+    lines = QtCore.Signal(list)
+    error = QtCore.Signal(str)
+    finished = QtCore.Signal(int)
+
+    def __init__(self, step):
+        super().__init__()
+        self.step = step
+
+    def start(self):
+        QtCore.QThreadPool.globalInstance().start(self._run)
+
+    def _run(self):
+        # signaux émis depuis le thread du pool : livrés dans le thread de l'interface
+        try:
+            self.step.func(lambda msg: self.lines.emit([msg]))
+        except Exception as e:
+            self.error.emit(f"[ERROR] Étape '{self.step.label}' échouée: {e}")
+            self.finished.emit(1)
+        else:
+            self.finished.emit(0)
+
+    def kill(self):
+        # un traitement Python ne s'interrompt pas : l'arrêt prend effet à la fin de l'étape
+        pass
@@ -0,0 +1,25 @@
+# tests/test_env_fingerprint.py
+import sys
+
+from src.backends import BuildConfig
+from src.services import env_fingerprint
+
+
+def _snapshot(fingerprint, dists):
+    return {"fingerprint": fingerprint, "interpreter": [1, 1], "dists": dists}
+
+
+def test_changes_are_reported_per_profile(tmp_path, monkeypatch):
+    cfg = BuildConfig(project_dir=str(tmp_path), entry_script=str(tmp_path / "app.py"), python_exe=sys.executable)
+    env_a, env_b = _snapshot("a", {"requests": ["2.0", 1]}), _snapshot("b", {"requests": ["2.1", 1]})
+    env_fingerprint.save(cfg, env_a, profile="dev")
+    env_fingerprint.save(cfg, env_b, profile="release")
+
+    monkeypatch.setattr(env_fingerprint, "snapshot", lambda python_exe, use_cache=True: env_a)
+    # inchangé pour « dev », mais l'analyse du dossier vient du build « release »
+    assert env_fingerprint.changes_since_last_build(cfg, "dev") == ([], True)
+    assert env_fingerprint.changes_since_last_build(cfg, "release") == (["~ requests 2.1 -> 2.0"], True)
+    # profil jamais construit : comparé au dernier build du dossier
+    assert env_fingerprint.changes_since_last_build(cfg, "ci") == (["~ requests 2.1 -> 2.0"], True)
+    assert env_fingerprint.load_previous(cfg, "dev") == env_a
+    assert env_fingerprint.load_previous(cfg) == env_b
@@ -0,0 +1,36 @@
+# tests/test_payload_filter.py
+import importlib.util
+import os
+import shutil
+import subprocess
+import sys
+
+import pytest
+
+from src.backends import BuildConfig, NuitkaBackend
+from src.services import payload_filter
+
+
+def test_nuitka_rules_never_exclude_modules():
+    args, _skipped = payload_filter.nuitka_args({"numpy": ["docs"]})
+    assert not [a for a in args if a.startswith("--nofollow-import-to")]
+    assert "--noinclude-data-files=*/docs/*" in args
+    assert "--noinclude-data-files=numpy/docs/*" in args
+
+
+@pytest.mark.skipif(importlib.util.find_spec("nuitka") is None or shutil.which("gcc") is None,
+                    reason="Nuitka et GCC requis")
+def test_nuitka_build_keeps_project_docs_module(tmp_path):
+    (tmp_path / "mypkg").mkdir()
+    (tmp_path / "mypkg" / "__init__.py").write_text("", encoding="utf-8")
+    (tmp_path / "mypkg" / "docs.py").write_text("TEXT = 'docs ok'\n", encoding="utf-8")
+    (tmp_path / "app.py").write_text("from mypkg import docs\nprint(docs.TEXT)\n", encoding="utf-8")
+    cfg = BuildConfig(entry_script=str(tmp_path / "app.py"), name="docsapp", backend="nuitka",
+                      python_exe=sys.executable, payload_filter=True, windowed=False, console=True).normalized()
+    backend = NuitkaBackend()
+    proc = subprocess.run(backend.build_command(cfg), cwd=cfg.project_dir, capture_output=True, text=True)
+    assert proc.returncode == 0, proc.stderr[-2000:]
+    run = subprocess.run([backend.executable_path(cfg)], capture_output=True, text=True, timeout=60,
+                         env={**os.environ, "PYTHONPATH": ""})
+    assert run.returncode == 0, run.stderr
+    assert run.stdout.strip() == "docs ok"
@@ -0,0 +1,16 @@
+# tests/test_preflight.py
+import sys
+
+from src.backends import BuildConfig
+from src.services import preflight
+
+
+def test_hidden_imports_resolved_from_project_dirs(tmp_path):
+    (tmp_path / "src" / "pkg").mkdir(parents=True)
+    (tmp_path / "src" / "app.py").write_text("print('ok')\n", encoding="utf-8")
+    (tmp_path / "src" / "pkg" / "__init__.py").write_text("", encoding="utf-8")
+    (tmp_path / "tools.py").write_text("", encoding="utf-8")
+    cfg = BuildConfig(project_dir=str(tmp_path), entry_script=str(tmp_path / "src" / "app.py"),
+                      python_exe=sys.executable, hidden_imports=["pkg", "tools", "pypack_missing_module"])
+    errors, warnings, _compiled = preflight.check_interpreter(cfg, [cfg.entry_script], check_backend=True)
+    assert warnings == ["Import caché introuvable : pypack_missing_module"]
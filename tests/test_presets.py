@@ -0,0 +1,15 @@
+# tests/test_presets.py
+from src.backends import BuildConfig
+from src.services import presets
+
+
+def test_fastest_startup_keeps_onefile_cache_choice():
+    for backend in ("pyinstaller", "nuitka"):
+        cfg = presets.apply_preset(BuildConfig(backend=backend, onefile=True, preset="fastest_startup"))
+        assert cfg.onefile and not cfg.onefile_cache
+
+
+def test_nuitka_presets_do_not_exclude_modules_by_name():
+    for preset in presets.PRESETS:
+        cfg = presets.apply_preset(BuildConfig(backend="nuitka", preset=preset))
+        assert not any(a.startswith("--nofollow-import-to") for a in cfg.extra_args)
@@ -0,0 +1,32 @@
+# tests/test_pyi_spec.py
+from src.services import pyi_spec
+
+
+def test_split_args_strips_build_only_options():
+    makespec, build = pyi_spec.split_args([
+        "--clean", "--noconfirm", "-y", "--distpath", "dist", "--workpath=build", "--specpath", "elsewhere",
+        "--name=app", "--onefile", "app.py"])
+    assert makespec == ["--name=app", "--onefile", "app.py"]
+    assert build == []
+
+
+def test_split_args_forwards_upx_dir_to_build_only():
+    for args in (["--upx-dir", "/opt/upx", "app.py"], ["--upx-dir=/opt/upx", "app.py"]):
+        makespec, build = pyi_spec.split_args(args)
+        assert makespec == ["app.py"]
+        assert build == args[:-1]
+
+
+def test_split_args_keeps_log_level_for_both():
+    makespec, build = pyi_spec.split_args(["--log-level", "WARN", "--noupx", "app.py"])
+    assert makespec == ["--log-level", "WARN", "--noupx", "app.py"]
+    assert build == ["--log-level", "WARN"]
+
+
+def test_makespec_and_build_commands():
+    direct = ["py", "-m", "PyInstaller", "--clean", "--upx-dir=/opt/upx", "--windowed", "app.py"]
+    assert pyi_spec.makespec_command(direct, "spec") == [
+        "py", "-m", pyi_spec.MAKESPEC_MODULE, "--specpath", "spec", "--windowed", "app.py"]
+    build = pyi_spec.build_command("py", "spec/app.spec", "dist", "build", True, pyi_spec.split_args(direct[3:])[1])
+    assert build == ["py", "-m", "PyInstaller", "--clean", "--noconfirm", "--distpath", "dist", "--workpath", "build",
+                     "--upx-dir=/opt/upx", "spec/app.spec"]